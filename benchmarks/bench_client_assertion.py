@@ -0,0 +1,91 @@
+"""
+Compare signing client assertions the way MSAL does for each new
+ConfidentialClientApplication with the cached CertificateCredential.
+
+Usage::
+
+    python benchmarks/bench_client_assertion.py
+"""
+import datetime
+import tempfile
+import timeit
+from pathlib import Path
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from msal.oauth2cli.assertion import JwtAssertionCreator
+
+from msal_requests_auth.auth import CertificateCredential
+
+NUMBER = 200
+TOKEN_ENDPOINT = "https://login.microsoftonline.com/TENANT/oauth2/v2.0/token"
+
+
+def _write_certificate(pem_file: Path) -> None:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "BENCHMARK")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(private_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(private_key, hashes.SHA256())
+    )
+    pem_file.write_bytes(
+        private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        + certificate.public_bytes(serialization.Encoding.PEM)
+    )
+
+
+def _msal_path(pem_file: Path) -> None:
+    """
+    Read the PEM file and sign a new assertion, as happens when
+    a new ConfidentialClientApplication refreshes a token.
+    """
+    pem = pem_file.read_text()
+    certificate = x509.load_pem_x509_certificate(pem.encode("utf-8"))
+    JwtAssertionCreator(
+        pem,
+        algorithm="PS256",
+        sha256_thumbprint=certificate.fingerprint(hashes.SHA256()).hex(),
+    ).create_regenerative_assertion(audience=TOKEN_ENDPOINT, issuer="CLIENT")()
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pem_file = Path(temp_dir, "certificate.pem")
+        _write_certificate(pem_file)
+        credential = CertificateCredential("CLIENT", pem_file)
+        results = {
+            "msal (parse + sign per client)": timeit.timeit(
+                lambda: _msal_path(pem_file), number=NUMBER
+            ),
+            "CertificateCredential (shared)": timeit.timeit(
+                lambda: credential.client_credential(
+                    "https://login.microsoftonline.com/TENANT"
+                )["client_assertion"](),
+                number=NUMBER,
+            ),
+            "CertificateCredential (new per client)": timeit.timeit(
+                lambda: CertificateCredential("CLIENT", pem_file).get_client_assertion(
+                    TOKEN_ENDPOINT
+                ),
+                number=NUMBER,
+            ),
+        }
+    for name, seconds in results.items():
+        print(f"{name:<40} {seconds / NUMBER * 1e6:>12.1f} us/assertion")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Measure how adding tokens scales with threads with and without the GIL.
+
+The requests per second are reported for an increasing number of threads
+adding a token that is already in memory. On a free-threaded build
+(python3.13t, python3.14t), the benchmark is run again with the GIL enabled
+(-X gil=1) to compare both on the same interpreter.
+
+Usage::
+
+    python benchmarks/bench_free_threading.py
+    python3.14t benchmarks/bench_free_threading.py
+"""
+import os
+import subprocess
+import sys
+import sysconfig
+
+from msal_requests_auth.auth import ClientCredentialAuth
+from msal_requests_auth.testing import FakeAAD, run_load_test
+
+THREADS = (1, 2, 4, 8, 16)
+DURATION = 2
+
+
+def _gil_enabled() -> bool:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def main():
+    label = "GIL" if _gil_enabled() else "no GIL"
+    print(f"Python {sys.version.split()[0]} ({label}, {os.cpu_count()} CPUs)")
+    with FakeAAD() as fake_aad:
+        auth = ClientCredentialAuth(
+            fake_aad.create_confidential_client(), scopes=["api://fake/.default"]
+        )
+        auth.get_access_token()
+        single_thread = None
+        for threads in THREADS:
+            result = run_load_test(
+                auth, threads=threads, duration=DURATION, fake_aad=fake_aad
+            )
+            single_thread = single_thread or result.requests_per_second
+            print(
+                f"{label:<7} threads={threads:<3} "
+                f"{result.requests_per_second:>12,.0f} req/s "
+                f"speedup={result.requests_per_second / single_thread:.1f}x "
+                f"p99={result.latency_p99 * 1e6:,.1f}us"
+            )
+
+    if sysconfig.get_config_var("Py_GIL_DISABLED") and not _gil_enabled():
+        subprocess.run([sys.executable, "-X", "gil=1", __file__], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark token refresh storms against a local fake Azure AD server.
+
+Many threads add tokens while the fake server is slow, throttles
+or fails, and the number of token requests and the latency are reported.
+The tokens are valid for a couple of seconds past the refresh margin,
+so they are refreshed while the threads are running.
+
+Usage::
+
+    python benchmarks/bench_refresh_storm.py
+"""
+from msal_requests_auth.auth import ClientCredentialAuth, DeviceCodeAuth
+from msal_requests_auth.testing import FakeAAD, run_load_test
+
+# refreshed one second after the token is received
+TOKEN_LIFETIME = 301
+# FakeAAD attributes set after signing in
+SCENARIOS = {
+    "slow token endpoint": {"latency": 0.2},
+    "throttled": {"latency": 0.05, "throttle_rate": 0.5},
+    "failing": {"latency": 0.05, "failure_rate": 0.5},
+}
+
+
+def _report(name, result):
+    print(
+        f"{name:<45} {result.requests_per_second:>10,.0f} req/s "
+        f"token requests={result.token_requests:<4} errors={result.errors:<6} "
+        f"p50={result.latency_p50 * 1e6:,.1f}us "
+        f"p99={result.latency_p99 * 1e6:,.1f}us "
+        f"max={result.latency_max * 1e3:,.1f}ms"
+    )
+
+
+def main():
+    for scenario, settings in SCENARIOS.items():
+        with FakeAAD(token_lifetime=TOKEN_LIFETIME) as fake_aad:
+            auths = {
+                "ClientCredentialAuth": ClientCredentialAuth(
+                    fake_aad.create_confidential_client(),
+                    scopes=["api://fake/.default"],
+                ),
+                "DeviceCodeAuth": DeviceCodeAuth(
+                    fake_aad.create_public_client(),
+                    scopes=["api://fake/.default"],
+                    headless=True,
+                ),
+            }
+            for auth in auths.values():
+                auth.get_access_token()
+            for setting, value in settings.items():
+                setattr(fake_aad, setting, value)
+            for name, auth in auths.items():
+                result = run_load_test(auth, threads=32, duration=3, fake_aad=fake_aad)
+                _report(f"{name} ({scenario})", result)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,4 +2,23 @@
 __author__ = """Delta"""
 __email__ = "DL-Delta-Devs@pioneer.com"
 
+import importlib
+
 from msal_requests_auth._version import __version__  # noqa: F401
+
+# submodules are loaded on first access to keep the package import fast
+_SUBMODULES = {
+    "adapters",
+    "auth",
+    "cache",
+    "client",
+    "exceptions",
+    "pagination",
+    "snapshot",
+}
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
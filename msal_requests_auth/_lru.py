@@ -0,0 +1,208 @@
+"""
+Bounded, thread safe LRU cache with idle and expiry eviction
+used to pool MSAL objects and tokens.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+KeyT = TypeVar("KeyT", bound=Hashable)
+ValueT = TypeVar("ValueT")
+
+
+class LRUCacheStats(NamedTuple):
+    """
+    Statistics of an LRU cache.
+
+    .. versionadded:: 0.10.0
+    """
+
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int = 0
+    memory_bytes: int = 0
+
+
+class _LRUCache(Generic[KeyT, ValueT]):  # pylint: disable=too-many-instance-attributes
+    """
+    Least recently used cache bounded by size and idle time.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        max_idle: Optional[float] = None,
+        sizeof: Optional[Callable[[ValueT], int]] = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        max_size: int
+            Maximum number of entries to keep.
+        max_idle: float, optional
+            Number of seconds an entry can go unused before it is evicted.
+        sizeof: Callable[[ValueT], int], optional
+            Estimates the memory used by a value in bytes for the statistics.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self._sizeof = sizeof
+        # key -> (last used time, expires at, value, size in bytes)
+        self._entries: "OrderedDict[KeyT, Tuple[float, float, ValueT, int]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        # key -> (lock, number of waiting threads) while a value is created
+        self._creation_locks: Dict[KeyT, Tuple[threading.Lock, int]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._memory_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: KeyT) -> Optional[ValueT]:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self._memory_bytes -= entry[3]
+        return entry[2]
+
+    def _evict_idle(self, now: float) -> None:
+        if self.max_idle is None:
+            return
+        while self._entries:
+            key, (last_used, _, _, _) = next(iter(self._entries.items()))
+            if now - last_used <= self.max_idle:
+                break
+            self._remove(key)
+            self._evictions += 1
+
+    def get(self, key: KeyT) -> Optional[ValueT]:
+        """
+        Retrieve the value and mark it as recently used.
+        """
+        return self._get(key, record_miss=True)
+
+    def _get(self, key: KeyT, record_miss: bool) -> Optional[ValueT]:
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= now:
+                self._remove(key)
+                self._expirations += 1
+                entry = None
+            if entry is None:
+                self._misses += record_miss
+                return None
+            self._hits += 1
+            self._entries[key] = (now, *entry[1:])
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def put(self, key: KeyT, value: ValueT, expires_in: Optional[float] = None) -> None:
+        """
+        Add the value, evicting the least recently used entries if needed.
+
+        Parameters
+        ----------
+        expires_in: float, optional
+            Number of seconds until the value expires.
+        """
+        now = time.monotonic()
+        expires_at = float("inf") if expires_in is None else now + expires_in
+        size = 0 if self._sizeof is None else self._sizeof(value)
+        with self._lock:
+            self._evict_idle(now)
+            self._remove(key)
+            self._entries[key] = (now, expires_at, value, size)
+            self._memory_bytes += size
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _acquire_creation_lock(self, key: KeyT) -> threading.Lock:
+        with self._lock:
+            lock, waiting = self._creation_locks.get(key, (threading.Lock(), 0))
+            self._creation_locks[key] = (lock, waiting + 1)
+        lock.acquire()  # pylint: disable=consider-using-with
+        return lock
+
+    def _release_creation_lock(self, key: KeyT, lock: threading.Lock) -> None:
+        lock.release()
+        with self._lock:
+            _, waiting = self._creation_locks[key]
+            if waiting == 1:
+                del self._creation_locks[key]
+            else:
+                self._creation_locks[key] = (lock, waiting - 1)
+
+    def get_or_create(self, key: KeyT, factory: Callable[[], ValueT]) -> ValueT:
+        """
+        Retrieve the value or create it with the factory on a miss.
+
+        The factory is called outside of the lock so slow factories
+        do not block lookups for other keys. Only one thread calls the
+        factory for a key, the others wait for its value.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        lock = self._acquire_creation_lock(key)
+        try:
+            # another thread may have created the value while waiting
+            value = self._get(key, record_miss=False)
+            if value is None:
+                value = factory()
+                self.put(key, value)
+            return value
+        finally:
+            self._release_creation_lock(key, lock)
+
+    def pop(self, key: KeyT) -> Optional[ValueT]:
+        """
+        Remove the value from the cache.
+        """
+        with self._lock:
+            return self._remove(key)
+
+    def clear(self) -> None:
+        """
+        Remove all values from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+
+    def stats(self) -> LRUCacheStats:
+        """
+        Retrieve the cache statistics.
+        """
+        with self._lock:
+            return LRUCacheStats(
+                size=len(self._entries),
+                max_size=self.max_size,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                memory_bytes=self._memory_bytes,
+            )
@@ -0,0 +1,118 @@
+"""
+Adapters to use the tokens of an auth instance with other transports.
+
+All adapters use the :class:`~msal_requests_auth.auth.TokenProvider`
+of the auth, so they share its in-memory token state.
+"""
+from typing import Any, Callable, Dict, Optional, Union
+
+from msal_requests_auth.auth.base_auth_client import BaseMSALRefreshAuth
+from msal_requests_auth.auth.token_provider import TokenProvider
+from msal_requests_auth.auth.token_snapshot import TokenSnapshotAuth
+
+TokenSource = Union[BaseMSALRefreshAuth, TokenSnapshotAuth, TokenProvider]
+
+
+def _get_token_provider(token_source: TokenSource) -> TokenProvider:
+    if isinstance(token_source, (BaseMSALRefreshAuth, TokenSnapshotAuth)):
+        return token_source.token_provider
+    return token_source
+
+
+def _import_grpc():
+    """
+    Method to import grpc with error message
+    """
+    try:
+        import grpc  # pylint: disable=import-outside-toplevel
+    except ModuleNotFoundError as error:
+        raise ModuleNotFoundError(
+            "Please install msal_requests_auth with the "
+            "'grpc' extra: msal_requests_auth[grpc]."
+        ) from error
+    return grpc
+
+
+class GrpcAuthMetadataPlugin:
+    """
+    gRPC auth metadata plugin that adds the token to the call metadata.
+
+    .. versionadded:: 0.10.0
+
+    .. note:: Requires grpcio to be installed. The 'grpc'
+              extra can be used for that (msal_requests_auth[grpc]).
+    """
+
+    def __init__(self, token_source: TokenSource) -> None:
+        """
+        Parameters
+        ----------
+        token_source: Union[BaseMSALRefreshAuth, TokenSnapshotAuth, TokenProvider]
+            The auth or token provider to get tokens from.
+        """
+        self.token_provider = _get_token_provider(token_source)
+
+    def __call__(
+        self,
+        context: Any,
+        callback: Callable[[Any, Optional[Exception]], None],
+    ) -> None:
+        """
+        Passes the authorization metadata to the callback.
+        """
+        try:
+            header = self.token_provider.get_header()
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            callback((), error)
+            return
+        callback((("authorization", header),), None)
+
+
+def grpc_call_credentials(token_source: TokenSource):
+    """
+    Create gRPC call credentials from the auth or token provider.
+
+    .. versionadded:: 0.10.0
+
+    .. code-block:: python
+
+        credentials = grpc.composite_channel_credentials(
+            grpc.ssl_channel_credentials(), grpc_call_credentials(auth)
+        )
+        channel = grpc.secure_channel(target, credentials)
+
+    Returns
+    -------
+    grpc.CallCredentials
+    """
+    return _import_grpc().metadata_call_credentials(
+        GrpcAuthMetadataPlugin(token_source), name="msal_requests_auth"
+    )
+
+
+def urllib3_headers(
+    token_source: TokenSource, headers: Optional[Dict[str, str]] = None
+) -> Dict[str, str]:
+    """
+    Retrieve the request headers with the authorization header for
+    urllib3 or other clients that take headers (e.g. websockets).
+
+    .. versionadded:: 0.10.0
+
+    .. code-block:: python
+
+        http = urllib3.PoolManager()
+        response = http.request("GET", url, headers=urllib3_headers(auth))
+
+    Parameters
+    ----------
+    token_source: Union[BaseMSALRefreshAuth, TokenSnapshotAuth, TokenProvider]
+        The auth or token provider to get tokens from.
+    headers: Dict[str, str], optional
+        Additional headers to include.
+
+    Returns
+    -------
+    dict
+    """
+    return {**(headers or {}), **_get_token_provider(token_source).get_headers()}
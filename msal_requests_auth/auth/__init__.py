@@ -1,2 +1,46 @@
-from .client_credential import ClientCredentialAuth  # noqa: F401
-from .device_code import DeviceCodeAuth  # noqa: F401
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .base_auth_client import ExpectedDurationAuth  # noqa: F401
+    from .certificate import CertificateCredential  # noqa: F401
+    from .client_credential import ClientCredentialAuth  # noqa: F401
+    from .device_code import DeviceCodeAuth, DeviceCodeLogin  # noqa: F401
+    from .multi_tenant import MultiTenantClientCredentialAuth  # noqa: F401
+    from .on_behalf_of import OnBehalfOfAuth, OnBehalfOfTokenCache  # noqa: F401
+    from .profiler import AuthLatencyProfiler, AuthProfile  # noqa: F401
+    from .resilience import ResiliencePolicy, ResilienceState  # noqa: F401
+    from .token_provider import AuthTiming, TokenProvider  # noqa: F401
+    from .token_snapshot import TokenSnapshotAuth  # noqa: F401
+
+# classes are loaded on first access to keep the package import fast
+_LAZY_ATTRIBUTES = {
+    "AuthLatencyProfiler": ".profiler",
+    "AuthProfile": ".profiler",
+    "AuthTiming": ".token_provider",
+    "CertificateCredential": ".certificate",
+    "ClientCredentialAuth": ".client_credential",
+    "DeviceCodeAuth": ".device_code",
+    "DeviceCodeLogin": ".device_code",
+    "ExpectedDurationAuth": ".base_auth_client",
+    "MultiTenantClientCredentialAuth": ".multi_tenant",
+    "OnBehalfOfAuth": ".on_behalf_of",
+    "OnBehalfOfTokenCache": ".on_behalf_of",
+    "ResiliencePolicy": ".resilience",
+    "ResilienceState": ".resilience",
+    "TokenProvider": ".token_provider",
+    "TokenSnapshotAuth": ".token_snapshot",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,13 +1,66 @@
 """
 Handles refresing tokens with MSAL.
 """
+import contextlib
+import threading
 from abc import abstractmethod
-from typing import Dict, List, Type
+from typing import TYPE_CHECKING, Any, Dict, Hashable, List, Optional, Type
 
-import msal
 import requests
 
-from msal_requests_auth.exceptions import AuthenticationError
+from .profiler import AuthLatencyProfiler
+from .resilience import ResiliencePolicy
+from .token_provider import (
+    TokenProvider,
+    _parse_retry_after,
+    get_shared_token_provider,
+    raise_authentication_error,
+    record_retry_after,
+)
+
+if TYPE_CHECKING:
+    import msal
+
+
+class _RetryAfterRecorder:
+    """
+    HTTP client that records the Retry-After header of the responses.
+    MSAL returns the error of throttled token requests without the headers.
+    """
+
+    def __init__(self, http_client: Any) -> None:
+        self.http_client = http_client
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.http_client, name)
+
+    @staticmethod
+    def _record(response: Any) -> Any:
+        retry_after = _parse_retry_after(response)
+        if retry_after is not None:
+            record_retry_after(retry_after)
+        return response
+
+    def post(self, *args: Any, **kwargs: Any) -> Any:
+        return self._record(self.http_client.post(*args, **kwargs))
+
+    def get(self, *args: Any, **kwargs: Any) -> Any:
+        return self._record(self.http_client.get(*args, **kwargs))
+
+
+_RECORDER_LOCK = threading.Lock()
+
+
+def _record_retry_after(client: "msal.ClientApplication") -> None:
+    """
+    Wrap the HTTP client MSAL sends requests with to record the Retry-After header.
+    MSAL wraps it with its own throttling client, which looks it up on each request.
+    """
+    throttled_http_client: Any = getattr(client, "http_client", None)
+    with _RECORDER_LOCK:
+        http_client = getattr(throttled_http_client, "http_client", None)
+        if http_client is not None and not isinstance(http_client, _RetryAfterRecorder):
+            throttled_http_client.http_client = _RetryAfterRecorder(http_client)
 
 
 class BaseMSALRefreshAuth(requests.auth.AuthBase):
@@ -15,14 +68,29 @@ class BaseMSALRefreshAuth(requests.auth.AuthBase):
     Auth class for the device code flow with MSAL
     """
 
-    def __init__(self, client: msal.ClientApplication, scopes: List[str]):
+    def __init__(
+        self,
+        client: "msal.ClientApplication",
+        scopes: List[str],
+        resilience: Optional[ResiliencePolicy] = None,
+        profiler: Optional[AuthLatencyProfiler] = None,
+    ):
         """
+        .. versionadded:: 0.10.0 resilience, profiler
+
         Parameters
         ----------
         client: msal.ClientApplication
             The MSAL client to use to get tokens.
         scopes: List[str]
             List of scopes to get token for.
+        resilience: ResiliencePolicy, optional
+            Controls retries of token requests after throttling or outages.
+            If not provided, a policy with the default settings is used.
+            Auth instances with the same client, scopes and settings share
+            their token, while each one uses its own policy.
+        profiler: AuthLatencyProfiler, optional
+            Reports where the time went when adding the token is slow.
         """
         if not isinstance(client, self._client_class):
             raise ValueError(
@@ -30,33 +98,116 @@ class BaseMSALRefreshAuth(requests.auth.AuthBase):
             )
         self.client = client
         self.scopes = scopes
+        self.profiler = profiler
+        _record_retry_after(client)
+        self.token_provider = get_shared_token_provider(
+            (id(client), type(self), self._token_state_key()),
+            lambda: TokenProvider(
+                self._get_access_token,
+                resilience=resilience,
+                refresh_token=self._refresh_access_token,
+            ),
+        )
 
     @property
     @abstractmethod
-    def _client_class(self) -> Type[msal.ClientApplication]:
+    def _client_class(self) -> Type["msal.ClientApplication"]:
         """
         This is the expected type of the client class.
         """
         raise NotImplementedError
 
+    def _token_state_key(self) -> Hashable:
+        """
+        Identifies the tokens of this auth for the MSAL client
+        so that auth instances with the same key share their token.
+        Subclasses include the settings that change the token requested.
+        """
+        return tuple(self.scopes)
+
+    @property
+    def resilience(self) -> ResiliencePolicy:
+        """
+        The resilience policy of the token provider.
+
+        .. versionadded:: 0.10.0
+        """
+        return self.token_provider.resilience
+
+    @property
+    def remaining_lifetime(self) -> float:
+        """
+        Number of seconds until the current token expires.
+        0 if no token was retrieved yet.
+
+        .. versionadded:: 0.10.0
+        """
+        return self.token_provider.remaining_lifetime
+
+    def for_duration(
+        self, duration: Optional[float] = None, upload_rate: Optional[float] = None
+    ) -> "ExpectedDurationAuth":
+        """
+        Auth for requests that take a long time, such as large uploads.
+        A new token is requested before sending if the current one
+        would expire before the request is expected to finish.
+
+        .. versionadded:: 0.10.0
+
+        .. code-block:: python
+
+            requests.put(url, data=data, auth=auth.for_duration(upload_rate=1e6))
+
+        Parameters
+        ----------
+        duration: float, optional
+            Number of seconds the request is expected to take.
+        upload_rate: float, optional
+            Bytes per second used to estimate the duration from the body size.
+
+        Returns
+        -------
+        ExpectedDurationAuth
+        """
+        return ExpectedDurationAuth(self, duration=duration, upload_rate=upload_rate)
+
     def __call__(
         self, input_request: requests.PreparedRequest
     ) -> requests.PreparedRequest:
         """
         Adds the token to the authorization header.
+
+        .. versionadded:: 0.10.0
+
+            The :class:`AuthTiming` is added to the response as `auth_timing`.
         """
-        token = self.get_access_token()
-        input_request.headers[
-            "Authorization"
-        ] = f"{token['token_type']} {token['access_token']}"
+        return self._add_token(input_request)
+
+    def _add_token(
+        self, input_request: requests.PreparedRequest, min_lifetime: float = 0
+    ) -> requests.PreparedRequest:
+        """
+        Adds the token to the authorization header
+        and the timing to the response with a hook.
+        """
+        with (
+            contextlib.nullcontext(None)
+            if self.profiler is None
+            else self.profiler.profile()
+        ) as record_timing:
+            header, timing = self.token_provider.get_timed_header(min_lifetime)
+            if record_timing is not None:
+                record_timing(timing)
+        input_request.headers["Authorization"] = header
+
+        def add_auth_timing(response: requests.Response, *_args: Any, **_kwargs: Any):
+            response.auth_timing = timing  # type: ignore[attr-defined]
+
+        input_request.register_hook("response", add_auth_timing)
         return input_request
 
     def _raise_authentication_error(self, token_payload: Dict[str, str]):
-        error = token_payload.get("error")
-        description = token_payload.get("error_description")
-        raise AuthenticationError(
-            f"Unable to get token. Error: {error} (Details: {description})."
-        )
+        raise_authentication_error(token_payload)
 
     def get_access_token(self) -> Dict[str, str]:
         """
@@ -64,14 +215,18 @@ class BaseMSALRefreshAuth(requests.auth.AuthBase):
 
         .. versionadded:: 0.8.0
 
+        .. versionadded:: 0.10.0
+
+            The token is reused from memory until it is close to expiry.
+            When Azure AD is throttling or unavailable, token requests are paused
+            according to the resilience policy and the last token is used
+            until it expires.
+
         Returns
         -------
         dict
         """
-        token = self._get_access_token()
-        if "access_token" not in token:
-            self._raise_authentication_error(token)
-        return token
+        return self.token_provider.get_token()
 
     @abstractmethod
     def _get_access_token(self) -> Dict[str, str]:
@@ -83,3 +238,79 @@ class BaseMSALRefreshAuth(requests.auth.AuthBase):
         dict
         """
         raise NotImplementedError
+
+    def _refresh_access_token(self) -> Dict[str, str]:
+        """
+        Return a new token dictionary from Azure AD without using the MSAL cache
+        if the flow supports it.
+
+        Returns
+        -------
+        dict
+        """
+        return self._get_access_token()
+
+
+def _get_body_size(input_request: requests.PreparedRequest) -> Optional[int]:
+    """
+    Retrieve the size of the request body if it is known.
+    """
+    if content_length := input_request.headers.get("Content-Length"):
+        return int(content_length)
+    if isinstance(input_request.body, (bytes, str)):
+        return len(input_request.body)
+    return None
+
+
+class ExpectedDurationAuth(requests.auth.AuthBase):
+    """
+    Adds a token that remains valid for the expected duration of the request.
+    Created with :meth:`BaseMSALRefreshAuth.for_duration`.
+
+    .. versionadded:: 0.10.0
+    """
+
+    def __init__(
+        self,
+        auth: BaseMSALRefreshAuth,
+        duration: Optional[float] = None,
+        upload_rate: Optional[float] = None,
+    ):
+        """
+        Parameters
+        ----------
+        auth: BaseMSALRefreshAuth
+            The auth to get tokens from.
+        duration: float, optional
+            Number of seconds the request is expected to take.
+        upload_rate: float, optional
+            Bytes per second used to estimate the duration from the body size.
+        """
+        self.auth = auth
+        self.duration = duration
+        self.upload_rate = upload_rate
+
+    def expected_duration(self, input_request: requests.PreparedRequest) -> float:
+        """
+        Retrieve the number of seconds the request is expected to take.
+        The longest of the duration and the estimate from the body size is used.
+
+        Returns
+        -------
+        float
+        """
+        durations = [0.0 if self.duration is None else self.duration]
+        if self.upload_rate and (body_size := _get_body_size(input_request)):
+            durations.append(body_size / self.upload_rate)
+        return max(durations)
+
+    def __call__(
+        self, input_request: requests.PreparedRequest
+    ) -> requests.PreparedRequest:
+        """
+        Adds the token to the authorization header.
+        """
+        # pylint: disable=protected-access
+        return self.auth._add_token(
+            input_request, min_lifetime=self.expected_duration(input_request)
+        )
@@ -0,0 +1,215 @@
+"""
+Module for handling certificate credentials for the client credential flow.
+"""
+import base64
+import functools
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import jwt
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.serialization import pkcs12
+
+from msal_requests_auth._lru import _LRUCache
+
+
+class _Certificate(NamedTuple):
+    private_key: Any
+    #: base64url encoded SHA-256 thumbprint of the certificate
+    x5t_s256: str
+    x5c: List[str]
+
+
+# parsed certificates by path, modified time and passphrase digest
+_CERTIFICATES: _LRUCache[Tuple[str, int, Optional[bytes]], _Certificate] = _LRUCache(
+    max_size=32
+)
+# the passphrase is hashed with a per-process key, so it is not kept in the cache
+_PASSPHRASE_KEY = secrets.token_bytes(32)
+
+
+def _load_certificate(
+    certificate_path: str, modified_time: int, passphrase: Optional[bytes]
+) -> _Certificate:
+    """
+    Retrieve the parsed certificate, parsing the file once.
+
+    The modified time is part of the cache key so that
+    a rotated certificate file is picked up.
+    """
+    passphrase_digest = (
+        None
+        if passphrase is None
+        else hmac.digest(_PASSPHRASE_KEY, passphrase, hashlib.sha256)
+    )
+    return _CERTIFICATES.get_or_create(
+        (certificate_path, modified_time, passphrase_digest),
+        functools.partial(_parse_certificate, certificate_path, passphrase),
+    )
+
+
+def _parse_certificate(
+    certificate_path: str, passphrase: Optional[bytes]
+) -> _Certificate:
+    """
+    Parse the private key and certificate from a PEM or PFX file.
+    """
+    data = Path(certificate_path).read_bytes()
+    if certificate_path.lower().endswith((".pfx", ".p12")):
+        private_key, certificate, _ = pkcs12.load_key_and_certificates(data, passphrase)
+        if private_key is None or certificate is None:
+            raise ValueError(
+                f"PFX file must contain a private key and certificate: {certificate_path}"
+            )
+    else:
+        private_key = serialization.load_pem_private_key(data, passphrase)
+        certificate = x509.load_pem_x509_certificate(data)
+    certificate_pem = certificate.public_bytes(serialization.Encoding.PEM).decode()
+    return _Certificate(
+        private_key=private_key,
+        x5t_s256=base64.urlsafe_b64encode(
+            certificate.fingerprint(hashes.SHA256())
+        ).decode("utf-8"),
+        x5c=["\n".join(certificate_pem.splitlines()[1:-1])],
+    )
+
+
+class CertificateCredential:
+    """
+    Certificate credential for :class:`msal.ConfidentialClientApplication`.
+
+    The private key is parsed once per certificate file and signed
+    client assertions are reused within their validity window instead of
+    being re-signed for every token request.
+
+    .. versionadded:: 0.10.0
+
+    .. code-block:: python
+
+        credential = CertificateCredential(client_id, "certificate.pem")
+        app = msal.ConfidentialClientApplication(
+            client_id,
+            authority=authority,
+            client_credential=credential.client_credential(authority),
+        )
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        certificate_path: Union[str, os.PathLike],
+        passphrase: Optional[str] = None,
+        send_certificate_chain: bool = False,
+        assertion_lifetime: int = 600,
+        refresh_margin: int = 60,
+    ):
+        """
+        Parameters
+        ----------
+        client_id: str
+            The client ID of the application in Azure AD.
+        certificate_path: Union[str, os.PathLike]
+            Path to a PEM file with the private key and certificate
+            or a PFX file (.pfx/.p12).
+        passphrase: str, optional
+            Passphrase of the private key.
+        send_certificate_chain: bool, default=False
+            If True, adds the certificate to the x5c header
+            for subject name/issuer authentication.
+        assertion_lifetime: int, default=600
+            Number of seconds a signed client assertion is valid.
+        refresh_margin: int, default=60
+            Number of seconds before expiry a new client assertion is signed.
+        """
+        if refresh_margin >= assertion_lifetime:
+            raise ValueError("refresh_margin must be less than assertion_lifetime.")
+        self.client_id = client_id
+        self.certificate_path = Path(certificate_path)
+        self.send_certificate_chain = send_certificate_chain
+        self.assertion_lifetime = assertion_lifetime
+        self.refresh_margin = refresh_margin
+        self._passphrase = passphrase.encode("utf-8") if passphrase else None
+        # audience -> (expires_at, client assertion)
+        self._assertions: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def _sign_assertion(self, audience: str, issued_at: int, expires_at: int) -> str:
+        """
+        Sign a client assertion as described in:
+        https://learn.microsoft.com/en-us/entra/identity-platform/certificate-credentials
+        """
+        certificate = _load_certificate(
+            str(self.certificate_path),
+            self.certificate_path.stat().st_mtime_ns,
+            self._passphrase,
+        )
+        headers: Dict[str, Any] = {"x5t#S256": certificate.x5t_s256}
+        if self.send_certificate_chain:
+            headers["x5c"] = certificate.x5c
+        return jwt.encode(
+            {
+                "aud": audience,
+                "iss": self.client_id,
+                "sub": self.client_id,
+                "jti": str(uuid.uuid4()),
+                "iat": issued_at,
+                "nbf": issued_at,
+                "exp": expires_at,
+            },
+            certificate.private_key,
+            algorithm="PS256",
+            headers=headers,
+        )
+
+    def get_client_assertion(self, token_endpoint: str) -> str:
+        """
+        Retrieve a signed client assertion for the token endpoint.
+
+        Parameters
+        ----------
+        token_endpoint: str
+            The token endpoint the assertion is for (the audience).
+
+        Returns
+        -------
+        str
+        """
+        now = time.time()
+        with self._lock:
+            expires_at, assertion = self._assertions.get(token_endpoint, (0.0, ""))
+            if expires_at - self.refresh_margin > now:
+                return assertion
+            issued_at = int(now)
+            expires_at = issued_at + self.assertion_lifetime
+            assertion = self._sign_assertion(token_endpoint, issued_at, expires_at)
+            self._assertions[token_endpoint] = (expires_at, assertion)
+            return assertion
+
+    def client_credential(self, authority: str) -> Dict[str, Callable[[], str]]:
+        """
+        Retrieve the client credential to pass into
+        :class:`msal.ConfidentialClientApplication`.
+
+        Parameters
+        ----------
+        authority: str
+            The authority used by the client (e.g. https://login.microsoftonline.com/<tenant ID>).
+
+        Returns
+        -------
+        dict
+        """
+        token_endpoint = f"{authority.rstrip('/')}/oauth2/v2.0/token"
+        return {
+            "client_assertion": functools.partial(
+                self.get_client_assertion, token_endpoint
+            )
+        }
@@ -1,19 +1,26 @@
 """
 Module for handling the Device Code flow with MSAL and credential refresh.
 """
-from typing import Dict
-
-from msal import ConfidentialClientApplication
+from typing import TYPE_CHECKING, Dict, Type
 
 from .base_auth_client import BaseMSALRefreshAuth
 
+if TYPE_CHECKING:
+    from msal import ConfidentialClientApplication
+
 
 class ClientCredentialAuth(BaseMSALRefreshAuth):
     """
     Auth class for the client credential flow with MSAL
     """
 
-    _client_class = ConfidentialClientApplication
+    @property
+    def _client_class(self) -> Type["ConfidentialClientApplication"]:
+        from msal.application import (  # pylint: disable=import-outside-toplevel
+            ConfidentialClientApplication,
+        )
+
+        return ConfidentialClientApplication
 
     def _get_access_token(self) -> Dict[str, str]:
         """
@@ -26,3 +33,25 @@ class ClientCredentialAuth(BaseMSALRefreshAuth):
             # "No suitable token exists in cache. Get a new one from AAD
             result = self.client.acquire_token_for_client(scopes=self.scopes)
         return result
+
+    def _refresh_access_token(self) -> Dict[str, str]:
+        """
+        Retrieve a new access token from Azure AD.
+
+        MSAL returns the cached token for the client credential flow,
+        so the cached access tokens for the scopes are removed first.
+        """
+        token_cache = self.client.token_cache
+        cached_tokens = list(
+            token_cache.search(
+                token_cache.CredentialType.ACCESS_TOKEN,
+                target=self.scopes,
+                query={
+                    "client_id": self.client.client_id,
+                    "realm": self.client.authority.tenant,
+                },
+            )
+        )
+        for cached_token in cached_tokens:
+            token_cache.remove_at(cached_token)
+        return self.client.acquire_token_for_client(scopes=self.scopes)
@@ -1,15 +1,90 @@
 """
 Module for handling the Device Code flow with MSAL and credential refresh.
 """
+import importlib
 import os
 import warnings
-import webbrowser
-from typing import Dict, List, Optional
-
-import pyperclip
-from msal import PublicClientApplication
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
 
 from .base_auth_client import BaseMSALRefreshAuth
+from .profiler import AuthLatencyProfiler
+from .resilience import ResiliencePolicy
+from .token_provider import TokenProvider, raise_authentication_error, record_auth_path
+
+if TYPE_CHECKING:
+    from msal import PublicClientApplication
+
+# only needed once a device flow starts, so they are imported on first use
+_INTERACTIVE_MODULES = {"pyperclip", "webbrowser"}
+
+
+def _import_interactive(name: str) -> ModuleType:
+    """
+    Import a module only needed for the interactive part of the device flow.
+    """
+    if name not in globals():
+        globals()[name] = importlib.import_module(name)
+    return globals()[name]
+
+
+def __getattr__(name: str) -> ModuleType:
+    if name in _INTERACTIVE_MODULES:
+        return _import_interactive(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _acquire_token_silent(
+    client: "PublicClientApplication", scopes: List[str], **kwargs: Any
+) -> Optional[Dict[str, str]]:
+    """
+    Retrieve a token from the MSAL cache for an account in the client tenant.
+    """
+    for account in client.get_accounts():
+        if account.get("realm") == client.authority.tenant:
+            if result := client.acquire_token_silent(
+                scopes=scopes, account=account, **kwargs
+            ):
+                return result
+    return None
+
+
+def _acquire_token_by_device_flow(
+    client: "PublicClientApplication", scopes: List[str], headless: bool
+) -> Dict[str, str]:
+    """
+    Prompt the user to sign in with the device code flow.
+    """
+    record_auth_path(TokenProvider.INTERACTIVE)
+    flow = client.initiate_device_flow(scopes=scopes)
+    if "message" not in flow:
+        raise_authentication_error(flow)
+    print(flow["message"])
+    if not headless:
+        # copy code to clipboard
+        try:
+            _import_interactive("pyperclip").copy(flow["user_code"])
+            _import_interactive("webbrowser").open(flow["verification_uri"])
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            warnings.warn(
+                "Error encountered while copying code to clipboard "
+                f"and opening a webbrowser ({error})."
+                "To hide this message, set headless=True "
+                "or set the MSAL_REQUESTS_AUTH_HEADLESS "
+                "environment variable to 'true'."
+            )
+    return client.acquire_token_by_device_flow(flow)
 
 
 class DeviceCodeAuth(BaseMSALRefreshAuth):
@@ -17,17 +92,26 @@ class DeviceCodeAuth(BaseMSALRefreshAuth):
     Auth class for the device code flow with MSAL
     """
 
-    _client_class = PublicClientApplication
+    @property
+    def _client_class(self) -> Type["PublicClientApplication"]:
+        from msal.application import (  # pylint: disable=import-outside-toplevel
+            PublicClientApplication,
+        )
+
+        return PublicClientApplication
 
     def __init__(
         self,
-        client: PublicClientApplication,
+        client: "PublicClientApplication",
         scopes: List[str],
         headless: Optional[bool] = None,
+        resilience: Optional[ResiliencePolicy] = None,
+        profiler: Optional[AuthLatencyProfiler] = None,
     ):
         """
         .. versionadded:: 0.2.0 headless
         .. versionadded:: 0.6.0 MSAL_REQUESTS_AUTH_HEADLESS environment variable
+        .. versionadded:: 0.10.0 resilience, profiler
 
         Parameters
         ----------
@@ -40,10 +124,17 @@ class DeviceCodeAuth(BaseMSALRefreshAuth):
             variable and default to False if it is not found.
             If False, it will open a webbrowser and copy the code to the clipboard.
             If True, it will skip automatically opening webbrowser and copying to clipboard.
+        resilience: ResiliencePolicy, optional
+            Controls retries of token requests after throttling or outages.
+        profiler: AuthLatencyProfiler, optional
+            Reports where the time went when adding the token is slow.
         """
-        super().__init__(client, scopes)
         headless_default = bool(os.getenv("MSAL_REQUESTS_AUTH_HEADLESS", False))
         self._headless = headless_default if headless is None else headless
+        super().__init__(client, scopes, resilience=resilience, profiler=profiler)
+
+    def _token_state_key(self) -> Hashable:
+        return (tuple(self.scopes), self._headless)
 
     def _get_access_token(self) -> Dict[str, str]:
         """
@@ -51,33 +142,102 @@ class DeviceCodeAuth(BaseMSALRefreshAuth):
 
         Based on README: https://github.com/AzureAD/microsoft-authentication-library-for-python
         """
-        accounts = self.client.get_accounts()
-        for account in accounts:
-            if account.get("realm") == self.client.authority.tenant:
-                # use MSAL cache if available
-                if result := self.client.acquire_token_silent(
-                    scopes=self.scopes,
-                    account=account,
-                ):
-                    return result
-        # "No suitable token exists in cache. Get a new one from AAD
-        flow = self.client.initiate_device_flow(
-            scopes=self.scopes,
+        # use MSAL cache if available
+        if result := _acquire_token_silent(self.client, self.scopes):
+            return result
+        # No suitable token exists in cache. Get a new one from AAD
+        return _acquire_token_by_device_flow(self.client, self.scopes, self._headless)
+
+    def _refresh_access_token(self) -> Dict[str, str]:
+        """
+        Retrieve a new access token from MSAL with the refresh token.
+        """
+        if result := _acquire_token_silent(
+            self.client, self.scopes, force_refresh=True
+        ):
+            return result
+        return self._get_access_token()
+
+
+class DeviceCodeLogin:
+    """
+    Sign in once per tenant for several DeviceCodeAuth instances.
+
+    A device flow is started for the first scope set without a cached token
+    in each tenant. Tokens for the other scope sets are then retrieved
+    in parallel from the refresh token in the MSAL cache, so the
+    DeviceCodeAuth instances do not prompt again.
+
+    .. versionadded:: 0.10.0
+
+    """
+
+    def __init__(self, auths: Iterable[DeviceCodeAuth] = (), max_workers: int = 8):
+        """
+        Parameters
+        ----------
+        auths: Iterable[DeviceCodeAuth], optional
+            DeviceCodeAuth instances to sign in for.
+        max_workers: int, default=8
+            Maximum number of tokens retrieved from the MSAL cache in parallel.
+        """
+        self.max_workers = max_workers
+        self._auths: List[DeviceCodeAuth] = []
+        for auth in auths:
+            self.register(auth)
+
+    def register(self, auth: DeviceCodeAuth) -> DeviceCodeAuth:
+        """
+        Add a DeviceCodeAuth instance to sign in for.
+
+        Returns
+        -------
+        DeviceCodeAuth:
+            The registered instance.
+        """
+        self._auths.append(auth)
+        return auth
+
+    @staticmethod
+    def _login_key(auth: DeviceCodeAuth) -> Tuple[str, str, int]:
+        """
+        Instances with the same key share a refresh token after signing in.
+        """
+        client = auth.client
+        return (client.client_id, client.authority.tenant, id(client.token_cache))
+
+    def _without_cached_token(
+        self, executor: ThreadPoolExecutor, auths: List[DeviceCodeAuth]
+    ) -> List[DeviceCodeAuth]:
+        """
+        Retrieve tokens from the MSAL cache in parallel
+        and return the instances without one.
+        """
+        results = executor.map(
+            lambda auth: _acquire_token_silent(auth.client, auth.scopes), auths
         )
-        if "message" not in flow:
-            self._raise_authentication_error(flow)
-        print(flow["message"])
-        if not self._headless:
-            # copy code to clipboard
-            try:
-                pyperclip.copy(flow["user_code"])
-                webbrowser.open(flow["verification_uri"])
-            except Exception as error:  # pylint: disable=broad-exception-caught
-                warnings.warn(
-                    "Error encountered while copying code to clipboard "
-                    f"and opening a webbrowser ({error})."
-                    "To hide this message, set headless=True "
-                    "or set the MSAL_REQUESTS_AUTH_HEADLESS "
-                    "environment variable to 'true'."
-                )
-        return self.client.acquire_token_by_device_flow(flow)
+        return [
+            auth
+            for auth, result in zip(auths, results)
+            if not result or "access_token" not in result
+        ]
+
+    def login(self) -> None:
+        """
+        Sign in for all registered instances.
+        Device flows are started one tenant at a time.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            logins: Dict[Tuple[str, str, int], List[DeviceCodeAuth]] = {}
+            for auth in self._without_cached_token(executor, self._auths):
+                logins.setdefault(self._login_key(auth), []).append(auth)
+            for pending in logins.values():
+                while pending:
+                    auth = pending.pop(0)
+                    # pylint: disable=protected-access
+                    result = _acquire_token_by_device_flow(
+                        auth.client, auth.scopes, auth._headless
+                    )
+                    if "access_token" not in result:
+                        raise_authentication_error(result)
+                    pending = self._without_cached_token(executor, pending)
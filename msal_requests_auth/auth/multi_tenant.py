@@ -0,0 +1,131 @@
+"""
+Module for handling the client credential flow with MSAL across multiple tenants.
+"""
+import re
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+import requests
+
+from msal_requests_auth._lru import LRUCacheStats, _LRUCache
+from msal_requests_auth.exceptions import AuthenticationError
+
+from .client_credential import ClientCredentialAuth
+
+if TYPE_CHECKING:
+    from msal import ConfidentialClientApplication
+
+
+class MultiTenantClientCredentialAuth(requests.auth.AuthBase):
+    """
+    Auth class for the client credential flow with MSAL when the tenant
+    depends on the request.
+
+    MSAL clients are created per tenant with the client factory and kept in a
+    bounded LRU pool so that each tenant reuses its client and token cache
+    without keeping every tenant in memory forever.
+
+    .. versionadded:: 0.10.0
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[str], "ConfidentialClientApplication"],
+        scopes: List[str],
+        tenant_resolver: Optional[Callable[[requests.PreparedRequest], str]] = None,
+        tenant_url_pattern: Optional[str] = None,
+        max_clients: int = 128,
+        max_idle: Optional[float] = 3600,
+    ):
+        """
+        Parameters
+        ----------
+        client_factory: Callable[[str], msal.ConfidentialClientApplication]
+            Creates the MSAL client for a tenant ID.
+        scopes: List[str]
+            List of scopes to get token for.
+        tenant_resolver: Callable[[requests.PreparedRequest], str], optional
+            Returns the tenant ID for a request.
+        tenant_url_pattern: str, optional
+            Regular expression matched against the request URL to get the tenant ID.
+            The tenant is the named group 'tenant' or the first group.
+        max_clients: int, default=128
+            Maximum number of tenant clients to keep.
+        max_idle: float, optional, default=3600
+            Number of seconds a tenant client can go unused before it is removed.
+        """
+        if (tenant_resolver is None) == (tenant_url_pattern is None):
+            raise ValueError(
+                "Either tenant_resolver or tenant_url_pattern must be provided."
+            )
+        self.client_factory = client_factory
+        self.scopes = scopes
+        self._tenant_resolver = tenant_resolver
+        self._tenant_url_pattern = (
+            None if tenant_url_pattern is None else re.compile(tenant_url_pattern)
+        )
+        if self._tenant_url_pattern is not None and not self._tenant_url_pattern.groups:
+            raise ValueError(
+                "tenant_url_pattern must have a group that captures the tenant."
+            )
+        self._pool: _LRUCache[str, ClientCredentialAuth] = _LRUCache(
+            max_size=max_clients, max_idle=max_idle
+        )
+
+    def __call__(
+        self, input_request: requests.PreparedRequest
+    ) -> requests.PreparedRequest:
+        """
+        Adds the token for the tenant of the request to the authorization header.
+        """
+        return self.get_tenant_auth(self.resolve_tenant(input_request))(input_request)
+
+    def resolve_tenant(self, input_request: requests.PreparedRequest) -> str:
+        """
+        Retrieve the tenant ID for the request.
+
+        Returns
+        -------
+        str
+        """
+        if self._tenant_resolver is not None:
+            return self._tenant_resolver(input_request)
+        match = self._tenant_url_pattern.search(  # type: ignore[union-attr]
+            input_request.url or ""
+        )
+        if match is None:
+            raise AuthenticationError(
+                f"Unable to determine tenant from URL: {input_request.url}"
+            )
+        return match.groupdict().get("tenant") or match.group(1)
+
+    def get_tenant_auth(self, tenant: str) -> ClientCredentialAuth:
+        """
+        Retrieve the auth for the tenant from the pool.
+
+        Returns
+        -------
+        ClientCredentialAuth
+        """
+        return self._pool.get_or_create(
+            tenant,
+            lambda: ClientCredentialAuth(
+                client=self.client_factory(tenant), scopes=self.scopes
+            ),
+        )
+
+    def get_access_token(self, tenant: str) -> Dict[str, str]:
+        """
+        Retrieves the token dictionary for the tenant from Azure AD.
+
+        Returns
+        -------
+        dict
+        """
+        return self.get_tenant_auth(tenant).get_access_token()
+
+    @property
+    def pool_stats(self) -> LRUCacheStats:
+        """
+        Statistics of the pool of tenant clients.
+        """
+        return self._pool.stats()
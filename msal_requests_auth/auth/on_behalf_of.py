@@ -0,0 +1,263 @@
+"""
+Module for handling the On-Behalf-Of flow with MSAL and credential refresh.
+"""
+import hashlib
+import sys
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Dict, Hashable, List, Optional, Tuple, Type
+
+from msal_requests_auth._lru import LRUCacheStats, _LRUCache
+
+from .base_auth_client import BaseMSALRefreshAuth
+from .profiler import AuthLatencyProfiler
+from .resilience import ResiliencePolicy
+from .token_provider import TokenProvider, record_auth_path
+
+if TYPE_CHECKING:
+    from msal import ConfidentialClientApplication
+
+_CacheKey = Tuple[str, str, str, Tuple[str, ...]]
+
+
+def _sizeof_token(token: Dict[str, str]) -> int:
+    """
+    Estimate the memory used by a token dictionary in bytes.
+    """
+    return sys.getsizeof(token) + sum(
+        sys.getsizeof(key) + sys.getsizeof(value) for key, value in token.items()
+    )
+
+
+def _remove_user_tokens(
+    client: "ConfidentialClientApplication", access_token: str
+) -> None:
+    """
+    Remove the entries MSAL added to the token cache of the client
+    for the user of the exchanged access token.
+    """
+    token_cache = client.token_cache
+    credential_type = token_cache.CredentialType
+    cached_tokens = list(
+        token_cache.search(
+            credential_type.ACCESS_TOKEN,
+            query={"client_id": client.client_id, "secret": access_token},
+        )
+    )
+    for cached_token in cached_tokens:
+        if cached_token.get("home_account_id") is None:
+            continue
+        user_query = {
+            "home_account_id": cached_token["home_account_id"],
+            "environment": cached_token["environment"],
+        }
+        for search_type, remove in (
+            (credential_type.ACCESS_TOKEN, token_cache.remove_at),
+            (credential_type.REFRESH_TOKEN, token_cache.remove_rt),
+            (credential_type.ID_TOKEN, token_cache.remove_idt),
+            (credential_type.ACCOUNT, token_cache.remove_account),
+        ):
+            for entry in list(token_cache.search(search_type, query=user_query)):
+                remove(entry)
+
+
+class OnBehalfOfTokenCache:
+    """
+    Bounded LRU cache of tokens exchanged with the On-Behalf-Of flow.
+
+    Tokens are keyed by the client ID, the authority, the hash of the
+    user assertion and the scopes and expire before the access token does.
+    The cache can be shared by several MSAL clients. Concurrent exchanges
+    for the same key are coalesced into a single request to Azure AD.
+
+    The entries MSAL adds to the token cache of the client for the user
+    are removed after the exchange, so the tokens are only kept here
+    and the memory used is bounded by the maximum size.
+
+    .. versionadded:: 0.10.0
+    """
+
+    def __init__(self, max_size: int = 1024, refresh_margin: float = 300) -> None:
+        """
+        Parameters
+        ----------
+        max_size: int, default=1024
+            Maximum number of tokens to keep.
+        refresh_margin: float, default=300
+            Number of seconds before the access token expires
+            that it is removed from the cache. At most half of the
+            token lifetime, so that short lived tokens are cached too.
+        """
+        self.refresh_margin = refresh_margin
+        self._tokens: _LRUCache[_CacheKey, Dict[str, str]] = _LRUCache(
+            max_size=max_size, sizeof=_sizeof_token
+        )
+        # key -> (lock, number of waiting threads)
+        self._exchange_locks: Dict[_CacheKey, Tuple[threading.Lock, int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(
+        client: "ConfidentialClientApplication", user_assertion: str, scopes: List[str]
+    ) -> _CacheKey:
+        """
+        Build the cache key without keeping the user assertion in memory.
+        """
+        return (
+            client.client_id,
+            client.authority.token_endpoint,
+            hashlib.sha256(user_assertion.encode("utf-8")).hexdigest(),
+            tuple(sorted(scope.lower() for scope in scopes)),
+        )
+
+    def _acquire_exchange_lock(self, key: _CacheKey) -> threading.Lock:
+        with self._lock:
+            lock, waiting = self._exchange_locks.get(key, (threading.Lock(), 0))
+            self._exchange_locks[key] = (lock, waiting + 1)
+        lock.acquire()  # pylint: disable=consider-using-with
+        return lock
+
+    def _release_exchange_lock(self, key: _CacheKey, lock: threading.Lock) -> None:
+        lock.release()
+        with self._lock:
+            _, waiting = self._exchange_locks[key]
+            if waiting == 1:
+                del self._exchange_locks[key]
+            else:
+                self._exchange_locks[key] = (lock, waiting - 1)
+
+    def get_token(
+        self,
+        client: "ConfidentialClientApplication",
+        user_assertion: str,
+        scopes: List[str],
+    ) -> Dict[str, str]:
+        """
+        Retrieve the token from the cache or exchange the user assertion for it.
+
+        Returns
+        -------
+        dict
+        """
+        key = self.cache_key(client, user_assertion, scopes)
+        token = self._tokens.get(key)
+        if token is not None:
+            record_auth_path(TokenProvider.CACHE)
+            return token
+        lock = self._acquire_exchange_lock(key)
+        try:
+            # another thread may have exchanged the assertion while waiting
+            # pylint: disable=protected-access
+            token = self._tokens._get(key, record_miss=False)
+            if token is not None:
+                record_auth_path(TokenProvider.CACHE)
+                return token
+            result = client.acquire_token_on_behalf_of(
+                user_assertion=user_assertion, scopes=scopes
+            )
+            if "access_token" in result:
+                _remove_user_tokens(client, result["access_token"])
+                expires_in = float(result.get("expires_in", 0))
+                self._tokens.put(
+                    key,
+                    result,
+                    expires_in=expires_in - min(self.refresh_margin, expires_in / 2),
+                )
+            return result
+        finally:
+            self._release_exchange_lock(key, lock)
+
+    def stats(self) -> LRUCacheStats:
+        """
+        Retrieve the cache statistics.
+        """
+        return self._tokens.stats()
+
+    def clear(self) -> None:
+        """
+        Remove all tokens from the cache.
+        """
+        self._tokens.clear()
+
+
+# default On-Behalf-Of token cache for each MSAL client
+_CLIENT_TOKEN_CACHES: "weakref.WeakKeyDictionary[Any, OnBehalfOfTokenCache]" = (
+    weakref.WeakKeyDictionary()
+)
+_CLIENT_TOKEN_CACHES_LOCK = threading.Lock()
+
+
+def _get_client_token_cache(
+    client: "ConfidentialClientApplication",
+) -> OnBehalfOfTokenCache:
+    with _CLIENT_TOKEN_CACHES_LOCK:
+        token_cache = _CLIENT_TOKEN_CACHES.get(client)
+        if token_cache is None:
+            token_cache = _CLIENT_TOKEN_CACHES[client] = OnBehalfOfTokenCache()
+        return token_cache
+
+
+class OnBehalfOfAuth(BaseMSALRefreshAuth):
+    """
+    Auth class for the On-Behalf-Of flow with MSAL
+
+    .. versionadded:: 0.10.0
+    """
+
+    def __init__(
+        self,
+        client: "ConfidentialClientApplication",
+        scopes: List[str],
+        user_assertion: str,
+        token_cache: Optional[OnBehalfOfTokenCache] = None,
+        resilience: Optional[ResiliencePolicy] = None,
+        profiler: Optional[AuthLatencyProfiler] = None,
+    ):
+        """
+        Parameters
+        ----------
+        client: msal.ConfidentialClientApplication
+            The MSAL client to use to get tokens.
+        scopes: List[str]
+            List of scopes to get token for.
+        user_assertion: str
+            The access token of the incoming request for the user.
+        token_cache: OnBehalfOfTokenCache, optional
+            Cache for exchanged tokens. If not provided,
+            a cache shared by all auth instances using the client is used.
+        resilience: ResiliencePolicy, optional
+            Controls retries of token requests after throttling or outages.
+        profiler: AuthLatencyProfiler, optional
+            Reports where the time went when adding the token is slow.
+        """
+        self.user_assertion = user_assertion
+        self.token_cache = (
+            _get_client_token_cache(client) if token_cache is None else token_cache
+        )
+        super().__init__(client, scopes, resilience=resilience, profiler=profiler)
+
+    @property
+    def _client_class(self) -> Type["ConfidentialClientApplication"]:
+        from msal.application import (  # pylint: disable=import-outside-toplevel
+            ConfidentialClientApplication,
+        )
+
+        return ConfidentialClientApplication
+
+    def _token_state_key(self) -> Hashable:
+        return (
+            OnBehalfOfTokenCache.cache_key(
+                self.client, self.user_assertion, self.scopes
+            ),
+            id(self.token_cache),
+        )
+
+    def _get_access_token(self) -> Dict[str, str]:
+        """
+        Retrieve access token from MSAL using the On-Behalf-Of flow.
+
+        Based on: https://learn.microsoft.com/en-us/entra/identity-platform/v2-oauth2-on-behalf-of-flow
+        """
+        return self.token_cache.get_token(
+            client=self.client, user_assertion=self.user_assertion, scopes=self.scopes
+        )
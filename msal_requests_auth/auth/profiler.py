@@ -0,0 +1,132 @@
+"""
+Sampling profiler for slow token retrieval.
+"""
+import collections
+import contextlib
+import sys
+import threading
+import time
+import traceback
+import warnings
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from .token_provider import AuthTiming
+
+#: stack of a sample from the outermost call, formatted as 'file:line function'
+Stack = Tuple[str, ...]
+
+
+class AuthProfile(NamedTuple):
+    """
+    Samples of the stack while adding the token to a slow request.
+
+    .. versionadded:: 0.10.0
+    """
+
+    timing: AuthTiming
+    #: number of samples for each stack
+    samples: Dict[Stack, int]
+    #: seconds between samples
+    interval: float
+
+
+def _get_stack(frame) -> Stack:
+    stack = traceback.StackSummary.extract(
+        traceback.walk_stack(frame), lookup_lines=False
+    )
+    return tuple(
+        f"{summary.filename}:{summary.lineno} {summary.name}"
+        for summary in reversed(stack)
+    )
+
+
+class AuthLatencyProfiler:
+    """
+    Samples the stack of threads while they add the token to a request
+    and reports the samples of the requests slower than the threshold.
+
+    Sampling runs in a background thread that stops when no requests
+    have been profiled for a second.
+
+    .. versionadded:: 0.10.0
+
+    .. code-block:: python
+
+        profiler = AuthLatencyProfiler(lambda profile: logger.warning(profile), 1.0)
+        auth = DeviceCodeAuth(client=app, scopes=scopes, profiler=profiler)
+    """
+
+    _idle_timeout = 1.0
+
+    def __init__(
+        self,
+        callback: Callable[[AuthProfile], None],
+        threshold: float = 1.0,
+        interval: float = 0.01,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        callback: Callable[[AuthProfile], None]
+            Called with the profile of each request slower than the threshold.
+        threshold: float, default=1
+            Number of seconds above which a request is reported.
+        interval: float, default=0.01
+            Number of seconds between samples.
+        """
+        self.callback = callback
+        self.threshold = threshold
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._active: Dict[int, "collections.Counter[Stack]"] = {}
+        self._sampler: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        last_active = time.monotonic()
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    if time.monotonic() - last_active > self._idle_timeout:
+                        self._sampler = None
+                        return
+                    continue
+                last_active = time.monotonic()
+                frames = sys._current_frames()  # pylint: disable=protected-access
+                for thread_id, samples in self._active.items():
+                    if (frame := frames.get(thread_id)) is not None:
+                        samples[_get_stack(frame)] += 1
+
+    @contextlib.contextmanager
+    def profile(self) -> Iterator[Callable[[AuthTiming], None]]:
+        """
+        Sample the current thread while in the context.
+        The timing recorded with the returned function
+        is reported if it is above the threshold.
+        """
+        thread_id = threading.get_ident()
+        samples: "collections.Counter[Stack]" = collections.Counter()
+        with self._lock:
+            self._active[thread_id] = samples
+            if self._sampler is None:
+                self._sampler = threading.Thread(
+                    target=self._sample, name="msal-requests-auth-profiler", daemon=True
+                )
+                self._sampler.start()
+        timings: List[AuthTiming] = []
+        try:
+            yield timings.append
+        finally:
+            with self._lock:
+                del self._active[thread_id]
+        if timings and timings[-1].duration >= self.threshold:
+            try:
+                self.callback(
+                    AuthProfile(
+                        timing=timings[-1],
+                        samples=dict(samples),
+                        interval=self.interval,
+                    )
+                )
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                warnings.warn(f"Error in auth profiler callback ({error}).")
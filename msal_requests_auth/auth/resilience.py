@@ -0,0 +1,144 @@
+"""
+Throttling aware retry policy and circuit breaker for token requests.
+"""
+import random
+import threading
+import time
+from typing import NamedTuple, Optional
+
+
+class ResilienceState(NamedTuple):
+    """
+    State of the :class:`ResiliencePolicy` for monitoring.
+
+    .. versionadded:: 0.10.0
+    """
+
+    #: closed, open or half_open
+    state: str
+    consecutive_failures: int
+    total_failures: int
+    #: seconds until token requests are allowed again
+    retry_in: float
+    last_error: Optional[str]
+
+
+class ResiliencePolicy:
+    """
+    Controls when token requests are sent to Azure AD after failures.
+
+    After a transient failure, token requests are paused for the duration of
+    the Retry-After header or a jittered exponential backoff. After
+    ``failure_threshold`` consecutive failures the circuit opens and requests are
+    paused for at least ``reset_timeout`` seconds before a single probe request
+    is allowed. The state is shared by all threads using the policy.
+
+    .. versionadded:: 0.10.0
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        reset_timeout: float = 30.0,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        failure_threshold: int, default=5
+            Number of consecutive failures before the circuit opens.
+        base_delay: float, default=1
+            Number of seconds of the first backoff.
+        max_delay: float, default=60
+            Maximum number of seconds of a backoff.
+        reset_timeout: float, default=30
+            Minimum number of seconds the circuit stays open.
+        """
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._total_failures = 0
+        self._retry_at = 0.0
+        self._last_error: Optional[str] = None
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a token request can be sent now.
+        When the circuit is open, only one probe request is allowed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now < self._retry_at:
+                return False
+            # a probe without a recorded outcome is followed by another probe
+            if self._state in (self.OPEN, self.HALF_OPEN):
+                self._state = self.HALF_OPEN
+                # other threads wait on the probe request
+                self._retry_at = now + self.reset_timeout
+            return True
+
+    def record_success(self) -> None:
+        """
+        Record a successful token request and close the circuit.
+        """
+        with self._lock:
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._retry_at = 0.0
+            self._last_error = None
+
+    def record_failure(self, error: str, retry_after: Optional[float] = None) -> None:
+        """
+        Record a failed token request and pause token requests.
+
+        Parameters
+        ----------
+        error: str
+            Description of the error for monitoring.
+        retry_after: float, optional
+            Number of seconds from the Retry-After header.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._consecutive_failures += 1
+            self._total_failures += 1
+            self._last_error = error
+            if retry_after is None:
+                # exponential backoff with full jitter
+                retry_after = random.uniform(
+                    0,
+                    min(
+                        self.max_delay,
+                        self.base_delay * 2 ** (self._consecutive_failures - 1),
+                    ),
+                )
+            if (
+                self._state == self.HALF_OPEN
+                or self._consecutive_failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                retry_after = max(retry_after, self.reset_timeout)
+            self._retry_at = max(self._retry_at, now + retry_after)
+
+    @property
+    def state(self) -> ResilienceState:
+        """
+        Current state of the policy.
+        """
+        with self._lock:
+            return ResilienceState(
+                state=self._state,
+                consecutive_failures=self._consecutive_failures,
+                total_failures=self._total_failures,
+                retry_in=max(0.0, self._retry_at - time.monotonic()),
+                last_error=self._last_error,
+            )
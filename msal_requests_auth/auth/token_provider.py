@@ -0,0 +1,420 @@
+"""
+Transport agnostic engine for caching and refreshing tokens.
+"""
+import functools
+import json
+import threading
+import time
+import weakref
+from contextvars import ContextVar
+from typing import Callable, Dict, Hashable, NamedTuple, Optional, Tuple, Type
+
+import requests
+
+from msal_requests_auth.exceptions import AuthenticationError
+
+from .resilience import ResiliencePolicy
+
+# errors from Azure AD that are expected to resolve on retry
+_TRANSIENT_ERRORS = {"temporarily_unavailable", "server_error"}
+
+
+@functools.lru_cache(maxsize=None)
+def _get_request_errors() -> Tuple[Type[Exception], ...]:
+    """
+    Errors of token requests that are expected to resolve on retry.
+    MSAL is imported on first use to keep the package import fast.
+    """
+    import msal.exceptions  # pylint: disable=import-outside-toplevel
+
+    return (
+        requests.RequestException,
+        json.JSONDecodeError,
+        msal.exceptions.MsalServiceError,
+    )
+
+
+def _parse_retry_after(response: object) -> Optional[float]:
+    """
+    Retrieve the Retry-After header of the response in seconds.
+    """
+    retry_after = getattr(response, "headers", {}).get("Retry-After")
+    try:
+        return float(retry_after) if retry_after is not None else None
+    except ValueError:
+        return None
+
+
+def _get_retry_after(error: Exception) -> Optional[float]:
+    """
+    Retrieve the Retry-After header in seconds from the error response.
+    """
+    return _parse_retry_after(getattr(error, "response", None))
+
+
+def raise_authentication_error(token_payload: Dict[str, str]):
+    """
+    Raise an AuthenticationError with the details of the token payload.
+    """
+    error = token_payload.get("error")
+    description = token_payload.get("error_description")
+    raise AuthenticationError(
+        f"Unable to get token. Error: {error} (Details: {description})."
+    )
+
+
+class AuthTiming(NamedTuple):
+    """
+    Time spent adding the token to a request and where the token came from.
+
+    .. versionadded:: 0.10.0
+    """
+
+    #: TokenProvider.MEMORY, CACHE, NETWORK or INTERACTIVE
+    path: str
+    #: seconds spent getting the token
+    duration: float
+
+
+# where the token being requested in this context came from
+_AUTH_PATH: ContextVar[Optional[str]] = ContextVar("auth_path", default=None)
+
+
+def record_auth_path(path: str) -> None:
+    """
+    Record where the token being requested came from
+    when it cannot be determined from the MSAL result.
+    """
+    _AUTH_PATH.set(path)
+
+
+# Retry-After of the last throttled response while requesting a token in this context
+_RETRY_AFTER: ContextVar[Optional[float]] = ContextVar("retry_after", default=None)
+
+
+def record_retry_after(retry_after: float) -> None:
+    """
+    Record the Retry-After header of a throttled token request
+    when MSAL returns the error instead of raising it.
+    """
+    _RETRY_AFTER.set(retry_after)
+
+
+def _get_auth_path(token: Dict[str, str]) -> str:
+    if recorded_path := _AUTH_PATH.get():
+        return recorded_path
+    if token.get("token_source") == "cache":
+        return TokenProvider.CACHE
+    return TokenProvider.NETWORK
+
+
+class _TokenState(NamedTuple):
+    """
+    Immutable snapshot of the current token.
+    """
+
+    token: Dict[str, str]
+    header: str
+    #: time.time() when the token expires
+    expires_at: float
+    #: time.time() after which a new token is requested
+    refresh_at: float
+
+
+class _TokenStore:
+    """
+    Token state shared by the providers of auth instances with the same
+    MSAL client, scopes and settings.
+    """
+
+    def __init__(self) -> None:
+        self.state: Optional[_TokenState] = None
+        # token from the last forced refresh, which is not forced again
+        self.forced_state: Optional[_TokenState] = None
+        self.refresh_lock = threading.Lock()
+
+
+class TokenProvider:
+    """
+    Transport agnostic engine that caches and refreshes tokens.
+
+    The current token is kept in memory so that :meth:`get_header` only
+    calls MSAL when the token is close to expiry. Token requests go through
+    the :class:`ResiliencePolicy` and only one thread requests a token at a time.
+
+    The current token is an immutable snapshot that is replaced as a whole,
+    so reading it does not take a lock. This lets threads add tokens in
+    parallel on free-threaded Python builds.
+
+    The auth classes share the token state of their providers per MSAL client,
+    scopes and flow within a process. Each provider requests tokens with the
+    functions and resilience policy of its auth instance.
+
+    .. versionadded:: 0.10.0
+    """
+
+    # where the token came from
+    MEMORY = "memory"
+    CACHE = "cache"
+    NETWORK = "network"
+    INTERACTIVE = "interactive"
+
+    def __init__(
+        self,
+        acquire_token: Callable[[], Dict[str, str]],
+        resilience: Optional[ResiliencePolicy] = None,
+        refresh_margin: float = 300,
+        refresh_token: Optional[Callable[[], Dict[str, str]]] = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        acquire_token: Callable[[], Dict[str, str]]
+            Retrieves the token dictionary from MSAL.
+        resilience: ResiliencePolicy, optional
+            Controls retries of token requests after throttling or outages.
+            If not provided, a policy with the default settings is used.
+        refresh_margin: float, default=300
+            Number of seconds before the token expires that a new one is requested.
+        refresh_token: Callable[[], Dict[str, str]], optional
+            Requests a new token without using the MSAL cache. Used when the
+            current token does not last long enough for a request.
+            Defaults to acquire_token.
+        """
+        self._acquire_token = acquire_token
+        self._refresh_token = acquire_token if refresh_token is None else refresh_token
+        self.resilience = ResiliencePolicy() if resilience is None else resilience
+        self.refresh_margin = refresh_margin
+        self._store = _TokenStore()
+
+    def _get_valid_state(self) -> Optional[_TokenState]:
+        """
+        Retrieve the current token state if the token has not expired.
+        """
+        state = self._store.state
+        if state is not None and time.time() < state.expires_at:
+            return state
+        return None
+
+    def _set_state(self, token: Dict[str, str]) -> _TokenState:
+        now = time.time()
+        expires_at = now + float(token.get("expires_in", 0))
+        state = self._store.state = _TokenState(
+            token=token,
+            header=f"{token['token_type']} {token['access_token']}",
+            expires_at=expires_at,
+            refresh_at=expires_at - self.refresh_margin,
+        )
+        return state
+
+    def _handle_transient_failure(
+        self, error: str, retry_after: Optional[float] = None
+    ) -> Optional[_TokenState]:
+        """
+        Record the failure and retrieve the last valid token to use instead.
+        """
+        self.resilience.record_failure(error, retry_after=retry_after)
+        return self._get_valid_state()
+
+    def _refresh(self, force: bool = False) -> _TokenState:
+        """
+        Request a new token from MSAL following the resilience policy.
+        """
+        if not self.resilience.allow_request():
+            if state := self._get_valid_state():
+                return state
+            resilience_state = self.resilience.state
+            raise AuthenticationError(
+                "Unable to get token. Token requests are paused for "
+                f"{resilience_state.retry_in:.1f} seconds "
+                f"(Details: {resilience_state.last_error})."
+            )
+        try:
+            token = self._refresh_token() if force else self._acquire_token()
+        except _get_request_errors() as error:
+            if state := self._handle_transient_failure(
+                repr(error), retry_after=_get_retry_after(error)
+            ):
+                return state
+            raise AuthenticationError(f"Unable to get token. Error: {error}") from error
+        # every request records an outcome, so a probe does not stay open
+        except AuthenticationError:
+            # Azure AD responded, so it is not an outage
+            self.resilience.record_success()
+            raise
+        except Exception as error:
+            self.resilience.record_failure(repr(error))
+            raise
+        if "access_token" not in token:
+            retry_after = _RETRY_AFTER.get()
+            # Azure AD asks to retry later with the Retry-After header
+            if token.get("error") in _TRANSIENT_ERRORS or retry_after is not None:
+                if state := self._handle_transient_failure(
+                    str(token.get("error")), retry_after=retry_after
+                ):
+                    return state
+            else:
+                # Azure AD responded, so it is not an outage
+                self.resilience.record_success()
+            raise_authentication_error(token)
+        self.resilience.record_success()
+        state = self._set_state(token)
+        if force:
+            self._store.forced_state = state
+        return state
+
+    def _is_usable(self, state: _TokenState, min_lifetime: float) -> bool:
+        """
+        Check if the token does not need to be refreshed and lasts long enough.
+        A token from a forced refresh is the longest available,
+        so it is used even if it does not last long enough.
+        """
+        now = time.time()
+        return now < state.refresh_at and (
+            now + min_lifetime < state.expires_at or state is self._store.forced_state
+        )
+
+    def _get_state_and_path(self, min_lifetime: float = 0) -> Tuple[_TokenState, str]:
+        state = self._store.state
+        if state is not None and self._is_usable(state, min_lifetime):
+            return state, TokenProvider.MEMORY
+        with self._store.refresh_lock:
+            # another thread may have refreshed the token while waiting
+            state = self._store.state
+            if state is not None and self._is_usable(state, min_lifetime):
+                return state, TokenProvider.MEMORY
+            context_token = _AUTH_PATH.set(None)
+            retry_after_token = _RETRY_AFTER.set(None)
+            try:
+                new_state = self._refresh(
+                    force=state is not None and time.time() < state.refresh_at
+                )
+                if new_state is state:
+                    # token requests are paused, so the last token is used
+                    return new_state, TokenProvider.MEMORY
+                return new_state, _get_auth_path(new_state.token)
+            finally:
+                _AUTH_PATH.reset(context_token)
+                _RETRY_AFTER.reset(retry_after_token)
+
+    def _get_state(self, min_lifetime: float = 0) -> _TokenState:
+        return self._get_state_and_path(min_lifetime)[0]
+
+    @property
+    def remaining_lifetime(self) -> float:
+        """
+        Number of seconds until the current token expires.
+        0 if there is no token.
+
+        .. versionadded:: 0.10.0
+        """
+        state = self._store.state
+        if state is None:
+            return 0.0
+        return max(0.0, state.expires_at - time.time())
+
+    def get_token(self, min_lifetime: float = 0) -> Dict[str, str]:
+        """
+        Retrieve the token dictionary.
+
+        .. versionadded:: 0.10.0
+
+        Parameters
+        ----------
+        min_lifetime: float, default=0
+            Number of seconds the token needs to remain valid. If the current
+            token expires sooner, a new one is requested.
+
+        Returns
+        -------
+        dict
+        """
+        return self._get_state(min_lifetime).token
+
+    def get_header(self, min_lifetime: float = 0) -> str:
+        """
+        Retrieve the value of the Authorization header.
+
+        .. versionadded:: 0.10.0
+
+        Parameters
+        ----------
+        min_lifetime: float, default=0
+            Number of seconds the token needs to remain valid. If the current
+            token expires sooner, a new one is requested.
+
+        Returns
+        -------
+        str
+        """
+        return self._get_state(min_lifetime).header
+
+    def get_timed_header(self, min_lifetime: float = 0) -> Tuple[str, AuthTiming]:
+        """
+        Retrieve the value of the Authorization header with the time it took
+        and where the token came from.
+
+        .. versionadded:: 0.10.0
+
+        Parameters
+        ----------
+        min_lifetime: float, default=0
+            Number of seconds the token needs to remain valid. If the current
+            token expires sooner, a new one is requested.
+
+        Returns
+        -------
+        Tuple[str, AuthTiming]
+        """
+        start = time.perf_counter()
+        state, path = self._get_state_and_path(min_lifetime)
+        return state.header, AuthTiming(path=path, duration=time.perf_counter() - start)
+
+    def get_headers(self, min_lifetime: float = 0) -> Dict[str, str]:
+        """
+        Retrieve the headers to add to a request.
+
+        .. versionadded:: 0.10.0
+
+        Parameters
+        ----------
+        min_lifetime: float, default=0
+            Number of seconds the token needs to remain valid. If the current
+            token expires sooner, a new one is requested.
+
+        Returns
+        -------
+        dict
+        """
+        return {"Authorization": self._get_state(min_lifetime).header}
+
+    def invalidate(self) -> None:
+        """
+        Forget the current token so the next call requests a new one.
+        """
+        self._store.state = None
+
+
+# token state shared within the process
+_TOKEN_STORES: "weakref.WeakValueDictionary[Hashable, _TokenStore]" = (
+    weakref.WeakValueDictionary()
+)
+_TOKEN_STORES_LOCK = threading.Lock()
+
+
+def get_shared_token_provider(
+    key: Hashable, factory: Callable[[], TokenProvider]
+) -> TokenProvider:
+    """
+    Create the token provider with the factory and share its token state
+    with the other providers for the key while they are in use.
+    """
+    token_provider = factory()
+    # pylint: disable=protected-access
+    with _TOKEN_STORES_LOCK:
+        token_store = _TOKEN_STORES.get(key)
+        if token_store is None:
+            _TOKEN_STORES[key] = token_provider._store
+        else:
+            token_provider._store = token_store
+    return token_provider
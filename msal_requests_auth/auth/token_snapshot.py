@@ -0,0 +1,79 @@
+"""
+Module for reading tokens written by another process to a token snapshot.
+"""
+import functools
+from typing import Dict, List, Optional
+
+import requests
+
+from msal_requests_auth.snapshot import TokenSnapshot
+
+from .resilience import ResiliencePolicy
+from .token_provider import TokenProvider, get_shared_token_provider
+
+
+class TokenSnapshotAuth(requests.auth.AuthBase):
+    """
+    Auth class that reads tokens from a snapshot written by
+    :func:`~msal_requests_auth.snapshot.write_token_snapshot`
+    in a refresher process. MSAL is not used to get tokens.
+
+    .. versionadded:: 0.10.0
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        authority: str,
+        scopes: List[str],
+        snapshot: Optional[TokenSnapshot] = None,
+        resilience: Optional[ResiliencePolicy] = None,
+    ):
+        """
+        Parameters
+        ----------
+        client_id: str
+            The client ID of the MSAL client used by the refresher.
+        authority: str
+            The authority URL of the MSAL client used by the refresher
+            with the tenant ID, e.g. https://login.microsoftonline.com/<tenant_id>.
+        scopes: List[str]
+            List of scopes to get token for.
+        snapshot: TokenSnapshot, optional
+            The snapshot to read. Defaults to the one in the user cache directory.
+        resilience: ResiliencePolicy, optional
+            Controls how often the snapshot is read again when
+            it does not have a valid token.
+        """
+        self.client_id = client_id
+        self.authority = authority
+        self.scopes = scopes
+        self.snapshot = TokenSnapshot() if snapshot is None else snapshot
+        self.token_provider = get_shared_token_provider(
+            (id(self.snapshot), type(self), client_id, authority, tuple(scopes)),
+            lambda: TokenProvider(
+                functools.partial(
+                    self.snapshot.get_token, client_id, authority, scopes
+                ),
+                resilience=resilience,
+            ),
+        )
+
+    def __call__(
+        self, input_request: requests.PreparedRequest
+    ) -> requests.PreparedRequest:
+        """
+        Adds the token to the authorization header.
+        """
+        input_request.headers["Authorization"] = self.token_provider.get_header()
+        return input_request
+
+    def get_access_token(self) -> Dict[str, str]:
+        """
+        Retrieves the token dictionary from the snapshot.
+
+        Returns
+        -------
+        dict
+        """
+        return self.token_provider.get_token()
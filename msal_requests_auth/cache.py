@@ -2,14 +2,31 @@
 Based on:
 https://msal-python.readthedocs.io/en/latest/#msal.SerializableTokenCache
 """
+import atexit
+import contextlib
+import functools
+import json
 import os
+import pickle
+import secrets
+import sys
+import tempfile
+import threading
+import time
 import warnings
 from abc import ABC, abstractmethod
+from collections.abc import MutableMapping
+from multiprocessing import resource_tracker, shared_memory
 from pathlib import Path
-from typing import Union, overload
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union, overload
 
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
 from msal import SerializableTokenCache
-from platformdirs import user_cache_dir
+from platformdirs import user_cache_dir, user_config_dir
 
 
 class _BaseTokenCache(ABC, SerializableTokenCache):
@@ -17,10 +34,34 @@ class _BaseTokenCache(ABC, SerializableTokenCache):
     Base class for a token cache
     """
 
-    @abstractmethod
+    def __init__(self) -> None:
+        super().__init__()
+        self._write_lock = threading.Lock()
+
     def write_cache(self) -> None:
         """
         Write cache if needed.
+
+        .. versionchanged:: 0.10.0
+
+            Writes from several threads are serialized. Changes made
+            while writing are written by the next call.
+        """
+        with self._write_lock:
+            if not self.has_state_changed:  # type: ignore[has-type]
+                return
+            # cleared before serializing, so changes made meanwhile set it again
+            self.has_state_changed = False
+            try:
+                self._write_cache(self.serialize())
+            except BaseException:
+                self.has_state_changed = True
+                raise
+
+    @abstractmethod
+    def _write_cache(self, token_cache: str) -> None:
+        """
+        Write the serialized cache.
         """
         raise NotImplementedError
 
@@ -40,7 +81,7 @@ class NullCache(_BaseTokenCache):
 
     """
 
-    def write_cache(self) -> None:
+    def _write_cache(self, token_cache: str) -> None:
         pass
 
 
@@ -75,12 +116,181 @@ class SimpleTokenCache(_BaseTokenCache):
         if self.cache_file.exists():
             self.deserialize(self.cache_file.read_text())
 
-    def write_cache(self) -> None:
+    def _write_cache(self, token_cache: str) -> None:
         """
-        Write cache to disk if needed.
+        Write cache to disk.
+        """
+        self.cache_file.write_text(token_cache)
+
+
+_MACHINE_KEY_SIZE = 32
+
+
+@functools.lru_cache(maxsize=8)
+def _derive_key(secret: bytes, salt: bytes, stretch: bool) -> bytes:
+    """
+    Derive the encryption key from the secret.
+    Secrets provided by the user are stretched with scrypt. This is slow on
+    purpose, so it is only done once per secret and salt. The random machine
+    key does not need to be stretched, so HKDF is used instead.
+    """
+    if stretch:
+        return Scrypt(salt=salt, length=32, n=2**15, r=8, p=1).derive(secret)
+    return HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        info=b"msal-requests-auth token cache",
+    ).derive(secret)
+
+
+def _write_file_atomic(path: Path, data: bytes) -> None:
+    """
+    Write the file readable only by the user and replace the existing one.
+    """
+    file_descriptor, temp_file = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}."
+    )
+    try:
+        with os.fdopen(file_descriptor, "wb") as output_file:
+            output_file.write(data)
+        os.replace(temp_file, path)
+    except BaseException:
+        Path(temp_file).unlink(missing_ok=True)
+        raise
+
+
+def _get_machine_key(key_file: Path) -> bytes:
+    """
+    Retrieve the random key stored for the user. It is created if it does not exist.
+    """
+    try:
+        return key_file.read_bytes()
+    except FileNotFoundError:
+        pass
+    key_file.parent.mkdir(parents=True, exist_ok=True)
+    machine_key = secrets.token_bytes(_MACHINE_KEY_SIZE)
+    file_descriptor, temp_file = tempfile.mkstemp(
+        dir=key_file.parent, prefix=f".{key_file.name}."
+    )
+    try:
+        with os.fdopen(file_descriptor, "wb") as output_file:
+            output_file.write(machine_key)
+        # fails if another process created the key first
+        os.link(temp_file, key_file)
+    except FileExistsError:
+        pass
+    except OSError:
+        # the file system does not support hard links
+        try:
+            file_descriptor = os.open(
+                key_file,
+                os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0),
+                0o600,
+            )
+        except FileExistsError:
+            pass
+        else:
+            with os.fdopen(file_descriptor, "wb") as output_file:
+                output_file.write(machine_key)
+    finally:
+        Path(temp_file).unlink(missing_ok=True)
+    # without hard links, another process may still be writing the key
+    for _ in range(100):
+        stored_key = key_file.read_bytes()
+        if len(stored_key) >= _MACHINE_KEY_SIZE:
+            break
+        time.sleep(0.01)
+    return stored_key
+
+
+class EncryptedFileTokenCache(_BaseTokenCache):
+    """
+    Provides a token cache encrypted with AES-GCM
+    to persist the cache across sessions without keyring.
+
+    The key is derived with scrypt from the secret in the
+    MSAL_REQUESTS_AUTH_CACHE_SECRET environment variable if set. Otherwise,
+    it is derived with HKDF from a random key stored in the user config directory
+    that only the user can read. The key is derived once per process.
+
+    .. versionadded:: 0.10.0
+
+    """
+
+    _environment_variable = "MSAL_REQUESTS_AUTH_CACHE_SECRET"
+    _magic = b"MRAE\x01"
+    _salt_size = 16
+    _nonce_size = 12
+
+    def __init__(
+        self,
+        cache_file: Union[str, os.PathLike, None] = None,
+        secret: Union[str, bytes, None] = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        cache_file: Union[str, os.PathLike, None], optional
+            Path to the token cache file. If not provided,
+            it will store one for you in the user cache directory.
+        secret: Union[str, bytes, None], optional
+            The secret to derive the encryption key from. If not provided,
+            the environment variable or the stored random key is used.
         """
-        if self.has_state_changed:
-            self.cache_file.write_text(self.serialize())
+        super().__init__()
+        if cache_file is None:
+            self.cache_file = Path(
+                user_cache_dir("msal-requests-auth", appauthor=False),
+                "token-cache.enc",
+            )
+        else:
+            self.cache_file = Path(cache_file)
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        secret = secret or os.getenv(self._environment_variable)
+        self._stretch_secret = secret is not None
+        if secret is None:
+            secret = _get_machine_key(
+                Path(
+                    user_config_dir("msal-requests-auth", appauthor=False),
+                    "token-cache.key",
+                )
+            )
+        self._secret = secret.encode() if isinstance(secret, str) else secret
+        self._salt = secrets.token_bytes(self._salt_size)
+        if self.cache_file.exists():
+            self._read_cache()
+
+    def _read_cache(self) -> None:
+        data = self.cache_file.read_bytes()
+        header_size = len(self._magic) + self._salt_size + self._nonce_size
+        if not data.startswith(self._magic) or len(data) < header_size:
+            warnings.warn("Unable to decrypt token cache. Starting fresh.")
+            return
+        salt = data[len(self._magic) : len(self._magic) + self._salt_size]
+        nonce = data[header_size - self._nonce_size : header_size]
+        try:
+            token_cache = AESGCM(
+                _derive_key(self._secret, salt, self._stretch_secret)
+            ).decrypt(nonce, data[header_size:], self._magic)
+        except InvalidTag:
+            warnings.warn("Unable to decrypt token cache. Starting fresh.")
+            return
+        # keep the salt so the derived key is reused when writing
+        self._salt = salt
+        self.deserialize(token_cache.decode())
+
+    def _write_cache(self, token_cache: str) -> None:
+        """
+        Write encrypted cache to disk.
+        """
+        nonce = secrets.token_bytes(self._nonce_size)
+        encrypted_cache = AESGCM(
+            _derive_key(self._secret, self._salt, self._stretch_secret)
+        ).encrypt(nonce, token_cache.encode(), self._magic)
+        _write_file_atomic(
+            self.cache_file, self._magic + self._salt + nonce + encrypted_cache
+        )
 
 
 def _import_keyring():
@@ -114,16 +324,13 @@ class KeyringTokenCache(_BaseTokenCache):
         if token_cache is not None:
             self.deserialize(token_cache)
 
-    def write_cache(self) -> None:
+    def _write_cache(self, token_cache: str) -> None:
         """
-        Write cache to keyring if needed.
+        Write cache to keyring.
         """
-        if not self.has_state_changed:
-            return
-
         try:
             _import_keyring().set_password(
-                "__msal_requests_auth__", "token", self.serialize()
+                "__msal_requests_auth__", "token", token_cache
             )
         except Exception as error:  # pylint: disable=broad-exception-caught
             # some windows machines have issues writing to keyring
@@ -153,49 +360,507 @@ class EnvironmentTokenCache(_BaseTokenCache):
         if token_cache:
             self.deserialize(token_cache)
 
+    def _write_cache(self, token_cache: str) -> None:
+        """
+        Write cache to environment variable.
+        """
+        os.environ[self._environment_variable] = token_cache
+
+
+# shared memory segments created by this process, by environment variable
+_OWNED_SHARED_MEMORY: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def _release_shared_memory(environment_variable: str) -> None:
+    """
+    Release the shared memory segment created by this process.
+    """
+    segment = _OWNED_SHARED_MEMORY.pop(environment_variable, None)
+    if segment is None:
+        return
+    segment.close()
+    try:
+        segment.unlink()
+    except FileNotFoundError:
+        pass
+
+
+@atexit.register
+def _release_all_shared_memory() -> None:
+    """
+    Release all shared memory segments created by this process.
+    """
+    for environment_variable in list(_OWNED_SHARED_MEMORY):
+        _release_shared_memory(environment_variable)
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing shared memory segment without taking ownership of it.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(  # pylint: disable=unexpected-keyword-arg
+            name=name, track=False
+        )
+    segment = shared_memory.SharedMemory(name=name)
+    if os.name == "posix":
+        # prevent the resource tracker from removing the segment
+        # when this process exits as it is owned by the parent process
+        resource_tracker.unregister(
+            segment._name, "shared_memory"  # type: ignore[attr-defined]
+        )
+    return segment
+
+
+class SharedMemoryTokenCache(_BaseTokenCache):
+    """
+    Provides a token cache for child processes that passes the cache through
+    a shared memory segment. Only a small handle to the segment is stored
+    in the environment variable, so the environment of child processes
+    stays small.
+
+    The segment is owned by the process that wrote it and is released when that
+    process exits or writes a newer version of the cache.
+
+    .. note:: The previous segment is released as soon as a newer version
+              of the cache is written. A child process started before that
+              which has not read the cache yet starts with an empty cache.
+
+    .. warning:: Shared memory token cache is insecure. It is recommended to use KeyringTokenCache instead.
+
+    .. versionadded:: 0.10.0
+
+    """
+
+    _environment_variable = "__MSAL_REQUESTS_AUTH_CACHE_HANDLE__"
+
+    def __init__(self) -> None:
+        super().__init__()
+        token_cache = self._read_shared_memory()
+        if token_cache:
+            self.deserialize(token_cache)
+
+    def _read_shared_memory(self) -> Optional[str]:
+        """
+        Read the serialized cache from the segment in the environment variable.
+        """
+        handle = os.getenv(self._environment_variable)
+        if not handle:
+            return None
+        name, _, size = handle.rpartition(":")
+        if not name or not size.isdigit():
+            warnings.warn(f"Invalid token cache shared memory handle: {handle}")
+            return None
+        try:
+            segment = _attach_shared_memory(name)
+        except (FileNotFoundError, ValueError):
+            warnings.warn(f"Token cache shared memory segment not found: {name}")
+            return None
+        try:
+            return bytes(segment.buf[: int(size)]).decode(  # type: ignore[index]
+                "utf-8"
+            )
+        finally:
+            segment.close()
+
+    def _write_cache(self, token_cache: str) -> None:
+        """
+        Write cache to a new shared memory segment
+        and store the handle in the environment variable.
+        """
+        encoded_cache = token_cache.encode("utf-8")
+        segment = shared_memory.SharedMemory(
+            create=True, size=max(len(encoded_cache), 1)
+        )
+        segment.buf[: len(encoded_cache)] = encoded_cache  # type: ignore[index]
+        _release_shared_memory(self._environment_variable)
+        _OWNED_SHARED_MEMORY[self._environment_variable] = segment
+        os.environ[self._environment_variable] = f"{segment.name}:{len(encoded_cache)}"
+
+
+class HttpMetadataCache(MutableMapping):
+    """
+    Persists the MSAL http cache across sessions.
+
+    MSAL stores the responses of the authority (OpenID configuration)
+    and instance discovery requests in its http cache. Persisting it means
+    new clients can skip those requests on startup.
+
+    Entries older than ``max_age`` are dropped when the cache is loaded
+    so the metadata is requested and validated again.
+
+    .. note:: The http cache does not contain any tokens.
+
+    .. versionadded:: 0.10.0
+
+    """
+
+    def __init__(
+        self,
+        cache_file: Union[str, os.PathLike, None] = None,
+        max_age: float = 24 * 3600,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        cache_file: Union[str, os.PathLike, None], optional
+            Path to the http cache file. If not provided,
+            it will store one for you in the user cache directory.
+        max_age: float, default=86400
+            Number of seconds an entry is reused before it is requested again.
+        """
+        if cache_file is None:
+            self.cache_file = Path(
+                user_cache_dir("msal-requests-auth", appauthor=False), "http-cache.bin"
+            )
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        else:
+            self.cache_file = Path(cache_file)
+        self.max_age = max_age
+        self.has_state_changed = False
+        # key -> (time stored, value)
+        self._entries: Dict[Any, Tuple[float, Any]] = {}
+        # the cache is shared by MSAL clients in several threads
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        if self.cache_file.exists():
+            self._entries = self._read_cache_file()
+
+    def _read_cache_file(self) -> Dict[Any, Tuple[float, Any]]:
+        try:
+            with self.cache_file.open("rb") as cache_file:
+                entries = pickle.load(cache_file)
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            warnings.warn(f"Unable to read http cache. Starting fresh. Error: {error}")
+            return {}
+        now = time.time()
+        fresh_entries = {
+            key: (stored_at, value)
+            for key, (stored_at, value) in entries.items()
+            if 0 <= now - stored_at <= self.max_age
+        }
+        self.has_state_changed = len(fresh_entries) != len(entries)
+        return fresh_entries
+
+    def __getitem__(self, key: Any) -> Any:
+        with self._lock:
+            return self._entries[key][1]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self.has_state_changed = True
+
+    def __delitem__(self, key: Any) -> None:
+        with self._lock:
+            del self._entries[key]
+            self.has_state_changed = True
+
+    def __iter__(self) -> Iterator[Any]:
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
     def write_cache(self) -> None:
         """
-        Write cache to environment variable if needed.
+        Write cache to disk if needed.
         """
-        if self.has_state_changed:
-            os.environ[self._environment_variable] = self.serialize()
+        with self._write_lock:
+            with self._lock:
+                if not self.has_state_changed:
+                    return
+                self.has_state_changed = False
+                entries = dict(self._entries)
+            try:
+                _write_file_atomic(self.cache_file, pickle.dumps(entries))
+            except BaseException:
+                self.has_state_changed = True
+                raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.write_cache()
+
+
+@contextlib.contextmanager
+def _lock_file(cache_file: Path, timeout: float) -> Iterator[bool]:
+    """
+    Lock the cache file the same way as msal-extensions
+    using a '.lockfile' next to it.
+
+    Yields whether the lock was acquired. If not, a warning is issued.
+    """
+    lock_path = cache_file.with_name(f"{cache_file.name}.lockfile")
+    deadline = time.monotonic() + timeout
+    try:
+        lock_file = lock_path.open("a+")
+    except OSError as error:
+        warnings.warn(f"Unable to open token cache lock {lock_path}: {error}")
+        yield False
+        return
+    with lock_file:
+        # the same region is locked and unlocked on Windows
+        lock_file.seek(0)
+        while True:
+            try:
+                if os.name == "nt":
+                    import msvcrt  # pylint: disable=import-outside-toplevel
+
+                    msvcrt.locking(  # type: ignore[attr-defined]
+                        lock_file.fileno(), msvcrt.LK_NBLCK, 1  # type: ignore[attr-defined]
+                    )
+                else:
+                    import fcntl  # pylint: disable=import-outside-toplevel
+
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH | fcntl.LOCK_NB)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    warnings.warn(
+                        f"Timed out waiting for token cache lock: {cache_file}"
+                    )
+                    yield False
+                    return
+                time.sleep(0.05)
+        try:
+            yield True
+        finally:
+            if os.name == "nt":
+                import msvcrt  # pylint: disable=import-outside-toplevel
+
+                lock_file.seek(0)
+                msvcrt.locking(  # type: ignore[attr-defined]
+                    lock_file.fileno(), msvcrt.LK_UNLCK, 1  # type: ignore[attr-defined]
+                )
+            else:
+                import fcntl  # pylint: disable=import-outside-toplevel
+
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+class ExternalMSALTokenCache(_BaseTokenCache):
+    """
+    Read-through token cache that merges accounts and tokens from
+    external MSAL cache files into another token cache, so tokens from
+    other MSAL applications (e.g. msal-extensions persistence files)
+    can be used silently.
+
+    The external files are read with the msal-extensions lock and
+    reloaded when they are modified, replacing the entries read from them
+    before, unless this cache changed them. When the cache changes,
+    it is written to the wrapped token cache only, without the entries
+    from the external files that were not changed by this cache.
+
+    .. note:: Only unencrypted cache files are supported.
+
+    .. versionadded:: 0.10.0
+
+    """
+
+    def __init__(
+        self,
+        external_cache_files: Sequence[Union[str, os.PathLike]],
+        token_cache: Optional[_BaseTokenCache] = None,
+        lock_timeout: float = 5.0,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        external_cache_files: Sequence[Union[str, os.PathLike]]
+            Paths to the external MSAL cache files to read.
+        token_cache: _BaseTokenCache, optional
+            The token cache to read from and write to. Defaults to NullCache.
+        lock_timeout: float, default=5
+            Number of seconds to wait for the lock of an external cache file.
+        """
+        super().__init__()
+        self.token_cache = NullCache() if token_cache is None else token_cache
+        self.external_cache_files: List[Path] = [
+            Path(cache_file).expanduser() for cache_file in external_cache_files
+        ]
+        self.lock_timeout = lock_timeout
+        self._modified_times: Dict[Path, int] = {}
+        # external file -> (credential type, key) -> entry as read from the file
+        self._external_entries: Dict[Path, Dict[Tuple[str, str], Dict[str, Any]]] = {}
+        self.deserialize(self.token_cache.serialize())
+        self._reload_external_caches()
+
+    def _reload_external_caches(self) -> None:
+        """
+        Merge the external cache files modified since they were last read.
+        """
+        for cache_file in self.external_cache_files:
+            try:
+                modified_time = cache_file.stat().st_mtime_ns
+            except OSError:
+                continue
+            if self._modified_times.get(cache_file) == modified_time:
+                continue
+            with _lock_file(cache_file, self.lock_timeout) as locked:
+                if not locked:
+                    continue
+                self._modified_times[cache_file] = modified_time
+                try:
+                    state = json.loads(cache_file.read_text())
+                except (OSError, ValueError) as error:
+                    warnings.warn(f"Unable to read token cache {cache_file}: {error}")
+                    continue
+            self._merge(cache_file, state)
+
+    def _merge(self, cache_file: Path, state: Dict[str, Any]) -> None:
+        """
+        Replace the entries read from the external file before with its current
+        contents, unless they were changed by this cache. Other entries are added
+        if they are missing from this cache. For access tokens,
+        the one that expires last is kept.
+        """
+        file_entries = {
+            (credential_type, key): entry
+            for credential_type, entries in state.items()
+            if isinstance(entries, dict)
+            for key, entry in entries.items()
+        }
+        with self._lock:
+            previous_entries = self._external_entries.pop(cache_file, {})
+            # entries removed from the external file, e.g. after signing out
+            for (credential_type, key), previous_entry in previous_entries.items():
+                cache_entries = self._cache.get(credential_type, {})
+                if (credential_type, key) not in file_entries and (
+                    cache_entries.get(key) == previous_entry
+                ):
+                    del cache_entries[key]
+            external_entries = {}
+            for (credential_type, key), entry in file_entries.items():
+                cache_entries = self._cache.setdefault(credential_type, {})
+                existing_entry = cache_entries.get(key)
+                if (
+                    existing_entry is None
+                    or existing_entry == previous_entries.get((credential_type, key))
+                    or (
+                        credential_type == self.CredentialType.ACCESS_TOKEN
+                        and int(entry.get("expires_on", 0))
+                        > int(existing_entry.get("expires_on", 0))
+                    )
+                ):
+                    cache_entries[key] = entry
+                    external_entries[(credential_type, key)] = dict(entry)
+            self._external_entries[cache_file] = external_entries
+
+    def search(self, credential_type, target=None, query=None, **kwargs):
+        """
+        Search the cache after merging modified external cache files.
+        """
+        self._reload_external_caches()
+        return super().search(credential_type, target=target, query=query, **kwargs)
+
+    def _write_cache(self, token_cache: str) -> None:
+        """
+        Write the entries of this cache to the wrapped token cache.
+        """
+        state = json.loads(token_cache)
+        with self._lock:
+            external_entries = [
+                item
+                for file_entries in self._external_entries.values()
+                for item in file_entries.items()
+            ]
+        for (credential_type, key), external_entry in external_entries:
+            entries = state.get(credential_type, {})
+            if entries.get(key) == external_entry:
+                del entries[key]
+        self.token_cache.deserialize(json.dumps(state))
+        self.token_cache.has_state_changed = True
+        self.token_cache.write_cache()
 
 
 @overload
-def get_token_cache() -> Union[KeyringTokenCache, NullCache]:
+def get_token_cache() -> Union[KeyringTokenCache, EncryptedFileTokenCache]:
     ...
 
 
 @overload
 def get_token_cache(
     allow_environment_token_cache: bool = True,
-) -> Union[KeyringTokenCache, NullCache, EnvironmentTokenCache]:
+    allow_shared_memory_token_cache: bool = True,
+    external_cache_files: Optional[Sequence[Union[str, os.PathLike]]] = None,
+) -> Union[
+    KeyringTokenCache,
+    EncryptedFileTokenCache,
+    EnvironmentTokenCache,
+    SharedMemoryTokenCache,
+    ExternalMSALTokenCache,
+]:
     ...
 
 
 def get_token_cache(
     allow_environment_token_cache: bool = False,
-) -> Union[KeyringTokenCache, NullCache, EnvironmentTokenCache]:
+    allow_shared_memory_token_cache: bool = False,
+    external_cache_files: Optional[Sequence[Union[str, os.PathLike]]] = None,
+) -> Union[
+    KeyringTokenCache,
+    EncryptedFileTokenCache,
+    EnvironmentTokenCache,
+    SharedMemoryTokenCache,
+    ExternalMSALTokenCache,
+]:
     """
     Retrieve the token cache based on user set up.
 
     Order of choosing cache:
 
+    - Use SharedMemoryTokenCache if allowed and the environment variable exists.
     - Use EnvironmentTokenCache if allowed and the environment variable exists.
-    - Use KeyringTokenCache if enabled.
-    - Use NullCache.
+    - Use KeyringTokenCache if keyring is installed and has a backend.
+    - Use EncryptedFileTokenCache.
+
+    If external cache files are provided, the chosen cache is wrapped
+    in an ExternalMSALTokenCache that reads from them.
 
     .. versionadded:: 0.9.0
+    .. versionadded:: 0.10.0 allow_shared_memory_token_cache, external_cache_files
+    .. versionchanged:: 0.10.0 Use EncryptedFileTokenCache instead of NullCache
     """
+    token_cache = _select_token_cache(
+        allow_environment_token_cache=allow_environment_token_cache,
+        allow_shared_memory_token_cache=allow_shared_memory_token_cache,
+    )
+    if external_cache_files:
+        return ExternalMSALTokenCache(external_cache_files, token_cache=token_cache)
+    return token_cache
+
+
+def _select_token_cache(
+    allow_environment_token_cache: bool,
+    allow_shared_memory_token_cache: bool,
+) -> Union[
+    KeyringTokenCache,
+    EncryptedFileTokenCache,
+    EnvironmentTokenCache,
+    SharedMemoryTokenCache,
+]:
+    if allow_shared_memory_token_cache and os.getenv(
+        SharedMemoryTokenCache._environment_variable
+    ):
+        return SharedMemoryTokenCache()
     if allow_environment_token_cache and os.getenv(
         EnvironmentTokenCache._environment_variable
     ):
         return EnvironmentTokenCache()
+    try:
+        keyring = _import_keyring()
+    except ModuleNotFoundError:
+        # the keyring extra is not installed
+        return EncryptedFileTokenCache()
     try:
         return KeyringTokenCache()
-    except _import_keyring().errors.NoKeyringError:
+    except keyring.errors.NoKeyringError:
         warnings.warn(
-            "Keyring backend not detected. Not caching tokens. "
+            "Keyring backend not detected. Using encrypted file token cache. "
             "For more details: https://pypi.org/project/keyring/"
         )
-    return NullCache()
+    return EncryptedFileTokenCache()
@@ -0,0 +1,126 @@
+"""
+Factories for MSAL clients that reuse authority metadata across sessions.
+"""
+import atexit
+import threading
+from typing import Any, Optional
+
+from msal import (
+    ConfidentialClientApplication,
+    PublicClientApplication,
+    SerializableTokenCache,
+)
+
+from msal_requests_auth.cache import HttpMetadataCache
+
+_HTTP_METADATA_CACHE: Optional[HttpMetadataCache] = None
+_HTTP_METADATA_CACHE_LOCK = threading.Lock()
+
+
+def get_http_metadata_cache() -> HttpMetadataCache:
+    """
+    Retrieve the http metadata cache shared by clients created in this process.
+    It is stored in the user cache directory and written when the process exits.
+
+    .. versionadded:: 0.10.0
+
+    Returns
+    -------
+    HttpMetadataCache
+    """
+    global _HTTP_METADATA_CACHE  # pylint: disable=global-statement
+    with _HTTP_METADATA_CACHE_LOCK:
+        if _HTTP_METADATA_CACHE is None:
+            _HTTP_METADATA_CACHE = HttpMetadataCache()
+            atexit.register(_HTTP_METADATA_CACHE.write_cache)
+        return _HTTP_METADATA_CACHE
+
+
+def create_public_client(
+    client_id: str,
+    authority: str,
+    token_cache: Optional[SerializableTokenCache] = None,
+    http_cache: Optional[HttpMetadataCache] = None,
+    **kwargs: Any,
+) -> PublicClientApplication:
+    """
+    Create a :class:`msal.PublicClientApplication` that
+    reuses persisted authority and instance discovery metadata.
+
+    .. versionadded:: 0.10.0
+
+    Parameters
+    ----------
+    client_id: str
+        The client ID of the application in Azure AD.
+    authority: str
+        The authority URL (e.g. https://login.microsoftonline.com/<tenant ID>).
+    token_cache: msal.SerializableTokenCache, optional
+        The token cache for the client.
+    http_cache: HttpMetadataCache, optional
+        The http metadata cache. Defaults to :func:`get_http_metadata_cache`.
+    **kwargs:
+        Passed into :class:`msal.PublicClientApplication`.
+
+    Returns
+    -------
+    msal.PublicClientApplication
+    """
+    http_cache = get_http_metadata_cache() if http_cache is None else http_cache
+    client = PublicClientApplication(
+        client_id,
+        authority=authority,
+        token_cache=token_cache,
+        http_cache=http_cache,
+        **kwargs,
+    )
+    # persist the metadata requested while creating the client
+    http_cache.write_cache()
+    return client
+
+
+def create_confidential_client(
+    client_id: str,
+    authority: str,
+    client_credential: Any,
+    token_cache: Optional[SerializableTokenCache] = None,
+    http_cache: Optional[HttpMetadataCache] = None,
+    **kwargs: Any,
+) -> ConfidentialClientApplication:
+    """
+    Create a :class:`msal.ConfidentialClientApplication` that
+    reuses persisted authority and instance discovery metadata.
+
+    .. versionadded:: 0.10.0
+
+    Parameters
+    ----------
+    client_id: str
+        The client ID of the application in Azure AD.
+    authority: str
+        The authority URL (e.g. https://login.microsoftonline.com/<tenant ID>).
+    client_credential: Any
+        The client secret or certificate credential.
+    token_cache: msal.SerializableTokenCache, optional
+        The token cache for the client.
+    http_cache: HttpMetadataCache, optional
+        The http metadata cache. Defaults to :func:`get_http_metadata_cache`.
+    **kwargs:
+        Passed into :class:`msal.ConfidentialClientApplication`.
+
+    Returns
+    -------
+    msal.ConfidentialClientApplication
+    """
+    http_cache = get_http_metadata_cache() if http_cache is None else http_cache
+    client = ConfidentialClientApplication(
+        client_id,
+        authority=authority,
+        client_credential=client_credential,
+        token_cache=token_cache,
+        http_cache=http_cache,
+        **kwargs,
+    )
+    # persist the metadata requested while creating the client
+    http_cache.write_cache()
+    return client
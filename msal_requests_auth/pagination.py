@@ -0,0 +1,86 @@
+"""
+Helpers for paginated APIs.
+
+.. versionadded:: 0.10.0
+"""
+from typing import Any, Callable, Iterator, Optional
+
+import requests
+
+
+def get_next_url(response: requests.Response) -> Optional[str]:
+    """
+    Retrieve the URL of the next page from the Link header
+    or the OData next link in the JSON body (e.g. Microsoft Graph).
+
+    .. versionadded:: 0.10.0
+
+    Returns
+    -------
+    str, optional:
+        None if this is the last page.
+    """
+    if next_link := response.links.get("next"):
+        return next_link["url"]
+    try:
+        body = response.json()
+    except ValueError:
+        return None
+    if isinstance(body, dict):
+        return body.get("@odata.nextLink") or body.get("nextLink")
+    return None
+
+
+def iter_pages(
+    url: str,
+    auth: requests.auth.AuthBase,
+    session: Optional[requests.Session] = None,
+    next_url: Callable[[requests.Response], Optional[str]] = get_next_url,
+    **kwargs: Any,
+) -> Iterator[requests.Response]:
+    """
+    Retrieve all the pages of a paginated API.
+
+    Each page is a new request, so the authorization header is added
+    again for every page and a new token is used once the current one
+    is close to expiry.
+
+    .. versionadded:: 0.10.0
+
+    .. code-block:: python
+
+        for page in iter_pages(f"{graph_url}/users", auth=auth):
+            users.extend(page.json()["value"])
+
+    Parameters
+    ----------
+    url: str
+        The URL of the first page.
+    auth: requests.auth.AuthBase
+        The auth to add the token to each request.
+    session: requests.Session, optional
+        The session to send the requests with.
+    next_url: Callable[[requests.Response], Optional[str]], optional
+        Retrieves the URL of the next page from the response. Defaults to
+        :func:`get_next_url`.
+    **kwargs:
+        Passed to :meth:`requests.Session.get` for each page.
+        The params are only used for the first page.
+
+    Returns
+    -------
+    Iterator[requests.Response]
+    """
+    page_session = requests.Session() if session is None else session
+    page_url: Optional[str] = url
+    try:
+        while page_url is not None:
+            response = page_session.get(page_url, auth=auth, **kwargs)
+            response.raise_for_status()
+            yield response
+            # the next page URL has the query parameters
+            kwargs.pop("params", None)
+            page_url = next_url(response)
+    finally:
+        if session is None:
+            page_session.close()
@@ -0,0 +1,271 @@
+"""
+Read optimized token snapshot shared by processes on the same machine.
+
+A refresher process writes the tokens of its auth instances to an indexed
+snapshot file. Reader processes memory map the file and look up tokens by
+client ID, authority and scopes without loading the rest of the snapshot.
+
+File layout (little endian):
+
+- header: magic, version, number of entries
+- index: (key digest, offset, length) sorted by key digest
+- data: JSON token per entry
+
+.. versionadded:: 0.10.0
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlparse
+
+from platformdirs import user_cache_dir
+
+if TYPE_CHECKING:
+    from msal_requests_auth.auth.base_auth_client import BaseMSALRefreshAuth
+
+_MAGIC = b"MRAS"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBxxxI")
+_INDEX_ENTRY = struct.Struct("<16sQI")
+
+
+def _default_snapshot_file() -> Path:
+    return Path(
+        user_cache_dir("msal-requests-auth", appauthor=False), "token-snapshot.bin"
+    )
+
+
+def _normalize_authority(authority: str) -> str:
+    """
+    Host and tenant of the authority or token endpoint URL.
+    """
+    url = urlparse(authority)
+    tenant = url.path.strip("/").split("/", 1)[0]
+    return f"{url.netloc}/{tenant}".lower()
+
+
+def _snapshot_key(client_id: str, authority: str, scopes: Sequence[str]) -> bytes:
+    """
+    Digest of the client ID, authority and scopes, ignoring scope order and case.
+    """
+    normalized_scopes = " ".join(sorted(scope.lower() for scope in scopes))
+    return hashlib.blake2b(
+        f"{client_id}\n{_normalize_authority(authority)}\n{normalized_scopes}".encode(),
+        digest_size=16,
+    ).digest()
+
+
+def write_token_snapshot(
+    auths: Iterable["BaseMSALRefreshAuth"],
+    snapshot_file: Union[str, os.PathLike, None] = None,
+) -> Path:
+    """
+    Write the tokens of the auth instances to the snapshot file.
+    A token is requested if the auth does not have a valid one.
+
+    The file is replaced atomically, so readers always see a complete snapshot.
+
+    .. note:: On Windows, a file cannot be replaced while reader processes
+              have it memory mapped, and a PermissionError is raised.
+              The snapshot can only be written before the readers start.
+
+    .. versionadded:: 0.10.0
+
+    Parameters
+    ----------
+    auths: Iterable[BaseMSALRefreshAuth]
+        The auth instances to write tokens for. :class:`OnBehalfOfAuth`
+        is not supported as its tokens are for a user.
+    snapshot_file: Union[str, os.PathLike, None], optional
+        Path to the snapshot file. If not provided,
+        it will store one for you in the user cache directory.
+
+    Returns
+    -------
+    Path:
+        The path to the snapshot file.
+    """
+    # pylint: disable=import-outside-toplevel
+    from msal_requests_auth.auth.on_behalf_of import OnBehalfOfAuth
+
+    auths = list(auths)
+    if any(isinstance(auth, OnBehalfOfAuth) for auth in auths):
+        raise ValueError("OnBehalfOfAuth tokens cannot be written to a snapshot.")
+    snapshot_path = (
+        _default_snapshot_file() if snapshot_file is None else Path(snapshot_file)
+    )
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    entries: Dict[bytes, bytes] = {}
+    for auth in auths:
+        # pylint: disable=protected-access
+        state = auth.token_provider._get_state()
+        key = _snapshot_key(
+            auth.client.client_id, auth.client.authority.token_endpoint, auth.scopes
+        )
+        entries[key] = json.dumps(
+            {
+                "token_type": state.token["token_type"],
+                "access_token": state.token["access_token"],
+                "expires_on": state.expires_at,
+            },
+            separators=(",", ":"),
+        ).encode()
+
+    offset = _HEADER.size + _INDEX_ENTRY.size * len(entries)
+    index: List[bytes] = []
+    data: List[bytes] = []
+    for key in sorted(entries):
+        index.append(_INDEX_ENTRY.pack(key, offset, len(entries[key])))
+        data.append(entries[key])
+        offset += len(entries[key])
+
+    file_descriptor, temp_file = tempfile.mkstemp(
+        dir=snapshot_path.parent, prefix=f".{snapshot_path.name}."
+    )
+    try:
+        with os.fdopen(file_descriptor, "wb") as snapshot:
+            snapshot.write(_HEADER.pack(_MAGIC, _VERSION, len(entries)))
+            snapshot.writelines(index)
+            snapshot.writelines(data)
+        os.replace(temp_file, snapshot_path)
+    except BaseException:
+        Path(temp_file).unlink(missing_ok=True)
+        raise
+    return snapshot_path
+
+
+class TokenSnapshot:
+    """
+    Reader for the snapshot file written by :func:`write_token_snapshot`.
+
+    The file is memory mapped, so the pages are shared by all the reader
+    processes. It is reopened when the writer replaces it.
+
+    .. note:: On Windows, the writer cannot replace the file
+              while it is mapped by a reader.
+
+    .. versionadded:: 0.10.0
+    """
+
+    def __init__(
+        self,
+        snapshot_file: Union[str, os.PathLike, None] = None,
+        check_interval: float = 1.0,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        snapshot_file: Union[str, os.PathLike, None], optional
+            Path to the snapshot file. If not provided,
+            the one in the user cache directory is used.
+        check_interval: float, default=1
+            Minimum number of seconds between checks for a new snapshot file.
+        """
+        self.snapshot_file = (
+            _default_snapshot_file() if snapshot_file is None else Path(snapshot_file)
+        )
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mapping: Optional[mmap.mmap] = None
+        self._file_id: Optional[Tuple[int, int, int]] = None
+        self._next_check = 0.0
+
+    def _open(self) -> Optional[mmap.mmap]:
+        """
+        Memory map the snapshot file if it was replaced since it was last opened.
+        """
+        with self._lock:
+            if time.monotonic() < self._next_check:
+                return self._mapping
+            self._next_check = time.monotonic() + self.check_interval
+            try:
+                with self.snapshot_file.open("rb") as snapshot:
+                    stat = os.fstat(snapshot.fileno())
+                    file_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+                    if file_id == self._file_id:
+                        return self._mapping
+                    mapping = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                return self._mapping
+            try:
+                magic, version, count = _HEADER.unpack_from(mapping)
+            except struct.error:
+                magic, version, count = None, None, 0
+            if (
+                magic != _MAGIC
+                or version != _VERSION
+                or len(mapping) < _HEADER.size + count * _INDEX_ENTRY.size
+            ):
+                mapping.close()
+                return self._mapping
+            # the previous mapping is left to the garbage collector
+            # as other threads may still be reading from it
+            self._mapping = mapping
+            self._file_id = file_id
+            return mapping
+
+    def _find(self, mapping: mmap.mmap, key: bytes) -> Optional[bytes]:
+        """
+        Binary search of the index for the key.
+        """
+        _, _, count = _HEADER.unpack_from(mapping)
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            entry_key, offset, length = _INDEX_ENTRY.unpack_from(
+                mapping, _HEADER.size + middle * _INDEX_ENTRY.size
+            )
+            if entry_key == key:
+                return mapping[offset : offset + length]
+            if entry_key < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def get_token(
+        self, client_id: str, authority: str, scopes: Sequence[str]
+    ) -> Dict[str, str]:
+        """
+        Retrieve the token for the client ID, authority and scopes.
+
+        Parameters
+        ----------
+        client_id: str
+            The client ID of the MSAL client used by the writer.
+        authority: str
+            The authority URL of the MSAL client used by the writer
+            with the tenant ID, e.g. https://login.microsoftonline.com/<tenant_id>.
+        scopes: Sequence[str]
+            The scopes of the token.
+
+        Returns
+        -------
+        dict:
+            The token in the format returned by MSAL or the error
+            if there is no valid token in the snapshot.
+        """
+        mapping = self._open()
+        entry = None
+        if mapping is not None:
+            entry = self._find(mapping, _snapshot_key(client_id, authority, scopes))
+        if entry is not None:
+            token = json.loads(entry)
+            expires_in = int(token.pop("expires_on") - time.time())
+            if expires_in > 0:
+                return {**token, "expires_in": expires_in}
+        # the writer may not have written the token yet
+        return {
+            "error": "temporarily_unavailable",
+            "error_description": (
+                f"No valid token for {client_id} of {authority} "
+                f"with scopes {list(scopes)} in {self.snapshot_file}"
+            ),
+        }
@@ -0,0 +1,9 @@
+"""
+Fake Azure AD server and load test harness for testing and benchmarking.
+
+.. versionadded:: 0.10.0
+"""
+from .fake_aad import AUTHORITY_HOST, FakeAAD
+from .load import LoadTestResult, run_load_test
+
+__all__ = ["AUTHORITY_HOST", "FakeAAD", "LoadTestResult", "run_load_test"]
@@ -0,0 +1,434 @@
+"""
+In-process fake of the Azure AD endpoints used by MSAL.
+"""
+import base64
+import itertools
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+if TYPE_CHECKING:
+    from msal import ConfidentialClientApplication, PublicClientApplication
+
+AUTHORITY_HOST = "https://login.microsoftonline.com"
+
+_DEVICE_CODE_GRANT = "urn:ietf:params:oauth:grant-type:device_code"
+_ON_BEHALF_OF_GRANT = "urn:ietf:params:oauth:grant-type:jwt-bearer"
+
+
+def _encode(payload: Dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+class _FakeAADHandler(BaseHTTPRequestHandler):
+    server: "_FakeAADServer"
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def _send_json(
+        self,
+        status: int,
+        body: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _handle(self, method: str) -> None:
+        path = urlparse(self.path).path
+        fake_aad = self.server.fake_aad
+        if fake_aad.latency:
+            time.sleep(fake_aad.latency)
+        form: Dict[str, str] = {}
+        if method == "POST":
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            form = {name: values[0] for name, values in parse_qs(body.decode()).items()}
+        tenant = path.strip("/").split("/")[0]
+        status, body, headers = fake_aad.handle(method, path, tenant, form)
+        self._send_json(status, body, headers)
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        self._handle("GET")
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        self._handle("POST")
+
+
+class _FakeAADServer(ThreadingHTTPServer):
+    daemon_threads = True
+    fake_aad: "FakeAAD"
+
+
+class _FakeAADSession(requests.Session):
+    """
+    Sends requests for the Azure AD authority host to the fake server.
+    """
+
+    def __init__(self, base_url: str) -> None:
+        super().__init__()
+        self.base_url = base_url
+
+    def request(  # type: ignore[override]
+        self, method: str, url: str, *args: Any, **kwargs: Any
+    ) -> requests.Response:
+        return super().request(
+            method, url.replace(AUTHORITY_HOST, self.base_url), *args, **kwargs
+        )
+
+
+class FakeAAD:  # pylint: disable=too-many-instance-attributes
+    """
+    Fake Azure AD server running in a background thread.
+
+    It serves instance discovery, OpenID configuration, device code and token
+    requests for the client credential, device code, refresh token and
+    On-Behalf-Of grants. On-Behalf-Of tokens are issued for a user
+    identified by the user assertion.
+    Pass :attr:`session` as the MSAL `http_client` to use it, or create the
+    clients with :meth:`create_confidential_client` and
+    :meth:`create_public_client`.
+
+    .. versionadded:: 0.10.0
+
+    .. code-block:: python
+
+        with FakeAAD(latency=0.05, token_lifetime=600) as fake_aad:
+            auth = ClientCredentialAuth(fake_aad.create_confidential_client(), scopes)
+            fake_aad.throttle(3, retry_after=1)
+            result = run_load_test(auth, fake_aad=fake_aad)
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        token_lifetime: int = 3600,
+        throttle_rate: float = 0.0,
+        failure_rate: float = 0.0,
+        retry_after: int = 1,
+        pending_polls: int = 0,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        latency: float, default=0
+            Number of seconds to wait before each response.
+        token_lifetime: int, default=3600
+            Number of seconds the access tokens are valid for.
+        throttle_rate: float, default=0
+            Probability that a token request is throttled (429).
+        failure_rate: float, default=0
+            Probability that a token request fails (500).
+        retry_after: int, default=1
+            The Retry-After header of throttled responses in seconds.
+        pending_polls: int, default=0
+            Number of device code polls answered with authorization_pending.
+        seed: int, optional
+            Seed for the random throttling and failures.
+        """
+        self.latency = latency
+        self.token_lifetime = token_lifetime
+        self.throttle_rate = throttle_rate
+        self.failure_rate = failure_rate
+        self.retry_after = retry_after
+        self.pending_polls = pending_polls
+        #: number of requests by URL path
+        self.requests: "Counter[str]" = Counter()
+        #: number of requests by endpoint
+        self.calls: "Counter[str]" = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._token_ids = itertools.count(1)
+        self._throttled = 0
+        self._failures = 0
+        self._polls: "Counter[str]" = Counter()
+        self._server: Optional[_FakeAADServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.session: Optional[_FakeAADSession] = None
+
+    def start(self) -> "FakeAAD":
+        """
+        Start the server.
+        """
+        self._server = _FakeAADServer(("127.0.0.1", 0), _FakeAADHandler)
+        self._server.fake_aad = self
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fake-aad", daemon=True
+        )
+        self._thread.start()
+        self.session = _FakeAADSession(self.base_url)
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop the server.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self.session is not None:
+            self.session.close()
+
+    def __enter__(self) -> "FakeAAD":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        """
+        The URL of the server.
+        """
+        if self._server is None:
+            raise RuntimeError("The fake Azure AD server is not running.")
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def throttle(self, count: int, retry_after: Optional[int] = None) -> None:
+        """
+        Throttle the next token requests.
+
+        Parameters
+        ----------
+        count: int
+            Number of token requests to throttle.
+        retry_after: int, optional
+            The Retry-After header in seconds.
+        """
+        with self._lock:
+            self._throttled += count
+            if retry_after is not None:
+                self.retry_after = retry_after
+
+    def fail(self, count: int) -> None:
+        """
+        Fail the next token requests with a server error.
+
+        Parameters
+        ----------
+        count: int
+            Number of token requests to fail.
+        """
+        with self._lock:
+            self._failures += count
+
+    def _count(self, endpoint: str) -> None:
+        with self._lock:
+            self.calls[endpoint] += 1
+
+    def _injected_error(self) -> Optional[Tuple[int, Dict[str, Any], Dict[str, str]]]:
+        with self._lock:
+            if self._throttled or self._random.random() < self.throttle_rate:
+                self._throttled = max(0, self._throttled - 1)
+                self.calls["throttled"] += 1
+                return (
+                    429,
+                    {
+                        "error": "temporarily_unavailable",
+                        "error_description": "Too many requests.",
+                    },
+                    {"Retry-After": str(self.retry_after)},
+                )
+            if self._failures or self._random.random() < self.failure_rate:
+                self._failures = max(0, self._failures - 1)
+                self.calls["failed"] += 1
+                return (
+                    500,
+                    {"error": "server_error", "error_description": "Injected failure."},
+                    {},
+                )
+        return None
+
+    def _token(
+        self, tenant: str, client_id: str, user: bool, user_id: str = "fake-user"
+    ) -> Dict[str, Any]:
+        token_id = next(self._token_ids)
+        token: Dict[str, Any] = {
+            "token_type": "Bearer",
+            "access_token": f"fake-access-token-{token_id}",
+            "expires_in": self.token_lifetime,
+            "ext_expires_in": self.token_lifetime,
+        }
+        if user:
+            now = int(time.time())
+            token.update(
+                {
+                    "refresh_token": f"fake-refresh-token-{token_id}",
+                    "client_info": _encode({"uid": user_id, "utid": tenant}),
+                    "id_token": ".".join(
+                        [
+                            _encode({"alg": "none", "typ": "JWT"}),
+                            _encode(
+                                {
+                                    "iss": f"{AUTHORITY_HOST}/{tenant}/v2.0",
+                                    "sub": user_id,
+                                    "oid": user_id,
+                                    "tid": tenant,
+                                    "aud": client_id,
+                                    "iat": now,
+                                    "exp": now + self.token_lifetime,
+                                    "preferred_username": f"{user_id}@example.com",
+                                }
+                            ),
+                            "",
+                        ]
+                    ),
+                }
+            )
+        return token
+
+    def handle(
+        self, method: str, path: str, tenant: str, form: Dict[str, str]
+    ) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        """
+        Create the response to a request.
+
+        Returns
+        -------
+        Tuple[int, dict, dict]:
+            The status code, the JSON body and the headers.
+        """
+        tenant_url = f"{AUTHORITY_HOST}/{tenant}"
+        with self._lock:
+            self.requests[path] += 1
+        if method == "GET" and path.endswith("/discovery/instance"):
+            self._count("instance_discovery")
+            return (
+                200,
+                {
+                    "tenant_discovery_endpoint": (
+                        f"{tenant_url}/v2.0/.well-known/openid-configuration"
+                    ),
+                    "metadata": [
+                        {
+                            "preferred_network": "login.microsoftonline.com",
+                            "preferred_cache": "login.windows.net",
+                            "aliases": [
+                                "login.microsoftonline.com",
+                                "login.windows.net",
+                            ],
+                        }
+                    ],
+                },
+                {},
+            )
+        if method == "GET" and path.endswith("/.well-known/openid-configuration"):
+            self._count("openid_configuration")
+            return (
+                200,
+                {
+                    "authorization_endpoint": f"{tenant_url}/oauth2/v2.0/authorize",
+                    "token_endpoint": f"{tenant_url}/oauth2/v2.0/token",
+                    "device_authorization_endpoint": (
+                        f"{tenant_url}/oauth2/v2.0/devicecode"
+                    ),
+                    "issuer": f"{tenant_url}/v2.0",
+                },
+                {},
+            )
+        if method == "POST" and path.endswith("/oauth2/v2.0/devicecode"):
+            self._count("devicecode")
+            device_code = f"fake-device-code-{next(self._token_ids)}"
+            return (
+                200,
+                {
+                    "device_code": device_code,
+                    "user_code": "FAKECODE",
+                    "verification_uri": "https://microsoft.com/devicelogin",
+                    "expires_in": 900,
+                    "interval": 0,
+                    "message": "To sign in, enter the code FAKECODE.",
+                },
+                {},
+            )
+        if method == "POST" and path.endswith("/oauth2/v2.0/token"):
+            self._count("token")
+            if error := self._injected_error():
+                return error
+            grant_type = form.get("grant_type")
+            client_id = form.get("client_id", "")
+            if grant_type == _DEVICE_CODE_GRANT:
+                with self._lock:
+                    self._polls[form["device_code"]] += 1
+                    pending = self._polls[form["device_code"]] <= self.pending_polls
+                if pending:
+                    return 400, {"error": "authorization_pending"}, {}
+                return 200, self._token(tenant, client_id, user=True), {}
+            if grant_type == "refresh_token":
+                return 200, self._token(tenant, client_id, user=True), {}
+            if grant_type == _ON_BEHALF_OF_GRANT:
+                return (
+                    200,
+                    self._token(
+                        tenant, client_id, user=True, user_id=form["assertion"]
+                    ),
+                    {},
+                )
+            if grant_type == "client_credentials":
+                return 200, self._token(tenant, client_id, user=False), {}
+            return 400, {"error": "unsupported_grant_type"}, {}
+        return 404, {"error": "not_found"}, {}
+
+    def create_confidential_client(
+        self, client_id: str = "fake-client", tenant: str = "fake-tenant", **kwargs: Any
+    ) -> "ConfidentialClientApplication":
+        """
+        Create an MSAL confidential client that uses the fake server.
+
+        Parameters
+        ----------
+        client_id: str, default="fake-client"
+        tenant: str, default="fake-tenant"
+        **kwargs:
+            Passed to :class:`msal.ConfidentialClientApplication`.
+        """
+        from msal import (  # pylint: disable=import-outside-toplevel
+            ConfidentialClientApplication,
+        )
+
+        kwargs.setdefault("client_credential", "fake-secret")
+        return ConfidentialClientApplication(
+            client_id,
+            authority=f"{AUTHORITY_HOST}/{tenant}",
+            http_client=self.session,
+            **kwargs,
+        )
+
+    def create_public_client(
+        self, client_id: str = "fake-client", tenant: str = "fake-tenant", **kwargs: Any
+    ) -> "PublicClientApplication":
+        """
+        Create an MSAL public client that uses the fake server.
+
+        Parameters
+        ----------
+        client_id: str, default="fake-client"
+        tenant: str, default="fake-tenant"
+        **kwargs:
+            Passed to :class:`msal.PublicClientApplication`.
+        """
+        from msal import (  # pylint: disable=import-outside-toplevel
+            PublicClientApplication,
+        )
+
+        return PublicClientApplication(
+            client_id,
+            authority=f"{AUTHORITY_HOST}/{tenant}",
+            http_client=self.session,
+            **kwargs,
+        )
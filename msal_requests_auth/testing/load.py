@@ -0,0 +1,149 @@
+"""
+Multithreaded load test driver for the auth classes.
+"""
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional
+
+import requests
+
+from .fake_aad import FakeAAD
+
+
+class LoadTestResult(NamedTuple):
+    """
+    Result of :func:`run_load_test`.
+
+    .. versionadded:: 0.10.0
+    """
+
+    #: number of requests the token was added to
+    requests: int
+    #: number of requests where adding the token raised an error
+    errors: int
+    #: seconds the test ran for
+    duration: float
+    requests_per_second: float
+    #: number of token endpoint requests received by the fake Azure AD server
+    token_requests: int
+    #: seconds spent adding the token to a request
+    latency_p50: float
+    latency_p95: float
+    latency_p99: float
+    latency_max: float
+    #: number of requests by where the token came from (see AuthTiming)
+    paths: Dict[str, int]
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(percentile / 100 * len(sorted_values)))
+    return sorted_values[index]
+
+
+def run_load_test(  # pylint: disable=too-many-locals
+    auth: requests.auth.AuthBase,
+    threads: int = 8,
+    requests_per_thread: int = 1000,
+    duration: Optional[float] = None,
+    fake_aad: Optional[FakeAAD] = None,
+    url: str = "https://example.com",
+) -> LoadTestResult:
+    """
+    Add the token to requests from several threads at once
+    and measure the throughput and latency.
+
+    Requests are not sent, so only the time spent in the auth is measured.
+
+    .. versionadded:: 0.10.0
+
+    Parameters
+    ----------
+    auth: requests.auth.AuthBase
+        The auth to add the token with, e.g. ClientCredentialAuth or DeviceCodeAuth.
+    threads: int, default=8
+        Number of threads adding tokens.
+    requests_per_thread: int, default=1000
+        Number of requests per thread. Ignored if the duration is provided.
+    duration: float, optional
+        Number of seconds to run the test for.
+    fake_aad: FakeAAD, optional
+        The fake Azure AD server used by the auth to count token requests.
+    url: str, default="https://example.com"
+        The URL of the requests.
+
+    Returns
+    -------
+    LoadTestResult
+    """
+    template = requests.Request("GET", url).prepare()
+    start_barrier = threading.Barrier(threads + 1)
+    lock = threading.Lock()
+    latencies: List[float] = []
+    paths: "Counter[str]" = Counter()
+    errors = 0
+
+    def worker() -> None:
+        nonlocal errors
+        thread_latencies: List[float] = []
+        thread_paths: "Counter[str]" = Counter()
+        thread_errors = 0
+        response = requests.Response()
+        start_barrier.wait()
+        deadline = None if duration is None else time.perf_counter() + duration
+        count = 0
+        while (
+            count < requests_per_thread
+            if deadline is None
+            else time.perf_counter() < deadline
+        ):
+            count += 1
+            request = template.copy()
+            # copy shares the hooks with the template
+            request.hooks = requests.hooks.default_hooks()
+            start = time.perf_counter()
+            try:
+                auth(request)
+            except Exception:  # pylint: disable=broad-exception-caught
+                thread_errors += 1
+                continue
+            thread_latencies.append(time.perf_counter() - start)
+            requests.hooks.dispatch_hook("response", request.hooks, response)
+            if timing := getattr(response, "auth_timing", None):
+                thread_paths[timing.path] += 1
+        with lock:
+            latencies.extend(thread_latencies)
+            paths.update(thread_paths)
+            errors += thread_errors
+
+    token_requests_before = 0 if fake_aad is None else fake_aad.calls["token"]
+    workers = [
+        threading.Thread(target=worker, name=f"load-test-{index}")
+        for index in range(threads)
+    ]
+    for thread in workers:
+        thread.start()
+    start_barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    total_requests = len(latencies) + errors
+    return LoadTestResult(
+        requests=total_requests,
+        errors=errors,
+        duration=elapsed,
+        requests_per_second=total_requests / elapsed if elapsed else 0.0,
+        token_requests=(
+            0 if fake_aad is None else fake_aad.calls["token"] - token_requests_before
+        ),
+        latency_p50=_percentile(latencies, 50),
+        latency_p95=_percentile(latencies, 95),
+        latency_p99=_percentile(latencies, 99),
+        latency_max=latencies[-1] if latencies else 0.0,
+        paths=dict(paths),
+    )
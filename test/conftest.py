@@ -0,0 +1,9 @@
+import pytest
+
+from msal_requests_auth.testing import FakeAAD
+
+
+@pytest.fixture
+def fake_aad():
+    with FakeAAD() as server:
+        yield server
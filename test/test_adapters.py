@@ -0,0 +1,60 @@
+from unittest.mock import MagicMock, patch
+
+import msal
+import pytest
+
+from msal_requests_auth.adapters import (
+    GrpcAuthMetadataPlugin,
+    grpc_call_credentials,
+    urllib3_headers,
+)
+from msal_requests_auth.auth import ClientCredentialAuth, TokenProvider
+from msal_requests_auth.exceptions import AuthenticationError
+
+
+@pytest.fixture
+def auth():
+    client = MagicMock(spec=msal.ConfidentialClientApplication)
+    client.acquire_token_silent.return_value = {
+        "token_type": "Bearer",
+        "access_token": "TEST TOKEN",
+        "expires_in": 3600,
+    }
+    return ClientCredentialAuth(client=client, scopes=["TEST SCOPE"])
+
+
+def test_grpc_auth_metadata_plugin(auth):
+    callback = MagicMock()
+    GrpcAuthMetadataPlugin(auth)(MagicMock(), callback)
+    callback.assert_called_once_with((("authorization", "Bearer TEST TOKEN"),), None)
+
+
+def test_grpc_auth_metadata_plugin__error():
+    callback = MagicMock()
+    token_provider = TokenProvider(
+        MagicMock(return_value={"error": "BAD REQUEST", "error_description": "Bad."})
+    )
+    GrpcAuthMetadataPlugin(token_provider)(MagicMock(), callback)
+    metadata, error = callback.call_args.args
+    assert metadata == ()
+    assert isinstance(error, AuthenticationError)
+
+
+@patch("msal_requests_auth.adapters._import_grpc")
+def test_grpc_call_credentials(import_grpc_mock, auth):
+    credentials = grpc_call_credentials(auth)
+    metadata_call_credentials = import_grpc_mock.return_value.metadata_call_credentials
+    assert credentials is metadata_call_credentials.return_value
+    plugin = metadata_call_credentials.call_args.args[0]
+    assert plugin.token_provider is auth.token_provider
+
+
+def test_urllib3_headers(auth):
+    assert urllib3_headers(auth, headers={"Accept": "application/json"}) == {
+        "Accept": "application/json",
+        "Authorization": "Bearer TEST TOKEN",
+    }
+    assert urllib3_headers(auth.token_provider) == {
+        "Authorization": "Bearer TEST TOKEN"
+    }
+    auth.client.acquire_token_silent.assert_called_once()
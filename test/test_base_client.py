@@ -0,0 +1,172 @@
+from unittest.mock import MagicMock, patch
+
+import msal
+import pytest
+import requests
+
+from msal_requests_auth.auth import ClientCredentialAuth, ResiliencePolicy
+from msal_requests_auth.exceptions import AuthenticationError
+
+VALID_TOKEN = {
+    "token_type": "Bearer",
+    "access_token": "TEST TOKEN",
+    "expires_in": 3600,
+}
+
+
+def _http_error(status_code, retry_after=None):
+    response = requests.Response()
+    response.status_code = status_code
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return requests.HTTPError(f"{status_code} Error", response=response)
+
+
+@patch("msal.ConfidentialClientApplication", autospec=True)
+def test_base_auth__throttled__serves_last_token(cca_mock):
+    cca_mock.acquire_token_silent.return_value = None
+    # the token is close to expiry, so a new token is requested
+    token = {**VALID_TOKEN, "expires_in": 200}
+    cca_mock.acquire_token_for_client.side_effect = [
+        token,
+        _http_error(503, retry_after="120"),
+    ]
+    auth = ClientCredentialAuth(client=cca_mock, scopes=["TEST SCOPE"])
+    assert auth.get_access_token() == token
+    assert auth.get_access_token() == token
+    assert auth.resilience.state.retry_in > 119
+    # paused, so Azure AD is not called
+    assert auth.get_access_token() == token
+    assert cca_mock.acquire_token_for_client.call_count == 2
+
+
+@patch("msal.ConfidentialClientApplication", autospec=True)
+def test_base_auth__throttled__no_token(cca_mock):
+    cca_mock.acquire_token_silent.return_value = None
+    cca_mock.acquire_token_for_client.side_effect = _http_error(429, retry_after="5")
+    auth = ClientCredentialAuth(client=cca_mock, scopes=["TEST SCOPE"])
+    with pytest.raises(AuthenticationError, match="429 Error"):
+        auth.get_access_token()
+    with pytest.raises(AuthenticationError, match="Token requests are paused"):
+        auth.get_access_token()
+    cca_mock.acquire_token_for_client.assert_called_once()
+
+
+@patch("msal.ConfidentialClientApplication", autospec=True)
+def test_base_auth__transient_error__expired_token(cca_mock):
+    cca_mock.acquire_token_silent.return_value = None
+    cca_mock.acquire_token_for_client.side_effect = [
+        {**VALID_TOKEN, "expires_in": 0},
+        {"error": "temporarily_unavailable", "error_description": "Try again."},
+    ]
+    auth = ClientCredentialAuth(client=cca_mock, scopes=["TEST SCOPE"])
+    auth.get_access_token()
+    with pytest.raises(AuthenticationError, match="temporarily_unavailable"):
+        auth.get_access_token()
+    assert auth.resilience.state.consecutive_failures == 1
+
+
+@patch("msal.ConfidentialClientApplication", autospec=True)
+def test_base_auth__shared_policy__circuit_open(cca_mock):
+    cca_mock.acquire_token_silent.return_value = None
+    cca_mock.acquire_token_for_client.side_effect = requests.ConnectionError("DOWN")
+    policy = ResiliencePolicy(failure_threshold=1, reset_timeout=60)
+    auths = [
+        ClientCredentialAuth(client=cca_mock, scopes=["TEST SCOPE"], resilience=policy)
+        for _ in range(2)
+    ]
+    with pytest.raises(AuthenticationError, match="DOWN"):
+        auths[0].get_access_token()
+    assert policy.state.state == "open"
+    with pytest.raises(AuthenticationError, match="paused"):
+        auths[1].get_access_token()
+    cca_mock.acquire_token_for_client.assert_called_once()
+
+
+@patch("msal_requests_auth.auth.resilience.time.monotonic")
+@patch("msal.ConfidentialClientApplication", autospec=True)
+@pytest.mark.parametrize(
+    "probe_result, expected_state",
+    [
+        ({"error": "invalid_client", "error_description": "Bad secret."}, "closed"),
+        (RuntimeError("UNEXPECTED"), "open"),
+    ],
+)
+def test_base_auth__circuit_probe__outcome_recorded(
+    cca_mock, monotonic_mock, probe_result, expected_state
+):
+    monotonic_mock.return_value = 0
+    cca_mock.acquire_token_silent.return_value = None
+    cca_mock.acquire_token_for_client.side_effect = [
+        requests.ConnectionError("DOWN"),
+        probe_result,
+    ]
+    policy = ResiliencePolicy(failure_threshold=1, reset_timeout=60)
+    auth = ClientCredentialAuth(
+        client=cca_mock, scopes=["TEST SCOPE"], resilience=policy
+    )
+    with pytest.raises(AuthenticationError, match="DOWN"):
+        auth.get_access_token()
+    monotonic_mock.return_value = 60
+    with pytest.raises((AuthenticationError, RuntimeError)):
+        auth.get_access_token()
+    assert policy.state.state == expected_state
+
+
+@patch("msal.ConfidentialClientApplication", autospec=True)
+def test_base_auth__msal_throttled(cca_mock):
+    cca_mock.acquire_token_silent.return_value = None
+    cca_mock.acquire_token_for_client.side_effect = msal.exceptions.MsalServiceError(
+        "HTTP Error: 503", error=None, error_description=None
+    )
+    auth = ClientCredentialAuth(client=cca_mock, scopes=["TEST SCOPE"])
+    with pytest.raises(AuthenticationError, match="HTTP Error: 503"):
+        auth(MagicMock())
+    assert auth.resilience.state.total_failures == 1
+
+
+@patch("msal.ConfidentialClientApplication", autospec=True)
+@pytest.mark.parametrize(
+    "duration, upload_rate, body, expected_token",
+    [
+        (None, None, b"DATA", "FIRST"),
+        (1200, None, None, "SECOND"),
+        (None, 1, b"0" * 1200, "SECOND"),
+        (None, 1, b"0" * 100, "FIRST"),
+        (100, 1, iter([b"DATA"]), "FIRST"),
+    ],
+)
+def test_base_auth__for_duration(cca_mock, duration, upload_rate, body, expected_token):
+    cca_mock.token_cache = msal.TokenCache()
+    cca_mock.client_id = "CLIENT"
+    cca_mock.authority = MagicMock(tenant="TENANT")
+    cca_mock.acquire_token_silent.return_value = None
+    cca_mock.acquire_token_for_client.side_effect = [
+        {**VALID_TOKEN, "access_token": "FIRST", "expires_in": 1000},
+        {**VALID_TOKEN, "access_token": "SECOND"},
+    ]
+    auth = ClientCredentialAuth(client=cca_mock, scopes=["TEST SCOPE"])
+    auth.get_access_token()
+    assert 990 < auth.remaining_lifetime <= 1000
+    request = requests.Request(
+        "PUT",
+        "https://example.com",
+        data=body,
+        auth=auth.for_duration(duration, upload_rate),
+    ).prepare()
+    assert request.headers["Authorization"] == f"Bearer {expected_token}"
+
+
+@patch("msal.ConfidentialClientApplication", autospec=True)
+def test_base_auth__response_auth_timing(cca_mock):
+    cca_mock.acquire_token_silent.return_value = None
+    cca_mock.acquire_token_for_client.return_value = VALID_TOKEN
+    auth = ClientCredentialAuth(client=cca_mock, scopes=["TEST SCOPE"])
+    paths = []
+    for _ in range(2):
+        request = requests.Request("GET", "https://example.com", auth=auth).prepare()
+        response = requests.hooks.dispatch_hook(
+            "response", request.hooks, requests.Response()
+        )
+        paths.append(response.auth_timing.path)
+    assert paths == ["network", "memory"]
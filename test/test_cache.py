@@ -1,13 +1,25 @@
+import json
 import os
+import subprocess
+import sys
+import threading
+import time
+import warnings
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
 from msal_requests_auth.cache import (
+    EncryptedFileTokenCache,
     EnvironmentTokenCache,
+    ExternalMSALTokenCache,
     KeyringTokenCache,
     NullCache,
+    SharedMemoryTokenCache,
     SimpleTokenCache,
+    _derive_key,
+    _release_shared_memory,
     get_token_cache,
 )
 
@@ -36,6 +48,58 @@ def test_simple_token_cache__write_cache(serialize_mock, user_cache_dir_mock, tm
     cache.has_state_changed = True
     cache.write_cache()
     assert cache.cache_file.read_text() == "TEST"
+    assert not cache.has_state_changed
+
+
+def test_token_cache__write_cache__change_while_writing(tmp_path):
+    cache = SimpleTokenCache(tmp_path / "token-cache.bin")
+    cache.has_state_changed = True
+
+    def serialize():
+        # another thread adds a token while the cache is written
+        cache.has_state_changed = True
+        return "TEST"
+
+    with patch.object(cache, "serialize", side_effect=serialize):
+        cache.write_cache()
+    assert cache.cache_file.read_text() == "TEST"
+    assert cache.has_state_changed
+
+
+def test_token_cache__write_cache__error(tmp_path):
+    cache = SimpleTokenCache(tmp_path / "missing" / "token-cache.bin")
+    cache.has_state_changed = True
+    with pytest.raises(FileNotFoundError):
+        cache.write_cache()
+    assert cache.has_state_changed
+
+
+def test_token_cache__write_cache__threads(tmp_path):
+    cache = SimpleTokenCache(tmp_path / "token-cache.bin")
+    writing = threading.Semaphore(1)
+    overlapping_writes = []
+
+    def write_text(token_cache):
+        if not writing.acquire(blocking=False):
+            overlapping_writes.append(token_cache)
+            return
+        time.sleep(0.01)
+        writing.release()
+
+    with patch.object(cache, "serialize", return_value="TEST"), patch.object(
+        type(cache.cache_file), "write_text", side_effect=write_text
+    ) as write_text_mock:
+        threads = []
+        for _ in range(8):
+            cache.has_state_changed = True
+            thread = threading.Thread(target=cache.write_cache)
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+    assert write_text_mock.call_count >= 1
+    assert not overlapping_writes
+    assert not cache.has_state_changed
 
 
 @patch("msal_requests_auth.cache.user_cache_dir")
@@ -59,6 +123,96 @@ def test_simple_token_cache__deserialize(
     assert cache.cache_file == test_file
 
 
+@patch("msal_requests_auth.cache.EncryptedFileTokenCache.serialize")
+def test_encrypted_file_token_cache(serialize_mock, tmp_path):
+    serialize_mock.return_value = '{"AccessToken": {}}'
+    cache_file = tmp_path / "token-cache.enc"
+    with EncryptedFileTokenCache(cache_file, secret="SECRET") as cache:
+        cache.has_state_changed = True
+    assert not cache.has_state_changed
+    assert cache_file.read_bytes().startswith(b"MRAE")
+    assert b"AccessToken" not in cache_file.read_bytes()
+    with patch(
+        "msal_requests_auth.cache.EncryptedFileTokenCache.deserialize"
+    ) as deserialize_mock:
+        EncryptedFileTokenCache(cache_file, secret="SECRET")
+    deserialize_mock.assert_called_with('{"AccessToken": {}}')
+
+
+@patch("msal_requests_auth.cache._derive_key", wraps=_derive_key)
+def test_encrypted_file_token_cache__key_derived_once(derive_key_mock, tmp_path):
+    _derive_key.cache_clear()
+    cache_file = tmp_path / "token-cache.enc"
+    for _ in range(3):
+        with EncryptedFileTokenCache(cache_file, secret="SECRET") as cache:
+            cache.has_state_changed = True
+    assert derive_key_mock.call_count == 5
+    assert _derive_key.cache_info().misses == 1
+
+
+def test_encrypted_file_token_cache__wrong_secret(tmp_path):
+    cache_file = tmp_path / "token-cache.enc"
+    with EncryptedFileTokenCache(cache_file, secret="SECRET") as cache:
+        cache.has_state_changed = True
+    with pytest.warns(UserWarning, match="Unable to decrypt token cache"):
+        cache = EncryptedFileTokenCache(cache_file, secret="WRONG SECRET")
+    assert cache.serialize() == "{}"
+
+
+@patch.dict(os.environ, {}, clear=True)
+@patch("msal_requests_auth.cache.user_config_dir")
+@patch("msal_requests_auth.cache.user_cache_dir")
+def test_encrypted_file_token_cache__machine_key(
+    user_cache_dir_mock, user_config_dir_mock, tmp_path
+):
+    user_cache_dir_mock.return_value = str(tmp_path / "cache")
+    user_config_dir_mock.return_value = str(tmp_path / "config")
+    with EncryptedFileTokenCache() as cache:
+        cache.has_state_changed = True
+    key_file = tmp_path / "config" / "token-cache.key"
+    assert len(key_file.read_bytes()) == 32
+    assert cache.cache_file == tmp_path / "cache" / "token-cache.enc"
+    if os.name != "nt":
+        assert key_file.stat().st_mode & 0o777 == 0o600
+        assert cache.cache_file.stat().st_mode & 0o777 == 0o600
+    assert EncryptedFileTokenCache()._secret == key_file.read_bytes()
+
+
+@patch.dict(os.environ, {}, clear=True)
+@patch("msal_requests_auth.cache.Scrypt")
+@patch("msal_requests_auth.cache.user_config_dir")
+def test_encrypted_file_token_cache__machine_key_not_stretched(
+    user_config_dir_mock, scrypt_mock, tmp_path
+):
+    user_config_dir_mock.return_value = str(tmp_path / "config")
+    cache_file = tmp_path / "token-cache.enc"
+    with EncryptedFileTokenCache(cache_file) as cache:
+        cache.has_state_changed = True
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        EncryptedFileTokenCache(cache_file)
+    scrypt_mock.assert_not_called()
+
+
+@patch.dict(os.environ, {}, clear=True)
+@patch("msal_requests_auth.cache.os.link", side_effect=OSError("not supported"))
+@patch("msal_requests_auth.cache.user_config_dir")
+@patch("msal_requests_auth.cache.user_cache_dir")
+def test_encrypted_file_token_cache__machine_key_without_hard_links(
+    user_cache_dir_mock, user_config_dir_mock, link_mock, tmp_path
+):
+    user_cache_dir_mock.return_value = str(tmp_path / "cache")
+    user_config_dir_mock.return_value = str(tmp_path / "config")
+    cache = EncryptedFileTokenCache()
+    key_file = tmp_path / "config" / "token-cache.key"
+    assert cache._secret == key_file.read_bytes()
+    assert len(cache._secret) == 32
+    if os.name != "nt":
+        assert key_file.stat().st_mode & 0o777 == 0o600
+    assert [path.name for path in key_file.parent.iterdir()] == ["token-cache.key"]
+    link_mock.assert_called_once()
+
+
 @patch("msal_requests_auth.cache._import_keyring")
 @patch("msal_requests_auth.cache.KeyringTokenCache.serialize")
 def test_keyring_token_cache(serialize_mock, keyring_mock):
@@ -200,28 +354,53 @@ def test_get_token_cache__keyring__env_enabled(keyring_mock):
 
 
 @patch.dict(os.environ, {"__MSAL_REQUESTS_AUTH_CACHE__": "INPUT"}, clear=True)
+@patch("msal_requests_auth.cache.user_config_dir")
+@patch("msal_requests_auth.cache.user_cache_dir")
 @patch("msal_requests_auth.cache._import_keyring")
-def test_get_token_cache__null(keyring_mock):
+def test_get_token_cache__encrypted(
+    keyring_mock, user_cache_dir_mock, user_config_dir_mock, tmp_path
+):
     class NoKeyringError(Exception):
         pass
 
+    user_cache_dir_mock.return_value = str(tmp_path / "cache")
+    user_config_dir_mock.return_value = str(tmp_path / "config")
     keyring_mock.return_value.get_password.side_effect = NoKeyringError
     keyring_mock.return_value.errors.NoKeyringError = NoKeyringError
     with pytest.warns(UserWarning, match="Keyring backend not detected"):
-        assert isinstance(get_token_cache(), NullCache)
+        assert isinstance(get_token_cache(), EncryptedFileTokenCache)
+
+
+@patch.dict(sys.modules, {"keyring": None})
+@patch.dict(os.environ, {}, clear=True)
+@patch("msal_requests_auth.cache.user_config_dir")
+@patch("msal_requests_auth.cache.user_cache_dir")
+def test_get_token_cache__encrypted__keyring_not_installed(
+    user_cache_dir_mock, user_config_dir_mock, tmp_path
+):
+    user_cache_dir_mock.return_value = str(tmp_path / "cache")
+    user_config_dir_mock.return_value = str(tmp_path / "config")
+    assert isinstance(get_token_cache(), EncryptedFileTokenCache)
 
 
 @patch.dict(os.environ, {}, clear=True)
+@patch("msal_requests_auth.cache.user_config_dir")
+@patch("msal_requests_auth.cache.user_cache_dir")
 @patch("msal_requests_auth.cache._import_keyring")
-def test_get_token_cache__null__env_enabled(keyring_mock):
+def test_get_token_cache__encrypted__env_enabled(
+    keyring_mock, user_cache_dir_mock, user_config_dir_mock, tmp_path
+):
     class NoKeyringError(Exception):
         pass
 
+    user_cache_dir_mock.return_value = str(tmp_path / "cache")
+    user_config_dir_mock.return_value = str(tmp_path / "config")
     keyring_mock.return_value.get_password.side_effect = NoKeyringError
     keyring_mock.return_value.errors.NoKeyringError = NoKeyringError
     with pytest.warns(UserWarning, match="Keyring backend not detected"):
         assert isinstance(
-            get_token_cache(allow_environment_token_cache=True), NullCache
+            get_token_cache(allow_environment_token_cache=True),
+            EncryptedFileTokenCache,
         )
 
 
@@ -232,3 +411,258 @@ def test_get_token_cache__environment(deserialize_mock):
         get_token_cache(allow_environment_token_cache=True), EnvironmentTokenCache
     )
     deserialize_mock.assert_called_once_with("INPUT")
+
+
+@patch.dict(os.environ, {}, clear=True)
+@patch("msal_requests_auth.cache.SharedMemoryTokenCache.serialize")
+def test_shared_memory_token_cache(serialize_mock):
+    serialize_mock.return_value = "INPUT FROM CACHE"
+    try:
+        with SharedMemoryTokenCache() as cache:
+            cache.has_state_changed = True
+        handle = os.environ["__MSAL_REQUESTS_AUTH_CACHE_HANDLE__"]
+        assert handle.endswith(f":{len('INPUT FROM CACHE')}")
+        assert "__MSAL_REQUESTS_AUTH_CACHE__" not in os.environ
+        with patch(
+            "msal_requests_auth.cache.SharedMemoryTokenCache.deserialize"
+        ) as deserialize_mock:
+            SharedMemoryTokenCache()
+        deserialize_mock.assert_called_once_with("INPUT FROM CACHE")
+    finally:
+        _release_shared_memory("__MSAL_REQUESTS_AUTH_CACHE_HANDLE__")
+
+
+@patch.dict(os.environ, {}, clear=True)
+@patch("msal_requests_auth.cache.SharedMemoryTokenCache.serialize")
+def test_shared_memory_token_cache__write_cache__replaces_segment(serialize_mock):
+    try:
+        cache = SharedMemoryTokenCache()
+        cache.write_cache()
+        assert "__MSAL_REQUESTS_AUTH_CACHE_HANDLE__" not in os.environ
+        serialize_mock.return_value = "FIRST"
+        cache.has_state_changed = True
+        cache.write_cache()
+        first_handle = os.environ["__MSAL_REQUESTS_AUTH_CACHE_HANDLE__"]
+        serialize_mock.return_value = "SECOND"
+        cache.has_state_changed = True
+        cache.write_cache()
+        assert os.environ["__MSAL_REQUESTS_AUTH_CACHE_HANDLE__"] != first_handle
+        os.environ["__MSAL_REQUESTS_AUTH_CACHE_HANDLE__"] = first_handle
+        with pytest.warns(UserWarning, match="shared memory segment not found"):
+            SharedMemoryTokenCache()
+    finally:
+        _release_shared_memory("__MSAL_REQUESTS_AUTH_CACHE_HANDLE__")
+
+
+@pytest.mark.parametrize("handle", ["INVALID", "psm_test:SIZE", ":10"])
+def test_shared_memory_token_cache__invalid_handle(handle):
+    with patch.dict(
+        os.environ, {"__MSAL_REQUESTS_AUTH_CACHE_HANDLE__": handle}, clear=True
+    ), pytest.warns(UserWarning, match="Invalid token cache shared memory handle"):
+        cache = get_token_cache(allow_shared_memory_token_cache=True)
+    assert isinstance(cache, SharedMemoryTokenCache)
+    assert cache.serialize() == "{}"
+
+
+@patch.dict(os.environ, {}, clear=True)
+def test_shared_memory_token_cache__child_process():
+    try:
+        with SharedMemoryTokenCache() as cache:
+            cache.add(
+                {
+                    "client_id": "CLIENT",
+                    "scope": ["TEST SCOPE"],
+                    "token_endpoint": "https://login.microsoftonline.com/TENANT/oauth2/v2.0/token",
+                    "response": {
+                        "token_type": "Bearer",
+                        "access_token": "TEST TOKEN",
+                        "expires_in": 3600,
+                    },
+                }
+            )
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "from msal_requests_auth.cache import SharedMemoryTokenCache;"
+                "print(SharedMemoryTokenCache().serialize())",
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+            env={**os.environ, "SYSTEMROOT": os.getenv("SYSTEMROOT", "")},
+        ).stdout
+        assert "TEST TOKEN" in output
+    finally:
+        _release_shared_memory("__MSAL_REQUESTS_AUTH_CACHE_HANDLE__")
+
+
+@patch.dict(os.environ, {"__MSAL_REQUESTS_AUTH_CACHE_HANDLE__": "TEST:5"}, clear=True)
+@patch("msal_requests_auth.cache.SharedMemoryTokenCache._read_shared_memory")
+def test_get_token_cache__shared_memory(read_mock):
+    read_mock.return_value = None
+    assert isinstance(
+        get_token_cache(allow_shared_memory_token_cache=True), SharedMemoryTokenCache
+    )
+
+
+def _add_token(cache, access_token, expires_in=3600, client_id="CLIENT"):
+    cache.add(
+        {
+            "client_id": client_id,
+            "scope": ["SCOPE"],
+            "token_endpoint": "https://login.microsoftonline.com/TENANT/token",
+            "response": {
+                "token_type": "Bearer",
+                "access_token": access_token,
+                "expires_in": expires_in,
+            },
+        }
+    )
+
+
+def _write_external_cache(cache_file, access_token, expires_in=3600):
+    cache = NullCache()
+    _add_token(cache, access_token, expires_in=expires_in)
+    cache_file.write_text(cache.serialize())
+    return json.loads(cache.serialize())
+
+
+def _access_tokens(cache):
+    return [
+        entry["secret"]
+        for entry in cache.search(ExternalMSALTokenCache.CredentialType.ACCESS_TOKEN)
+    ]
+
+
+def test_external_msal_token_cache(tmp_path):
+    cache_file = tmp_path / "msal_token_cache.bin"
+    _write_external_cache(cache_file, "EXTERNAL TOKEN")
+    cache = ExternalMSALTokenCache([cache_file, tmp_path / "missing.bin"])
+    assert _access_tokens(cache) == ["EXTERNAL TOKEN"]
+    assert not cache.has_state_changed
+    assert (tmp_path / "msal_token_cache.bin.lockfile").exists()
+
+
+def test_external_msal_token_cache__reload_modified(tmp_path):
+    cache_file = tmp_path / "msal_token_cache.bin"
+    _write_external_cache(cache_file, "OLD TOKEN", expires_in=1800)
+    cache = ExternalMSALTokenCache([cache_file])
+    assert _access_tokens(cache) == ["OLD TOKEN"]
+    _write_external_cache(cache_file, "NEW TOKEN")
+    modified_time = time.time() + 10
+    os.utime(cache_file, (modified_time, modified_time))
+    assert _access_tokens(cache) == ["NEW TOKEN"]
+
+
+def _refresh_tokens(cache):
+    return [
+        entry["secret"]
+        for entry in cache.search(ExternalMSALTokenCache.CredentialType.REFRESH_TOKEN)
+    ]
+
+
+def _write_external_refresh_token(cache_file, refresh_token, modified_time):
+    cache = NullCache()
+    if refresh_token is not None:
+        cache.add(
+            {
+                "client_id": "CLIENT",
+                "scope": ["SCOPE"],
+                "token_endpoint": "https://login.microsoftonline.com/TENANT/token",
+                "response": {
+                    "token_type": "Bearer",
+                    "refresh_token": refresh_token,
+                    "client_info": "eyJ1aWQiOiJVU0VSIiwidXRpZCI6IlRFTkFOVCJ9",
+                },
+            }
+        )
+    cache_file.write_text(cache.serialize())
+    os.utime(cache_file, (modified_time, modified_time))
+
+
+def test_external_msal_token_cache__reload_replaces_external_entries(tmp_path):
+    cache_file = tmp_path / "msal_token_cache.bin"
+    _write_external_refresh_token(cache_file, "OLD", time.time())
+    cache = ExternalMSALTokenCache([cache_file])
+    assert _refresh_tokens(cache) == ["OLD"]
+    assert list(cache.search(ExternalMSALTokenCache.CredentialType.ACCOUNT))
+    # rotated refresh token
+    _write_external_refresh_token(cache_file, "NEW", time.time() + 10)
+    assert _refresh_tokens(cache) == ["NEW"]
+    # signed out
+    _write_external_refresh_token(cache_file, None, time.time() + 20)
+    assert _refresh_tokens(cache) == []
+    assert not list(cache.search(ExternalMSALTokenCache.CredentialType.ACCOUNT))
+
+
+def test_external_msal_token_cache__keeps_newer_local_token(tmp_path):
+    local_file = tmp_path / "local.bin"
+    external_file = tmp_path / "external.bin"
+    _write_external_cache(local_file, "LOCAL TOKEN")
+    _write_external_cache(external_file, "EXTERNAL TOKEN", expires_in=600)
+    local_cache = NullCache()
+    local_cache.deserialize(local_file.read_text())
+    cache = ExternalMSALTokenCache([external_file], token_cache=local_cache)
+    assert _access_tokens(cache) == ["LOCAL TOKEN"]
+
+
+def test_external_msal_token_cache__invalid_file(tmp_path):
+    cache_file = tmp_path / "msal_token_cache.bin"
+    cache_file.write_text("INVALID")
+    with pytest.warns(UserWarning, match="Unable to read token cache"):
+        cache = ExternalMSALTokenCache([cache_file])
+    assert _access_tokens(cache) == []
+
+
+@patch("msal_requests_auth.cache.user_cache_dir")
+def test_external_msal_token_cache__write_cache(user_cache_dir_mock, tmp_path):
+    user_cache_dir_mock.return_value = str(tmp_path / "msal-requests-auth")
+    external_file = tmp_path / "external.bin"
+    external_state = _write_external_cache(external_file, "EXTERNAL TOKEN")
+    local_cache = SimpleTokenCache()
+    with ExternalMSALTokenCache([external_file], token_cache=local_cache) as cache:
+        _add_token(cache, "LOCAL TOKEN", client_id="LOCAL CLIENT")
+    assert not cache.has_state_changed
+    # only the entries of this cache are written
+    local_state = json.loads(local_cache.cache_file.read_text())
+    assert [entry["secret"] for entry in local_state["AccessToken"].values()] == [
+        "LOCAL TOKEN"
+    ]
+    assert json.loads(external_file.read_text()) == external_state
+
+
+def test_external_msal_token_cache__unwritable_lock(tmp_path):
+    cache_file = tmp_path / "msal_token_cache.bin"
+    _write_external_cache(cache_file, "EXTERNAL TOKEN")
+    path_open = Path.open
+
+    def open_mock(path, *args, **kwargs):
+        if path.name.endswith(".lockfile"):
+            raise PermissionError("Permission denied")
+        return path_open(path, *args, **kwargs)
+
+    with patch.object(Path, "open", open_mock), pytest.warns(
+        UserWarning, match="Unable to open token cache lock"
+    ):
+        cache = ExternalMSALTokenCache([cache_file])
+        assert _access_tokens(cache) == []
+
+
+@patch.dict(os.environ, {"MSAL_REQUESTS_AUTH_CACHE_SECRET": "SECRET"})
+@patch("msal_requests_auth.cache.user_cache_dir")
+@patch("msal_requests_auth.cache._import_keyring")
+def test_get_token_cache__external(keyring_mock, user_cache_dir_mock, tmp_path):
+    class NoKeyringError(Exception):
+        pass
+
+    user_cache_dir_mock.return_value = str(tmp_path / "cache")
+    keyring_mock.return_value.get_password.side_effect = NoKeyringError
+    keyring_mock.return_value.errors.NoKeyringError = NoKeyringError
+    cache_file = tmp_path / "msal_token_cache.bin"
+    _write_external_cache(cache_file, "EXTERNAL TOKEN")
+    with pytest.warns(UserWarning, match="Keyring backend not detected"):
+        cache = get_token_cache(external_cache_files=[cache_file])
+    assert isinstance(cache, ExternalMSALTokenCache)
+    assert isinstance(cache.token_cache, EncryptedFileTokenCache)
+    assert _access_tokens(cache) == ["EXTERNAL TOKEN"]
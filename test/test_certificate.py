@@ -0,0 +1,124 @@
+import base64
+import datetime
+import os
+from unittest.mock import patch
+
+import jwt
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.serialization import pkcs12
+from cryptography.x509.oid import NameOID
+
+from msal_requests_auth.auth import CertificateCredential
+from msal_requests_auth.auth.certificate import _CERTIFICATES
+
+
+def _create_certificate():
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "TEST")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(private_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(private_key, hashes.SHA256())
+    )
+    return private_key, certificate
+
+
+@pytest.fixture(scope="module")
+def certificate():
+    return _create_certificate()
+
+
+@pytest.fixture
+def pem_file(certificate, tmp_path):
+    private_key, cert = certificate
+    pem_file = tmp_path / "certificate.pem"
+    pem_file.write_bytes(
+        private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        + cert.public_bytes(serialization.Encoding.PEM)
+    )
+    return pem_file
+
+
+def test_certificate_credential__client_assertion(certificate, pem_file):
+    _, cert = certificate
+    credential = CertificateCredential("CLIENT", pem_file)
+    assertion = credential.client_credential(
+        "https://login.microsoftonline.com/TENANT/"
+    )["client_assertion"]()
+    claims = jwt.decode(assertion, options={"verify_signature": False})
+    assert claims["aud"] == "https://login.microsoftonline.com/TENANT/oauth2/v2.0/token"
+    assert claims["iss"] == claims["sub"] == "CLIENT"
+    assert claims["exp"] - claims["nbf"] == 600
+    header = jwt.get_unverified_header(assertion)
+    assert header["alg"] == "PS256"
+    assert "x5c" not in header
+    assert header["x5t#S256"] == base64.urlsafe_b64encode(
+        cert.fingerprint(hashes.SHA256())
+    ).decode("utf-8")
+    jwt.decode(
+        assertion,
+        cert.public_key(),
+        algorithms=["PS256"],
+        audience=claims["aud"],
+    )
+
+
+def test_certificate_credential__reuses_assertion(pem_file):
+    credential = CertificateCredential("CLIENT", pem_file)
+    first = credential.get_client_assertion("AUDIENCE")
+    assert credential.get_client_assertion("AUDIENCE") == first
+    assert credential.get_client_assertion("OTHER AUDIENCE") != first
+    with patch("msal_requests_auth.auth.certificate.time.time") as time_mock:
+        time_mock.return_value = (
+            jwt.decode(first, options={"verify_signature": False})["exp"] - 59
+        )
+        assert credential.get_client_assertion("AUDIENCE") != first
+
+
+def test_certificate_credential__key_parsed_once(pem_file):
+    misses = _CERTIFICATES.stats().misses
+    for _ in range(3):
+        CertificateCredential("CLIENT", pem_file).get_client_assertion("AUDIENCE")
+    assert _CERTIFICATES.stats().misses == misses + 1
+    os.utime(pem_file, ns=(0, 0))
+    CertificateCredential("CLIENT", pem_file).get_client_assertion("AUDIENCE")
+    assert _CERTIFICATES.stats().misses == misses + 2
+
+
+def test_certificate_credential__pfx(certificate, tmp_path):
+    private_key, cert = certificate
+    pfx_file = tmp_path / "certificate.pfx"
+    pfx_file.write_bytes(
+        pkcs12.serialize_key_and_certificates(
+            b"TEST",
+            private_key,
+            cert,
+            None,
+            serialization.BestAvailableEncryption(b"PASSWORD"),
+        )
+    )
+    credential = CertificateCredential(
+        "CLIENT", pfx_file, passphrase="PASSWORD", send_certificate_chain=True
+    )
+    header = jwt.get_unverified_header(credential.get_client_assertion("AUDIENCE"))
+    assert len(header["x5c"]) == 1
+    # the passphrase is not kept in the certificate cache
+    assert all(b"PASSWORD" not in str(key).encode() for key in _CERTIFICATES._entries)
+
+
+def test_certificate_credential__invalid_refresh_margin(pem_file):
+    with pytest.raises(ValueError, match="refresh_margin"):
+        CertificateCredential("CLIENT", pem_file, assertion_lifetime=60)
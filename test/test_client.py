@@ -0,0 +1,121 @@
+import threading
+from unittest.mock import patch
+
+from msal_requests_auth.cache import HttpMetadataCache, SimpleTokenCache
+from msal_requests_auth.client import (
+    create_confidential_client,
+    create_public_client,
+    get_http_metadata_cache,
+)
+
+AUTHORITY = "https://login.microsoftonline.com/TENANT"
+
+
+def test_create_public_client__warm_start(fake_aad, tmp_path):
+    http_cache_file = tmp_path / "http-cache.bin"
+    with HttpMetadataCache(http_cache_file) as http_cache:
+        client = create_public_client(
+            "CLIENT", AUTHORITY, http_cache=http_cache, http_client=fake_aad.session
+        )
+    assert client.authority.token_endpoint.endswith("/TENANT/oauth2/v2.0/token")
+    cold_requests = sum(fake_aad.requests.values())
+    assert cold_requests > 0
+    assert http_cache_file.exists()
+
+    for _ in range(3):
+        create_public_client(
+            "CLIENT",
+            AUTHORITY,
+            token_cache=SimpleTokenCache(tmp_path / "token-cache.bin"),
+            http_cache=HttpMetadataCache(http_cache_file),
+            http_client=fake_aad.session,
+        )
+    assert sum(fake_aad.requests.values()) == cold_requests
+
+
+def test_create_confidential_client__warm_start(fake_aad, tmp_path):
+    http_cache_file = tmp_path / "http-cache.bin"
+    create_confidential_client(
+        "CLIENT",
+        AUTHORITY,
+        client_credential="SECRET",
+        http_cache=HttpMetadataCache(http_cache_file),
+        http_client=fake_aad.session,
+    )
+    cold_requests = sum(fake_aad.requests.values())
+    create_confidential_client(
+        "CLIENT",
+        AUTHORITY,
+        client_credential="SECRET",
+        http_cache=HttpMetadataCache(http_cache_file),
+        http_client=fake_aad.session,
+    )
+    assert sum(fake_aad.requests.values()) == cold_requests
+
+
+def test_create_public_client__revalidate(fake_aad, tmp_path):
+    http_cache_file = tmp_path / "http-cache.bin"
+    create_public_client(
+        "CLIENT",
+        AUTHORITY,
+        http_cache=HttpMetadataCache(http_cache_file),
+        http_client=fake_aad.session,
+    )
+    cold_requests = sum(fake_aad.requests.values())
+    with patch("msal_requests_auth.cache.time.time") as time_mock:
+        time_mock.return_value = http_cache_file.stat().st_mtime + 3601
+        http_cache = HttpMetadataCache(http_cache_file, max_age=3600)
+        assert len(http_cache) == 0
+        assert http_cache.has_state_changed
+    create_public_client(
+        "CLIENT", AUTHORITY, http_cache=http_cache, http_client=fake_aad.session
+    )
+    assert sum(fake_aad.requests.values()) == 2 * cold_requests
+
+
+def test_http_metadata_cache__invalid_file(tmp_path):
+    http_cache_file = tmp_path / "http-cache.bin"
+    http_cache_file.write_text("INVALID")
+    with patch("msal_requests_auth.cache.warnings.warn") as warn_mock:
+        assert len(HttpMetadataCache(http_cache_file)) == 0
+    warn_mock.assert_called_once()
+
+
+def test_http_metadata_cache__mapping(tmp_path):
+    http_cache = HttpMetadataCache(tmp_path / "http-cache.bin")
+    http_cache.write_cache()
+    assert not http_cache.cache_file.exists()
+    http_cache["KEY"] = "VALUE"
+    assert dict(http_cache) == {"KEY": "VALUE"}
+    http_cache.write_cache()
+    assert not http_cache.has_state_changed
+    del http_cache["KEY"]
+    assert http_cache.has_state_changed
+    assert HttpMetadataCache(http_cache.cache_file)["KEY"] == "VALUE"
+
+
+def test_http_metadata_cache__threads(tmp_path):
+    http_cache = HttpMetadataCache(tmp_path / "http-cache.bin")
+
+    def update(thread_index):
+        for index in range(200):
+            http_cache[(thread_index, index)] = "VALUE"
+            http_cache.write_cache()
+
+    threads = [threading.Thread(target=update, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    http_cache.write_cache()
+    assert len(HttpMetadataCache(http_cache.cache_file)) == 800
+    assert [path.name for path in tmp_path.iterdir()] == ["http-cache.bin"]
+
+
+@patch("msal_requests_auth.client._HTTP_METADATA_CACHE", None)
+@patch("msal_requests_auth.cache.user_cache_dir")
+def test_get_http_metadata_cache(user_cache_dir_mock, tmp_path):
+    user_cache_dir_mock.return_value = str(tmp_path / "msal-requests-auth")
+    http_cache = get_http_metadata_cache()
+    assert http_cache is get_http_metadata_cache()
+    assert http_cache.cache_file == tmp_path / "msal-requests-auth" / "http-cache.bin"
@@ -1,5 +1,6 @@
 from unittest.mock import MagicMock, patch
 
+import msal
 import pytest
 
 from msal_requests_auth.auth import ClientCredentialAuth
@@ -103,3 +104,40 @@ def test_client_credential_auth__cache(cca_mock):
     cca_mock.acquire_token_for_client.assert_not_called()
 
     assert returned_request.headers == {"Authorization": "Bearer TEST TOKEN"}
+
+
+def _add_token(token_cache, scopes, access_token):
+    token_cache.add(
+        {
+            "client_id": "CLIENT",
+            "scope": scopes,
+            "token_endpoint": "https://login.microsoftonline.com/TENANT/token",
+            "response": {
+                "token_type": "Bearer",
+                "access_token": access_token,
+                "expires_in": 3600,
+            },
+        }
+    )
+
+
+@patch("msal.ConfidentialClientApplication", autospec=True)
+def test_client_credential_auth__refresh_bypasses_cache(cca_mock):
+    cca_mock.token_cache = msal.TokenCache()
+    cca_mock.client_id = "CLIENT"
+    cca_mock.authority = MagicMock(tenant="TENANT")
+    _add_token(cca_mock.token_cache, ["api://test/.default"], "CACHED TOKEN")
+    _add_token(cca_mock.token_cache, ["api://other/.default"], "OTHER TOKEN")
+    cca_mock.acquire_token_for_client.return_value = {
+        "token_type": "Bearer",
+        "access_token": "NEW TOKEN",
+    }
+    auth = ClientCredentialAuth(client=cca_mock, scopes=["api://test/.default"])
+    assert auth._refresh_access_token()["access_token"] == "NEW TOKEN"
+    access_tokens = cca_mock.token_cache.search(
+        msal.TokenCache.CredentialType.ACCESS_TOKEN
+    )
+    assert [token["secret"] for token in access_tokens] == ["OTHER TOKEN"]
+    cca_mock.acquire_token_for_client.assert_called_once_with(
+        scopes=["api://test/.default"]
+    )
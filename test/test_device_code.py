@@ -4,7 +4,7 @@ from unittest.mock import MagicMock, patch
 import msal
 import pytest
 
-from msal_requests_auth.auth import DeviceCodeAuth
+from msal_requests_auth.auth import DeviceCodeAuth, DeviceCodeLogin
 from msal_requests_auth.exceptions import AuthenticationError
 
 
@@ -274,3 +274,120 @@ def test_device_code_auth__pyperclip_error(pyperclip_patch, webbrowser_patch, pc
 
     pyperclip_patch.copy.assert_called_with("TEST CODE")
     webbrowser_patch.open.assert_not_called()
+
+
+def _device_code_client(tenant, signed_in=False):
+    client = MagicMock(spec=PublicClientApplicationSpec)
+    client.client_id = "TEST CLIENT"
+    client.authority = MagicMock(tenant=tenant)
+    client.token_cache = MagicMock()
+    account = {"account": "TEST ACCOUNT", "realm": tenant}
+
+    def get_accounts():
+        return (
+            [account] if signed_in or client.acquire_token_by_device_flow.called else []
+        )
+
+    client.get_accounts.side_effect = get_accounts
+    client.acquire_token_silent.side_effect = lambda scopes, account: {
+        "token_type": "Bearer",
+        "access_token": f"TOKEN {scopes[0]}",
+    }
+    client.initiate_device_flow.return_value = {
+        "message": "TEST MESSAGE",
+        "verification_uri": "TEST URL",
+        "user_code": "TEST CODE",
+    }
+    client.acquire_token_by_device_flow.return_value = {
+        "token_type": "Bearer",
+        "access_token": "TEST TOKEN",
+    }
+    return client
+
+
+@patch.dict(os.environ, {}, clear=True)
+def test_device_code_login():
+    first_tenant = _device_code_client("TENANT 1")
+    second_tenant = _device_code_client("TENANT 2")
+    signed_in_tenant = _device_code_client("TENANT 3", signed_in=True)
+    login = DeviceCodeLogin(
+        [
+            DeviceCodeAuth(first_tenant, scopes=["SCOPE A"], headless=True),
+            DeviceCodeAuth(first_tenant, scopes=["SCOPE B"], headless=True),
+            DeviceCodeAuth(second_tenant, scopes=["SCOPE C"], headless=True),
+        ]
+    )
+    auth = login.register(
+        DeviceCodeAuth(signed_in_tenant, scopes=["SCOPE D"], headless=True)
+    )
+    login.login()
+    first_tenant.initiate_device_flow.assert_called_once_with(scopes=["SCOPE A"])
+    second_tenant.initiate_device_flow.assert_called_once_with(scopes=["SCOPE C"])
+    signed_in_tenant.initiate_device_flow.assert_not_called()
+    first_tenant.acquire_token_silent.assert_called_with(
+        scopes=["SCOPE B"], account={"account": "TEST ACCOUNT", "realm": "TENANT 1"}
+    )
+    assert auth.get_access_token()["access_token"] == "TOKEN SCOPE D"
+
+
+@patch.dict(os.environ, {}, clear=True)
+def test_device_code_login__silent_failure():
+    client = _device_code_client("TENANT 1")
+    client.acquire_token_silent.side_effect = None
+    client.acquire_token_silent.return_value = {"error": "invalid_grant"}
+    DeviceCodeLogin(
+        [
+            DeviceCodeAuth(client, scopes=["SCOPE A"], headless=True),
+            DeviceCodeAuth(client, scopes=["SCOPE B"], headless=True),
+        ]
+    ).login()
+    assert client.initiate_device_flow.call_count == 2
+    client.initiate_device_flow.assert_called_with(scopes=["SCOPE B"])
+
+
+@patch.dict(os.environ, {}, clear=True)
+def test_device_code_login__error():
+    client = _device_code_client("TENANT 1")
+    client.acquire_token_by_device_flow.return_value = {
+        "error": "BAD REQUEST",
+        "error_description": "Request to get token was bad.",
+    }
+    with pytest.raises(
+        AuthenticationError,
+        match=(
+            r"Unable to get token\. Error: BAD REQUEST "
+            r"\(Details: Request to get token was bad\.\)\."
+        ),
+    ):
+        DeviceCodeLogin(
+            [DeviceCodeAuth(client, scopes=["SCOPE"], headless=True)]
+        ).login()
+
+
+@patch.dict(os.environ, {}, clear=True)
+def test_device_code_auth__for_duration__force_refresh():
+    client = _device_code_client("TENANT 1", signed_in=True)
+    client.acquire_token_silent.side_effect = [
+        {"token_type": "Bearer", "access_token": "CACHED", "expires_in": 1000},
+        {"token_type": "Bearer", "access_token": "REFRESHED", "expires_in": 3600},
+    ]
+    auth = DeviceCodeAuth(client, scopes=["SCOPE"], headless=True)
+    request_mock = MagicMock()
+    request_mock.headers = {}
+    assert auth(request_mock).headers == {"Authorization": "Bearer CACHED"}
+    assert auth.for_duration(1200)(request_mock).headers == {
+        "Authorization": "Bearer REFRESHED"
+    }
+    client.acquire_token_silent.assert_called_with(
+        scopes=["SCOPE"],
+        account={"account": "TEST ACCOUNT", "realm": "TENANT 1"},
+        force_refresh=True,
+    )
+    client.initiate_device_flow.assert_not_called()
+
+
+@patch.dict(os.environ, {}, clear=True)
+def test_device_code_auth__timing_path():
+    client = _device_code_client("TENANT 1")
+    auth = DeviceCodeAuth(client, scopes=["SCOPE"], headless=True)
+    assert auth.token_provider.get_timed_header()[1].path == "interactive"
@@ -0,0 +1,40 @@
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import msal_requests_auth",
+        "import msal_requests_auth.auth",
+        "from msal_requests_auth.auth import ClientCredentialAuth",
+        "from msal_requests_auth.auth import DeviceCodeAuth",
+    ],
+)
+def test_import__lazy(statement):
+    loaded = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"{statement}; import sys; "
+            "print(sorted({'msal', 'pyperclip', 'webbrowser'}.intersection(sys.modules)))",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+    assert loaded == "[]"
+
+
+def test_import__lazy_attributes():
+    import msal_requests_auth
+    import msal_requests_auth.auth
+
+    assert msal_requests_auth.cache.get_token_cache is not None
+    assert (
+        msal_requests_auth.auth.ClientCredentialAuth.__name__ == "ClientCredentialAuth"
+    )
+    with pytest.raises(AttributeError):
+        msal_requests_auth.auth.MissingAuth  # noqa: B018
@@ -0,0 +1,76 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from msal_requests_auth._lru import LRUCacheStats, _LRUCache
+
+
+def test_lru_cache__max_size():
+    cache = _LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats() == LRUCacheStats(
+        size=2, max_size=2, hits=3, misses=1, evictions=1
+    )
+
+
+@patch("msal_requests_auth._lru.time.monotonic")
+def test_lru_cache__max_idle(monotonic_mock):
+    monotonic_mock.return_value = 0
+    cache = _LRUCache(max_size=10, max_idle=10)
+    cache.put("a", 1)
+    monotonic_mock.return_value = 5
+    cache.put("b", 2)
+    monotonic_mock.return_value = 11
+    assert cache.get("b") == 2
+    assert cache.get("a") is None
+    assert cache.stats().evictions == 1
+    assert len(cache) == 1
+
+
+def test_lru_cache__get_or_create():
+    cache = _LRUCache(max_size=2)
+    assert cache.get_or_create("a", lambda: 1) == 1
+    assert cache.get_or_create("a", lambda: 2) == 1
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
+    cache.put("b", 2)
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_lru_cache__get_or_create__single_flight():
+    cache = _LRUCache(max_size=2)
+    calls = []
+
+    def factory():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    values = []
+    threads = [
+        threading.Thread(
+            target=lambda: values.append(cache.get_or_create("a", factory))
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert len(set(map(id, values))) == 1
+    assert cache._creation_locks == {}
+
+
+def test_lru_cache__invalid_max_size():
+    with pytest.raises(ValueError, match="max_size"):
+        _LRUCache(max_size=0)
@@ -0,0 +1,88 @@
+from unittest.mock import MagicMock, create_autospec
+
+import msal
+import pytest
+
+from msal_requests_auth.auth import MultiTenantClientCredentialAuth
+from msal_requests_auth.exceptions import AuthenticationError
+
+
+def _client_factory(tenant):
+    client = create_autospec(msal.ConfidentialClientApplication, instance=True)
+    client.acquire_token_silent.return_value = None
+    client.acquire_token_for_client.return_value = {
+        "token_type": "Bearer",
+        "access_token": f"TOKEN {tenant}",
+    }
+    return client
+
+
+def _request(url):
+    request_mock = MagicMock()
+    request_mock.url = url
+    request_mock.headers = {}
+    return request_mock
+
+
+def test_multi_tenant_auth__url_pattern():
+    client_factory = MagicMock(side_effect=_client_factory)
+    auth = MultiTenantClientCredentialAuth(
+        client_factory=client_factory,
+        scopes=["TEST SCOPE"],
+        tenant_url_pattern=r"https://api\.test/tenants/(?P<tenant>[^/]+)/",
+    )
+    for tenant in ["A", "B", "A"]:
+        returned_request = auth(_request(f"https://api.test/tenants/{tenant}/items"))
+        assert returned_request.headers == {"Authorization": f"Bearer TOKEN {tenant}"}
+    assert client_factory.call_count == 2
+    stats = auth.pool_stats
+    assert (stats.size, stats.hits, stats.misses) == (2, 1, 2)
+
+
+def test_multi_tenant_auth__resolver__eviction():
+    client_factory = MagicMock(side_effect=_client_factory)
+    auth = MultiTenantClientCredentialAuth(
+        client_factory=client_factory,
+        scopes=["TEST SCOPE"],
+        tenant_resolver=lambda request: request.headers["X-Tenant"],
+        max_clients=1,
+    )
+    for tenant in ["A", "B", "A"]:
+        request_mock = _request("https://api.test/items")
+        request_mock.headers = {"X-Tenant": tenant}
+        auth(request_mock)
+        assert request_mock.headers["Authorization"] == f"Bearer TOKEN {tenant}"
+    assert client_factory.call_count == 3
+    assert auth.pool_stats.evictions == 2
+    assert auth.get_access_token("A")["access_token"] == "TOKEN A"
+
+
+def test_multi_tenant_auth__unknown_tenant():
+    auth = MultiTenantClientCredentialAuth(
+        client_factory=_client_factory,
+        scopes=["TEST SCOPE"],
+        tenant_url_pattern=r"https://api\.test/tenants/([^/]+)/",
+    )
+    assert auth.resolve_tenant(_request("https://api.test/tenants/A/")) == "A"
+    with pytest.raises(AuthenticationError, match="Unable to determine tenant"):
+        auth(_request("https://api.test/items"))
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{}, {"tenant_resolver": lambda request: "A", "tenant_url_pattern": "(.*)"}],
+)
+def test_multi_tenant_auth__invalid_tenant_options(kwargs):
+    with pytest.raises(ValueError, match="tenant_resolver or tenant_url_pattern"):
+        MultiTenantClientCredentialAuth(
+            client_factory=_client_factory, scopes=["TEST SCOPE"], **kwargs
+        )
+
+
+def test_multi_tenant_auth__tenant_url_pattern_without_group():
+    with pytest.raises(ValueError, match="group that captures the tenant"):
+        MultiTenantClientCredentialAuth(
+            client_factory=_client_factory,
+            scopes=["TEST SCOPE"],
+            tenant_url_pattern=r"https://api\.test/tenants/",
+        )
@@ -0,0 +1,217 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, create_autospec, patch
+
+import msal
+import pytest
+
+from msal_requests_auth.auth import OnBehalfOfAuth, OnBehalfOfTokenCache
+from msal_requests_auth.exceptions import AuthenticationError
+
+
+@pytest.fixture
+def cca_mock():
+    client = create_autospec(msal.ConfidentialClientApplication, instance=True)
+    client.client_id = "CLIENT"
+    client.token_cache = msal.TokenCache()
+    client.authority = MagicMock(
+        token_endpoint="https://login.microsoftonline.com/TENANT/oauth2/v2.0/token"
+    )
+    client.acquire_token_on_behalf_of.side_effect = lambda user_assertion, scopes: {
+        "token_type": "Bearer",
+        "access_token": f"TOKEN FOR {user_assertion}",
+        "expires_in": 3600,
+    }
+    return client
+
+
+def test_on_behalf_of_auth(cca_mock):
+    request_mock = MagicMock()
+    request_mock.headers = {}
+    returned_request = OnBehalfOfAuth(
+        client=cca_mock, scopes=["TEST SCOPE"], user_assertion="USER"
+    )(request_mock)
+    assert returned_request.headers == {"Authorization": "Bearer TOKEN FOR USER"}
+    cca_mock.acquire_token_on_behalf_of.assert_called_once_with(
+        user_assertion="USER", scopes=["TEST SCOPE"]
+    )
+
+
+def test_on_behalf_of_auth__shared_cache(cca_mock):
+    auths = [
+        OnBehalfOfAuth(client=cca_mock, scopes=scopes, user_assertion=user_assertion)
+        for user_assertion, scopes in [
+            ("USER", ["TEST SCOPE"]),
+            ("USER", ["TEST SCOPE"]),
+            ("OTHER USER", ["TEST SCOPE"]),
+            ("USER", ["OTHER SCOPE"]),
+        ]
+    ]
+    for auth in auths:
+        auth.get_access_token()
+    assert auths[0].token_provider._store is auths[1].token_provider._store
+    assert auths[0].token_provider._store is not auths[2].token_provider._store
+    assert cca_mock.acquire_token_on_behalf_of.call_count == 3
+    # the token cache is shared across providers
+    OnBehalfOfAuth(
+        client=cca_mock,
+        scopes=["TEST SCOPE"],
+        user_assertion="USER",
+        token_cache=auths[0].token_cache,
+    )._get_access_token()
+    assert cca_mock.acquire_token_on_behalf_of.call_count == 3
+    stats = auths[0].token_cache.stats()
+    assert (stats.size, stats.hits) == (3, 1)
+    assert stats.memory_bytes > 0
+
+
+def test_on_behalf_of_auth__error_not_cached(cca_mock):
+    cca_mock.acquire_token_on_behalf_of.side_effect = None
+    cca_mock.acquire_token_on_behalf_of.return_value = {
+        "error": "BAD REQUEST",
+        "error_description": "Request to get token was bad.",
+    }
+    auth = OnBehalfOfAuth(
+        client=cca_mock,
+        scopes=["TEST SCOPE"],
+        user_assertion="USER",
+        token_cache=OnBehalfOfTokenCache(),
+    )
+    for _ in range(2):
+        with pytest.raises(AuthenticationError, match="BAD REQUEST"):
+            auth.get_access_token()
+    assert cca_mock.acquire_token_on_behalf_of.call_count == 2
+    assert auth.token_cache.stats().size == 0
+
+
+@patch("msal_requests_auth._lru.time.monotonic")
+def test_on_behalf_of_token_cache__expiry(monotonic_mock, cca_mock):
+    monotonic_mock.return_value = 0
+    token_cache = OnBehalfOfTokenCache(max_size=1, refresh_margin=300)
+    token_cache.get_token(cca_mock, "USER", ["TEST SCOPE"])
+    monotonic_mock.return_value = 3299
+    token_cache.get_token(cca_mock, "USER", ["TEST SCOPE"])
+    assert cca_mock.acquire_token_on_behalf_of.call_count == 1
+    monotonic_mock.return_value = 3300
+    token_cache.get_token(cca_mock, "USER", ["TEST SCOPE"])
+    assert cca_mock.acquire_token_on_behalf_of.call_count == 2
+    token_cache.get_token(cca_mock, "OTHER USER", ["TEST SCOPE"])
+    stats = token_cache.stats()
+    assert (stats.size, stats.expirations, stats.evictions) == (1, 1, 1)
+    token_cache.clear()
+    assert token_cache.stats().memory_bytes == 0
+
+
+def test_on_behalf_of_token_cache__single_flight(cca_mock):
+    started = threading.Event()
+
+    def acquire_token_on_behalf_of(user_assertion, scopes):
+        started.set()
+        time.sleep(0.1)
+        return {"token_type": "Bearer", "access_token": "TOKEN", "expires_in": 3600}
+
+    cca_mock.acquire_token_on_behalf_of.side_effect = acquire_token_on_behalf_of
+    token_cache = OnBehalfOfTokenCache()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(
+                lambda _: token_cache.get_token(cca_mock, "USER", ["TEST SCOPE"]),
+                range(8),
+            )
+        )
+    assert started.is_set()
+    assert all(result["access_token"] == "TOKEN" for result in results)
+    cca_mock.acquire_token_on_behalf_of.assert_called_once()
+    assert token_cache._exchange_locks == {}
+
+
+def test_on_behalf_of_token_cache__cache_key(cca_mock):
+    key = OnBehalfOfTokenCache.cache_key(cca_mock, "USER", ["B", "a"])
+    assert "USER" not in key[2]
+    assert key == OnBehalfOfTokenCache.cache_key(cca_mock, "USER", ["A", "b"])
+
+
+def test_on_behalf_of_token_cache__shared_by_clients(cca_mock):
+    other_client = create_autospec(msal.ConfidentialClientApplication, instance=True)
+    other_client.client_id = "OTHER CLIENT"
+    other_client.token_cache = msal.TokenCache()
+    other_client.authority = cca_mock.authority
+    other_client.acquire_token_on_behalf_of.return_value = {
+        "token_type": "Bearer",
+        "access_token": "OTHER CLIENT TOKEN",
+        "expires_in": 3600,
+    }
+    token_cache = OnBehalfOfTokenCache()
+    assert (
+        token_cache.get_token(cca_mock, "USER", ["TEST SCOPE"])["access_token"]
+        == "TOKEN FOR USER"
+    )
+    assert (
+        token_cache.get_token(other_client, "USER", ["TEST SCOPE"])["access_token"]
+        == "OTHER CLIENT TOKEN"
+    )
+    other_client.authority = MagicMock(
+        token_endpoint="https://login.microsoftonline.com/OTHER/oauth2/v2.0/token"
+    )
+    token_cache.get_token(other_client, "USER", ["TEST SCOPE"])
+    assert other_client.acquire_token_on_behalf_of.call_count == 2
+
+
+@patch("msal_requests_auth._lru.time.monotonic")
+def test_on_behalf_of_token_cache__short_lived_token(monotonic_mock, cca_mock):
+    cca_mock.acquire_token_on_behalf_of.side_effect = None
+    cca_mock.acquire_token_on_behalf_of.return_value = {
+        "token_type": "Bearer",
+        "access_token": "TOKEN",
+        "expires_in": 300,
+    }
+    monotonic_mock.return_value = 0
+    token_cache = OnBehalfOfTokenCache(refresh_margin=300)
+    token_cache.get_token(cca_mock, "USER", ["TEST SCOPE"])
+    monotonic_mock.return_value = 149
+    token_cache.get_token(cca_mock, "USER", ["TEST SCOPE"])
+    assert cca_mock.acquire_token_on_behalf_of.call_count == 1
+    monotonic_mock.return_value = 150
+    token_cache.get_token(cca_mock, "USER", ["TEST SCOPE"])
+    assert cca_mock.acquire_token_on_behalf_of.call_count == 2
+
+
+def test_on_behalf_of_auth__timing_path(cca_mock):
+    auth = OnBehalfOfAuth(client=cca_mock, scopes=["TEST SCOPE"], user_assertion="USER")
+    assert auth.token_provider.get_timed_header()[1].path == "network"
+    assert auth.token_provider.get_timed_header()[1].path == "memory"
+    auth.token_provider.invalidate()
+    assert auth.token_provider.get_timed_header()[1].path == "cache"
+
+
+def test_on_behalf_of_auth__token_cache_not_shared(cca_mock):
+    auth = OnBehalfOfAuth(client=cca_mock, scopes=["TEST SCOPE"], user_assertion="USER")
+    token_cache = OnBehalfOfTokenCache()
+    other_auth = OnBehalfOfAuth(
+        client=cca_mock,
+        scopes=["TEST SCOPE"],
+        user_assertion="USER",
+        token_cache=token_cache,
+    )
+    assert other_auth.token_provider._store is not auth.token_provider._store
+    other_auth.get_access_token()
+    assert token_cache.stats().size == 1
+
+
+def test_on_behalf_of_token_cache__msal_cache_bounded(fake_aad):
+    client = fake_aad.create_confidential_client()
+    token_cache = OnBehalfOfTokenCache(max_size=2)
+    for index in range(50):
+        token = token_cache.get_token(client, f"user-{index}", ["api://fake/.default"])
+        assert "access_token" in token
+    assert fake_aad.calls["token"] == 50
+    stats = token_cache.stats()
+    assert (stats.size, stats.misses, stats.evictions) == (2, 50, 48)
+    for credential_type in (
+        msal.TokenCache.CredentialType.ACCESS_TOKEN,
+        msal.TokenCache.CredentialType.REFRESH_TOKEN,
+        msal.TokenCache.CredentialType.ID_TOKEN,
+        msal.TokenCache.CredentialType.ACCOUNT,
+    ):
+        assert not list(client.token_cache.search(credential_type))
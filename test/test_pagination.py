@@ -0,0 +1,67 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from msal_requests_auth.pagination import get_next_url, iter_pages
+
+
+def _response(body=None, link=None, status_code=200):
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = "https://example.com"
+    if body is not None:
+        response._content = json.dumps(body).encode()
+    if link is not None:
+        response.headers["Link"] = f'<{link}>; rel="next"'
+    return response
+
+
+@pytest.mark.parametrize(
+    "response, expected_url",
+    [
+        (_response(link="https://example.com/2"), "https://example.com/2"),
+        (
+            _response({"@odata.nextLink": "https://example.com/2"}),
+            "https://example.com/2",
+        ),
+        (_response({"nextLink": "https://example.com/2"}), "https://example.com/2"),
+        (_response({"value": []}), None),
+        (_response([]), None),
+        (_response(), None),
+    ],
+)
+def test_get_next_url(response, expected_url):
+    assert get_next_url(response) == expected_url
+
+
+def test_iter_pages():
+    auth = MagicMock()
+    session = MagicMock()
+    session.get.side_effect = [
+        _response({"value": [1], "@odata.nextLink": "https://example.com/2"}),
+        _response({"value": [2]}),
+    ]
+    pages = list(
+        iter_pages(
+            "https://example.com/1",
+            auth=auth,
+            session=session,
+            params={"top": 1},
+            timeout=10,
+        )
+    )
+    assert [page.json()["value"] for page in pages] == [[1], [2]]
+    session.get.assert_any_call(
+        "https://example.com/1", auth=auth, params={"top": 1}, timeout=10
+    )
+    session.get.assert_called_with("https://example.com/2", auth=auth, timeout=10)
+    session.close.assert_not_called()
+
+
+def test_iter_pages__error():
+    session = MagicMock()
+    session.get.return_value = _response({"error": "Bad"}, status_code=400)
+    with pytest.raises(requests.HTTPError):
+        list(iter_pages("https://example.com/1", auth=MagicMock(), session=session))
@@ -0,0 +1,61 @@
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from msal_requests_auth.auth import (
+    AuthLatencyProfiler,
+    AuthTiming,
+    ClientCredentialAuth,
+)
+
+
+def _slow_token(*args, **kwargs):
+    time.sleep(0.2)
+    return {"token_type": "Bearer", "access_token": "TEST TOKEN", "expires_in": 3600}
+
+
+@patch("msal.ConfidentialClientApplication", autospec=True)
+def test_auth_latency_profiler(cca_mock):
+    cca_mock.acquire_token_silent.return_value = None
+    cca_mock.acquire_token_for_client.side_effect = _slow_token
+    callback = MagicMock()
+    profiler = AuthLatencyProfiler(callback, threshold=0.1, interval=0.005)
+    auth = ClientCredentialAuth(
+        client=cca_mock, scopes=["TEST SCOPE"], profiler=profiler
+    )
+    request_mock = MagicMock()
+    request_mock.headers = {}
+    auth(request_mock)
+    callback.assert_called_once()
+    profile = callback.call_args.args[0]
+    assert profile.timing.path == "network"
+    assert profile.timing.duration >= 0.2
+    assert profile.interval == 0.005
+    # the number of samples depends on the timer resolution of the platform
+    assert any(
+        frame.endswith(" _slow_token") for stack in profile.samples for frame in stack
+    )
+    # fast requests are not reported
+    auth(request_mock)
+    callback.assert_called_once()
+
+
+def test_auth_latency_profiler__callback_error():
+    profiler = AuthLatencyProfiler(
+        MagicMock(side_effect=ValueError("BAD")), threshold=0
+    )
+    with pytest.warns(UserWarning, match="Error in auth profiler callback"):
+        with profiler.profile() as record_timing:
+            record_timing(AuthTiming(path="memory", duration=0))
+
+
+def test_auth_latency_profiler__sampler_stops():
+    profiler = AuthLatencyProfiler(MagicMock(), interval=0.001)
+    profiler._idle_timeout = 0.01
+    with profiler.profile():
+        sampler = profiler._sampler
+        assert sampler.is_alive()
+    sampler.join(timeout=5)
+    assert not sampler.is_alive()
+    assert profiler._sampler is None
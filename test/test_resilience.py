@@ -0,0 +1,74 @@
+from unittest.mock import patch
+
+from msal_requests_auth.auth import ResiliencePolicy
+
+
+@patch("msal_requests_auth.auth.resilience.time.monotonic")
+def test_resilience_policy__retry_after(monotonic_mock):
+    monotonic_mock.return_value = 0
+    policy = ResiliencePolicy()
+    assert policy.allow_request()
+    policy.record_failure("THROTTLED", retry_after=10)
+    assert not policy.allow_request()
+    assert policy.state.retry_in == 10
+    monotonic_mock.return_value = 10
+    assert policy.allow_request()
+    policy.record_success()
+    state = policy.state
+    assert (state.state, state.consecutive_failures, state.total_failures) == (
+        "closed",
+        0,
+        1,
+    )
+
+
+@patch("msal_requests_auth.auth.resilience.random.uniform")
+@patch("msal_requests_auth.auth.resilience.time.monotonic")
+def test_resilience_policy__backoff(monotonic_mock, uniform_mock):
+    monotonic_mock.return_value = 0
+    uniform_mock.side_effect = lambda low, high: high
+    policy = ResiliencePolicy(failure_threshold=10, base_delay=1, max_delay=5)
+    for delay in [1, 2, 4, 5, 5]:
+        policy.record_failure("ERROR")
+        assert policy.state.retry_in == delay
+        monotonic_mock.return_value += delay
+        assert policy.allow_request()
+
+
+@patch("msal_requests_auth.auth.resilience.time.monotonic")
+def test_resilience_policy__circuit_breaker(monotonic_mock):
+    monotonic_mock.return_value = 0
+    policy = ResiliencePolicy(failure_threshold=2, reset_timeout=30)
+    policy.record_failure("ERROR", retry_after=0)
+    assert policy.state.state == "closed"
+    policy.record_failure("ERROR", retry_after=0)
+    assert policy.state.state == "open"
+    assert policy.state.last_error == "ERROR"
+    monotonic_mock.return_value = 29
+    assert not policy.allow_request()
+    monotonic_mock.return_value = 30
+    # only one probe request is allowed
+    assert policy.allow_request()
+    assert policy.state.state == "half_open"
+    assert not policy.allow_request()
+    policy.record_failure("ERROR", retry_after=0)
+    assert policy.state.state == "open"
+    assert policy.state.retry_in == 30
+    monotonic_mock.return_value = 60
+    assert policy.allow_request()
+    policy.record_success()
+    assert policy.state.state == "closed"
+    assert policy.allow_request()
+
+
+@patch("msal_requests_auth.auth.resilience.time.monotonic")
+def test_resilience_policy__probe_without_outcome(monotonic_mock):
+    monotonic_mock.return_value = 0
+    policy = ResiliencePolicy(failure_threshold=1, reset_timeout=30)
+    policy.record_failure("ERROR", retry_after=0)
+    monotonic_mock.return_value = 30
+    assert policy.allow_request()
+    monotonic_mock.return_value = 60
+    # the probe did not record an outcome, so requests are still gated
+    assert policy.allow_request()
+    assert not policy.allow_request()
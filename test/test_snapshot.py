@@ -0,0 +1,158 @@
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from msal_requests_auth.auth import OnBehalfOfAuth, TokenSnapshotAuth
+from msal_requests_auth.auth.token_provider import _TokenState
+from msal_requests_auth.exceptions import AuthenticationError
+from msal_requests_auth.snapshot import TokenSnapshot, write_token_snapshot
+
+AUTHORITY = "https://login.microsoftonline.com/TENANT"
+
+
+def _auth(client_id, scopes, access_token, expires_in=3600, tenant="TENANT"):
+    auth = MagicMock()
+    auth.client.client_id = client_id
+    auth.client.authority.token_endpoint = (
+        f"https://login.microsoftonline.com/{tenant}/oauth2/v2.0/token"
+    )
+    auth.scopes = scopes
+    auth.token_provider._get_state.return_value = _TokenState(
+        token={"token_type": "Bearer", "access_token": access_token},
+        header=f"Bearer {access_token}",
+        expires_at=time.time() + expires_in,
+        refresh_at=time.time() + expires_in - 300,
+    )
+    return auth
+
+
+def test_token_snapshot(tmp_path):
+    snapshot_file = write_token_snapshot(
+        [
+            _auth(f"CLIENT {index}", [f"SCOPE {index}", "OTHER"], f"TOKEN {index}")
+            for index in range(50)
+        ],
+        tmp_path / "snapshot.bin",
+    )
+    snapshot = TokenSnapshot(snapshot_file)
+    for index in range(50):
+        token = snapshot.get_token(
+            f"CLIENT {index}", AUTHORITY, ["other", f"SCOPE {index}"]
+        )
+        assert token["access_token"] == f"TOKEN {index}"
+        assert token["token_type"] == "Bearer"
+        assert 3590 < token["expires_in"] <= 3600
+    assert snapshot.get_token("CLIENT 1", AUTHORITY, ["SCOPE 2"])["error"] == (
+        "temporarily_unavailable"
+    )
+    assert [path.name for path in tmp_path.iterdir()] == ["snapshot.bin"]
+
+
+@patch("msal_requests_auth.snapshot.user_cache_dir")
+def test_token_snapshot__default_file(user_cache_dir_mock, tmp_path):
+    user_cache_dir_mock.return_value = str(tmp_path / "msal-requests-auth")
+    snapshot_file = write_token_snapshot([_auth("CLIENT", ["SCOPE"], "TOKEN")])
+    assert snapshot_file == tmp_path / "msal-requests-auth" / "token-snapshot.bin"
+    assert (
+        TokenSnapshot().get_token("CLIENT", AUTHORITY, ["SCOPE"])["access_token"]
+        == "TOKEN"
+    )
+
+
+@pytest.mark.skipif(
+    os.name == "nt", reason="a mapped file cannot be replaced on Windows"
+)
+def test_token_snapshot__replaced(tmp_path):
+    snapshot_file = tmp_path / "snapshot.bin"
+    snapshot = TokenSnapshot(snapshot_file, check_interval=0)
+    assert snapshot.get_token("CLIENT", AUTHORITY, ["SCOPE"])["error"] == (
+        "temporarily_unavailable"
+    )
+    write_token_snapshot([_auth("CLIENT", ["SCOPE"], "OLD TOKEN")], snapshot_file)
+    assert (
+        snapshot.get_token("CLIENT", AUTHORITY, ["SCOPE"])["access_token"]
+        == "OLD TOKEN"
+    )
+    write_token_snapshot([_auth("CLIENT", ["SCOPE"], "NEW TOKEN")], snapshot_file)
+    assert (
+        snapshot.get_token("CLIENT", AUTHORITY, ["SCOPE"])["access_token"]
+        == "NEW TOKEN"
+    )
+
+
+def test_token_snapshot__expired(tmp_path):
+    snapshot_file = write_token_snapshot(
+        [_auth("CLIENT", ["SCOPE"], "TOKEN", expires_in=-1)], tmp_path / "snapshot.bin"
+    )
+    token = TokenSnapshot(snapshot_file).get_token("CLIENT", AUTHORITY, ["SCOPE"])
+    assert token["error"] == "temporarily_unavailable"
+
+
+def test_token_snapshot__invalid_file(tmp_path):
+    snapshot_file = tmp_path / "snapshot.bin"
+    snapshot_file.write_bytes(b"INVALID SNAPSHOT")
+    token = TokenSnapshot(snapshot_file).get_token("CLIENT", AUTHORITY, ["SCOPE"])
+    assert token["error"] == "temporarily_unavailable"
+
+
+@pytest.mark.parametrize("size", [0, 4, 8, 20])
+def test_token_snapshot__truncated_file(tmp_path, size):
+    snapshot_file = write_token_snapshot(
+        [_auth("CLIENT", ["SCOPE"], "TOKEN")], tmp_path / "snapshot.bin"
+    )
+    snapshot_file.write_bytes(snapshot_file.read_bytes()[:size])
+    token = TokenSnapshot(snapshot_file).get_token("CLIENT", AUTHORITY, ["SCOPE"])
+    assert token["error"] == "temporarily_unavailable"
+
+
+def test_token_snapshot_auth(tmp_path):
+    snapshot_file = write_token_snapshot(
+        [_auth("CLIENT", ["SCOPE"], "TOKEN")], tmp_path / "snapshot.bin"
+    )
+    auth = TokenSnapshotAuth(
+        "CLIENT", AUTHORITY, ["SCOPE"], snapshot=TokenSnapshot(snapshot_file)
+    )
+    request_mock = MagicMock()
+    request_mock.headers = {}
+    assert auth(request_mock).headers == {"Authorization": "Bearer TOKEN"}
+    assert auth.get_access_token()["access_token"] == "TOKEN"
+
+
+def test_token_snapshot_auth__missing(tmp_path):
+    auth = TokenSnapshotAuth(
+        "CLIENT",
+        AUTHORITY,
+        ["SCOPE"],
+        snapshot=TokenSnapshot(tmp_path / "snapshot.bin"),
+    )
+    with pytest.raises(AuthenticationError, match="temporarily_unavailable"):
+        auth.get_access_token()
+
+
+def test_token_snapshot__authority(tmp_path):
+    snapshot_file = write_token_snapshot(
+        [
+            _auth("CLIENT", ["SCOPE"], "TOKEN 1", tenant="TENANT1"),
+            _auth("CLIENT", ["SCOPE"], "TOKEN 2", tenant="tenant2"),
+        ],
+        tmp_path / "snapshot.bin",
+    )
+    snapshot = TokenSnapshot(snapshot_file)
+    for tenant, access_token in (("tenant1", "TOKEN 1"), ("TENANT2", "TOKEN 2")):
+        token = snapshot.get_token(
+            "CLIENT", f"https://login.microsoftonline.com/{tenant}/", ["SCOPE"]
+        )
+        assert token["access_token"] == access_token
+    assert snapshot.get_token("CLIENT", AUTHORITY, ["SCOPE"])["error"] == (
+        "temporarily_unavailable"
+    )
+
+
+def test_token_snapshot__on_behalf_of(tmp_path):
+    with pytest.raises(ValueError, match="OnBehalfOfAuth"):
+        write_token_snapshot(
+            [MagicMock(spec=OnBehalfOfAuth)], tmp_path / "snapshot.bin"
+        )
+    assert not (tmp_path / "snapshot.bin").exists()
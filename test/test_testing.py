@@ -0,0 +1,77 @@
+import pytest
+
+from msal_requests_auth.auth import ClientCredentialAuth, DeviceCodeAuth
+from msal_requests_auth.exceptions import AuthenticationError
+from msal_requests_auth.testing import FakeAAD, run_load_test
+
+SCOPES = ["api://fake/.default"]
+
+
+def test_run_load_test__single_flight(fake_aad):
+    fake_aad.latency = 0.1
+    auth = ClientCredentialAuth(fake_aad.create_confidential_client(), scopes=SCOPES)
+    result = run_load_test(auth, threads=8, requests_per_thread=50, fake_aad=fake_aad)
+    assert result.requests == 400
+    assert result.errors == 0
+    assert result.token_requests == 1
+    assert sum(result.paths.values()) == 400
+    assert result.paths["network"] == 1
+    assert result.latency_max >= 0.1
+    assert result.latency_p50 <= result.latency_p99 <= result.latency_max
+
+
+def test_run_load_test__duration(fake_aad):
+    auth = ClientCredentialAuth(fake_aad.create_confidential_client(), scopes=SCOPES)
+    result = run_load_test(auth, threads=2, duration=0.2, fake_aad=fake_aad)
+    assert result.duration >= 0.2
+    assert result.requests > 2
+    assert result.requests_per_second > 0
+    assert result.token_requests == 1
+
+
+def test_fake_aad__throttle(fake_aad):
+    auth = ClientCredentialAuth(fake_aad.create_confidential_client(), scopes=SCOPES)
+    fake_aad.throttle(1, retry_after=0)
+    with pytest.raises(AuthenticationError):
+        auth.get_access_token()
+    assert fake_aad.calls["throttled"] == 1
+    assert fake_aad.calls["token"] == 1
+
+
+def test_fake_aad__fail(fake_aad):
+    auth = ClientCredentialAuth(fake_aad.create_confidential_client(), scopes=SCOPES)
+    fake_aad.fail(1)
+    with pytest.raises(AuthenticationError):
+        auth.get_access_token()
+    assert fake_aad.calls["failed"] == 1
+
+
+def test_fake_aad__device_code(capsys):
+    with FakeAAD(pending_polls=2, token_lifetime=600) as fake_aad:
+        auth = DeviceCodeAuth(
+            fake_aad.create_public_client(), scopes=SCOPES, headless=True
+        )
+        token = auth.get_access_token()
+        assert token["token_type"] == "Bearer"
+        assert 0 < token["expires_in"] <= 600
+        assert fake_aad.calls["devicecode"] == 1
+        assert fake_aad.calls["token"] == 3
+    assert "FAKECODE" in capsys.readouterr().out
+
+
+def test_fake_aad__not_running():
+    with pytest.raises(RuntimeError):
+        FakeAAD().base_url
+
+
+def test_fake_aad__throttle__retry_after(fake_aad):
+    client = fake_aad.create_confidential_client()
+    auth = ClientCredentialAuth(client, scopes=SCOPES)
+    fake_aad.throttle(1, retry_after=60)
+    with pytest.raises(AuthenticationError, match="temporarily_unavailable"):
+        auth.get_access_token()
+    assert 59 < auth.resilience.state.retry_in <= 60
+    assert fake_aad.calls["throttled"] == 1
+    # the HTTP client is wrapped once per MSAL client
+    ClientCredentialAuth(client, scopes=["api://other/.default"])
+    assert client.http_client.http_client.http_client is fake_aad.session
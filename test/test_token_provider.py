@@ -0,0 +1,207 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import msal
+import pytest
+
+from msal_requests_auth.auth import (
+    ClientCredentialAuth,
+    DeviceCodeAuth,
+    ResiliencePolicy,
+    TokenProvider,
+)
+from msal_requests_auth.auth.token_provider import record_auth_path
+from msal_requests_auth.exceptions import AuthenticationError
+
+
+def _token(access_token="TEST TOKEN", expires_in=3600):
+    return {
+        "token_type": "Bearer",
+        "access_token": access_token,
+        "expires_in": expires_in,
+    }
+
+
+def test_token_provider__memoized():
+    acquire_token = MagicMock(return_value=_token())
+    token_provider = TokenProvider(acquire_token)
+    assert token_provider.get_header() == "Bearer TEST TOKEN"
+    assert token_provider.get_headers() == {"Authorization": "Bearer TEST TOKEN"}
+    assert token_provider.get_token() == _token()
+    acquire_token.assert_called_once()
+    token_provider.invalidate()
+    token_provider.get_header()
+    assert acquire_token.call_count == 2
+
+
+@patch("msal_requests_auth.auth.token_provider.time.time")
+def test_token_provider__refresh_margin(time_mock):
+    time_mock.return_value = 0
+    acquire_token = MagicMock(side_effect=[_token("FIRST"), _token("SECOND")])
+    token_provider = TokenProvider(acquire_token, refresh_margin=300)
+    assert token_provider.get_header() == "Bearer FIRST"
+    time_mock.return_value = 3299
+    assert token_provider.get_header() == "Bearer FIRST"
+    time_mock.return_value = 3300
+    assert token_provider.get_header() == "Bearer SECOND"
+
+
+def test_token_provider__error():
+    token_provider = TokenProvider(
+        MagicMock(return_value={"error": "BAD REQUEST", "error_description": "Bad."})
+    )
+    with pytest.raises(AuthenticationError, match="BAD REQUEST"):
+        token_provider.get_header()
+
+
+def test_token_provider__single_flight():
+    started = threading.Event()
+
+    def acquire_token():
+        started.set()
+        time.sleep(0.1)
+        return _token()
+
+    acquire_token_mock = MagicMock(side_effect=acquire_token)
+    token_provider = TokenProvider(acquire_token_mock)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        headers = list(executor.map(lambda _: token_provider.get_header(), range(8)))
+    assert set(headers) == {"Bearer TEST TOKEN"}
+    acquire_token_mock.assert_called_once()
+
+
+@patch("msal.ConfidentialClientApplication", autospec=True)
+def test_token_provider__shared_by_auth(cca_mock):
+    cca_mock.acquire_token_silent.return_value = _token()
+    auth = ClientCredentialAuth(client=cca_mock, scopes=["TEST SCOPE"])
+    other_auth = ClientCredentialAuth(client=cca_mock, scopes=["TEST SCOPE"])
+    assert auth.token_provider._store is other_auth.token_provider._store
+    assert (
+        auth.token_provider._store
+        is not ClientCredentialAuth(
+            client=cca_mock, scopes=["OTHER SCOPE"]
+        ).token_provider._store
+    )
+    assert (
+        auth.token_provider._store
+        is not ClientCredentialAuth(
+            client=MagicMock(spec=msal.application.ConfidentialClientApplication),
+            scopes=["TEST SCOPE"],
+        ).token_provider._store
+    )
+    request_mock = MagicMock()
+    request_mock.headers = {}
+    auth(request_mock)
+    other_auth(request_mock)
+    cca_mock.acquire_token_silent.assert_called_once()
+
+
+@patch("msal.ConfidentialClientApplication", autospec=True)
+def test_token_provider__shared_by_auth__resilience(cca_mock):
+    cca_mock.acquire_token_silent.return_value = _token()
+    policy = ResiliencePolicy(failure_threshold=99)
+    auth = ClientCredentialAuth(client=cca_mock, scopes=["TEST SCOPE"])
+    other_auth = ClientCredentialAuth(
+        client=cca_mock, scopes=["TEST SCOPE"], resilience=policy
+    )
+    assert auth.resilience is not policy
+    assert other_auth.resilience is policy
+    assert other_auth.get_access_token() == auth.get_access_token()
+    cca_mock.acquire_token_silent.assert_called_once()
+
+
+class _TenantAuth(ClientCredentialAuth):
+    def __init__(self, *args, tenant, **kwargs):
+        self.tenant = tenant
+        super().__init__(*args, **kwargs)
+
+    def _get_access_token(self):
+        return _token(f"TOKEN FOR {self.tenant}")
+
+
+@patch("msal.ConfidentialClientApplication", autospec=True)
+def test_token_provider__shared_by_auth__acquired_by_instance(cca_mock):
+    auth = _TenantAuth(client=cca_mock, scopes=["TEST SCOPE"], tenant="TENANT")
+    other_auth = _TenantAuth(client=cca_mock, scopes=["TEST SCOPE"], tenant="OTHER")
+    # the token is requested with the functions of the instance that refreshes it
+    assert other_auth.get_access_token()["access_token"] == "TOKEN FOR OTHER"
+    assert auth.get_access_token()["access_token"] == "TOKEN FOR OTHER"
+    auth.token_provider.invalidate()
+    assert auth.get_access_token()["access_token"] == "TOKEN FOR TENANT"
+
+
+@patch("msal.PublicClientApplication", autospec=True)
+def test_token_provider__shared_by_auth__headless(pca_mock):
+    auth = DeviceCodeAuth(client=pca_mock, scopes=["TEST SCOPE"], headless=False)
+    headless_auth = DeviceCodeAuth(
+        client=pca_mock, scopes=["TEST SCOPE"], headless=True
+    )
+    assert auth.token_provider._store is not headless_auth.token_provider._store
+    assert (
+        DeviceCodeAuth(
+            client=pca_mock, scopes=["TEST SCOPE"], headless=True
+        ).token_provider._store
+        is headless_auth.token_provider._store
+    )
+
+
+@patch("msal_requests_auth.auth.token_provider.time.time")
+def test_token_provider__min_lifetime(time_mock):
+    time_mock.return_value = 0
+    acquire_token = MagicMock(return_value=_token("CACHED", expires_in=1000))
+    refresh_token = MagicMock(return_value=_token("REFRESHED", expires_in=1500))
+    token_provider = TokenProvider(acquire_token, refresh_token=refresh_token)
+    assert token_provider.remaining_lifetime == 0
+    assert token_provider.get_header(min_lifetime=600) == "Bearer CACHED"
+    assert token_provider.remaining_lifetime == 1000
+    time_mock.return_value = 500
+    assert token_provider.get_header() == "Bearer CACHED"
+    assert token_provider.get_header(min_lifetime=600) == "Bearer REFRESHED"
+    assert token_provider.remaining_lifetime == 1500
+    # the token from the forced refresh is the longest available
+    assert token_provider.get_header(min_lifetime=3600) == "Bearer REFRESHED"
+    acquire_token.assert_called_once()
+    refresh_token.assert_called_once()
+
+
+def test_token_provider__min_lifetime__default_refresh():
+    acquire_token = MagicMock(
+        side_effect=[_token("FIRST", expires_in=1000), _token("SECOND")]
+    )
+    token_provider = TokenProvider(acquire_token)
+    assert token_provider.get_token()["access_token"] == "FIRST"
+    assert token_provider.get_headers(min_lifetime=1200) == {
+        "Authorization": "Bearer SECOND"
+    }
+
+
+@pytest.mark.parametrize(
+    "token, expected_path",
+    [
+        (_token(), "network"),
+        ({**_token(), "token_source": "identity_provider"}, "network"),
+        ({**_token(), "token_source": "cache"}, "cache"),
+    ],
+)
+def test_token_provider__timed_header(token, expected_path):
+    token_provider = TokenProvider(MagicMock(return_value=token))
+    header, timing = token_provider.get_timed_header()
+    assert header == "Bearer TEST TOKEN"
+    assert timing.path == expected_path
+    assert timing.duration >= 0
+    assert token_provider.get_timed_header()[1].path == "memory"
+
+
+def test_token_provider__timed_header__recorded_path():
+    def acquire_token():
+        record_auth_path(TokenProvider.INTERACTIVE)
+        return _token()
+
+    token_provider = TokenProvider(acquire_token)
+    assert token_provider.get_timed_header()[1].path == "interactive"
+    token_provider.invalidate()
+    # the recorded path is reset for each request
+    token_provider._acquire_token = MagicMock(return_value=_token())
+    assert token_provider.get_timed_header()[1].path == "network"